@@ -1,20 +1,14 @@
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
-from google.genai import types
 
-# Optional: retry config
-retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=2,
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],
+from venturearchitect.agents.config import (
+    default_gemini_model,
+    generate_content_config,
 )
 
+# Model tier and retry policy ("quick" backoff) come from the shared registry.
 root_agent = LlmAgent(
-    model=Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config,
-    ),
+    model=default_gemini_model("business_plan_agent"),
+    generate_content_config=generate_content_config("business_plan_agent"),
     name="business_plan_agent",
     description="Generates long, formal, professional business plans from short idea prompts.",
     instruction=(
@@ -0,0 +1,104 @@
+import asyncio
+import math
+
+import pytest
+
+from venturearchitect import admission as admission_module
+from venturearchitect.admission import (
+    AdmissionController,
+    TokenBucket,
+    default_trusted_proxies,
+    user_key,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission_module.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_burst_then_refill(clock):
+    bucket = TokenBucket(rate=2.0, burst=3.0)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+    clock.now += 100
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() > 0
+
+
+def test_token_bucket_without_rate_never_refills(clock):
+    bucket = TokenBucket(rate=0.0, burst=1.0)
+    assert bucket.try_acquire() == 0.0
+    clock.now += 3600
+    assert bucket.try_acquire() == math.inf
+
+
+def test_admit_limits_users_and_concurrency(clock):
+    controller = AdmissionController(
+        max_concurrent=2, user_rate_per_minute=60, user_burst=1
+    )
+    first = controller.admit("a")
+    assert first.admitted
+    limited = controller.admit("a")
+    assert (limited.admitted, limited.status) == (False, 429)
+    assert limited.retry_after == 1
+    assert controller.admit("b").admitted
+    overloaded = controller.admit("c")
+    assert (overloaded.admitted, overloaded.status) == (False, 503)
+    assert overloaded.headers()["Retry-After"]
+
+    controller.release(first)
+    controller.release(first)  # a second release is a no-op
+    assert controller.in_flight == 1
+    assert controller.admit("c").admitted
+    assert controller.stats()["counts"]["rejected_overloaded"] == 1
+
+
+def test_acquire_waits_for_a_slot_without_rate_limits():
+    async def main():
+        controller = AdmissionController(
+            max_concurrent=1, user_rate_per_minute=0, user_burst=0
+        )
+        first = await controller.acquire(poll_seconds=0.01)
+        waiting = asyncio.create_task(controller.acquire(poll_seconds=0.01))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        controller.release(first)
+        second = await asyncio.wait_for(waiting, 1)
+        counts = controller.stats()["counts"]
+        controller.release(second)
+        return second.admitted, counts, controller.in_flight
+
+    admitted, counts, in_flight = asyncio.run(main())
+    assert admitted and in_flight == 0
+    assert counts["admitted"] == 2 and counts["rejected_overloaded"] == 0
+
+
+def test_user_key_ignores_headers_from_untrusted_clients():
+    headers = {"x-user-id": "victim", "x-forwarded-for": "1.2.3.4"}
+    assert user_key("203.0.113.7", headers) == "203.0.113.7"
+    assert user_key(None, headers) == "anonymous"
+
+
+def test_user_key_trusts_configured_proxies(monkeypatch):
+    monkeypatch.setenv("VENTUREARCHITECT_TRUSTED_PROXIES", "10.0.0.0/8, ::1")
+    proxies = default_trusted_proxies()
+    assert user_key("10.1.2.3", {"x-user-id": "alice"}, proxies) == "user:alice"
+    assert user_key("::1", {"x-user-id": "alice"}, proxies) == "user:alice"
+    # The nearest hop not added by one of our proxies.
+    forwarded = {"x-forwarded-for": "6.6.6.6, 198.51.100.2, 10.9.9.9"}
+    assert user_key("10.1.2.3", forwarded, proxies) == "198.51.100.2"
+    assert user_key("10.1.2.3", {}, proxies) == "10.1.2.3"
+    assert user_key("192.0.2.1", {"x-user-id": "alice"}, proxies) == "192.0.2.1"
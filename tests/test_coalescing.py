@@ -0,0 +1,183 @@
+import asyncio
+import gc
+from contextlib import aclosing
+
+import pytest
+
+from venturearchitect.coalescing import SingleFlight, coalesce_key
+
+
+class Source:
+    """An item stream that records how far it was consumed."""
+
+    def __init__(self, count=None, error=None):
+        self.count = count
+        self.error = error
+        self.produced = 0
+        self.closed = False
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def items(self):
+        self.runs += 1
+        try:
+            while self.count is None or self.produced < self.count:
+                self.produced += 1
+                yield self.produced
+            await self.release.wait()
+            if self.error:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+async def settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+def test_keys_ignore_case_and_whitespace():
+    assert coalesce_key("A  dog Van", mode="x") == coalesce_key("a dog van", mode="x")
+    assert coalesce_key("a dog van", mode="x") != coalesce_key("a dog van", mode="y")
+
+
+def test_run_shares_one_result_and_cancels_when_everyone_leaves():
+    async def main():
+        flights = SingleFlight()
+        started = []
+        gate = asyncio.Event()
+
+        async def work():
+            started.append(1)
+            await gate.wait()
+            return "plan"
+
+        first = asyncio.create_task(flights.run("k", work))
+        second = asyncio.create_task(flights.run("k", work))
+        await settle()
+        gate.set()
+        results = await asyncio.gather(first, second)
+        assert results == [("plan", False), ("plan", True)]
+        assert started == [1]
+
+        gate.clear()
+        callers = [asyncio.create_task(flights.run("k", work)) for _ in range(2)]
+        await settle()
+        callers[0].cancel()
+        await settle()
+        assert flights.in_flight("k")  # the other caller still waits
+        callers[1].cancel()
+        await settle()
+        assert not flights.in_flight("k")
+        return flights.counts
+
+    assert asyncio.run(main()) == {"runs": 2, "coalesced": 2, "cancelled": 1}
+
+
+def test_stream_is_shared_and_replayed_to_late_joiners():
+    async def main():
+        flights = SingleFlight()
+        source = Source(count=3)
+        first = flights.stream("k", source.items)
+        got_first = [await first.__anext__()]
+        late = flights.stream("k", source.items)
+        source.release.set()
+        got_first += [item async for item in first]
+        got_late = [item async for item in late]
+        return source.runs, got_first, got_late
+
+    assert asyncio.run(main()) == (1, [1, 2, 3], [1, 2, 3])
+
+
+def test_shared_stream_waits_for_slow_readers():
+    async def main():
+        flights = SingleFlight(max_queue=4)
+        source = Source()  # endless
+        fast = flights.stream("k", source.items)
+        slow = flights.stream("k", source.items)
+        fast_items = [await fast.__anext__() for _ in range(3)]
+        await settle()
+        # The slow reader has not read anything: the run stops once its
+        # queue is full instead of buffering without bound.
+        assert source.produced <= 4 + 1
+        for _ in range(3):
+            await slow.__anext__()
+        await slow.aclose()
+        # With the slow reader gone, the fast one is no longer held back.
+        fast_items += [await fast.__anext__() for _ in range(20)]
+        await fast.aclose()
+        await settle()
+        return fast_items, source.closed, flights.counts["cancelled"]
+
+    fast_items, closed, cancelled = asyncio.run(main())
+    assert fast_items == list(range(1, 24))
+    assert closed and cancelled == 1
+
+
+def test_run_is_cancelled_when_the_last_reader_detaches():
+    async def main():
+        flights = SingleFlight()
+        source = Source()
+        readers = [flights.stream("k", source.items) for _ in range(2)]
+        for reader in readers:
+            await reader.__anext__()
+        await readers[0].aclose()
+        await settle()
+        assert not source.closed
+        await readers[1].aclose()
+        await settle()
+        return source.closed, flights.in_flight("k")
+
+    assert asyncio.run(main()) == (True, False)
+
+
+def test_stream_that_is_never_iterated_does_not_leak_the_run():
+    async def main():
+        flights = SingleFlight()
+        source = Source()
+        # e.g. the response was never sent because the client went away
+        items = flights.stream("k", source.items)
+        await settle()
+        assert source.runs == 1
+        del items
+        gc.collect()
+        await settle()
+        return source.closed, flights.counts["cancelled"]
+
+    assert asyncio.run(main()) == (True, 1)
+
+
+def test_errors_reach_every_reader():
+    async def main():
+        flights = SingleFlight()
+        source = Source(count=1, error=RuntimeError("boom"))
+        readers = [flights.stream("k", source.items) for _ in range(2)]
+        source.release.set()
+        outcomes = []
+        for reader in readers:
+            items = []
+            with pytest.raises(RuntimeError):
+                async with aclosing(reader):
+                    async for item in reader:
+                        items.append(item)
+            outcomes.append(items)
+        return outcomes
+
+    assert asyncio.run(main()) == [[1], [1]]
+
+
+def test_long_streams_stop_being_joinable():
+    async def main():
+        flights = SingleFlight(max_replay=5)
+        source = Source(count=10)
+        first = flights.stream("k", source.items)
+        for _ in range(6):
+            await first.__anext__()
+        assert not flights.in_flight("k")
+        other = Source(count=2)
+        other.release.set()
+        second = [item async for item in flights.stream("k", other.items)]
+        await first.aclose()
+        return second, source.runs, other.runs
+
+    assert asyncio.run(main()) == ([1, 2], 1, 1)
@@ -0,0 +1,89 @@
+from google.adk.agents import LlmAgent
+
+from venturearchitect.compaction import (
+    ContextCompactor,
+    estimate_tokens,
+    extract_facts,
+)
+from venturearchitect.pipeline import PipelineStage
+
+RESEARCH = """# Market
+- The market is worth $2.1B in 2025.
+- Growth is **12%** a year.
+
+# Competitors
+| Name | Share |
+|------|-------|
+| ToolCo | 30% |
+
+Most rivals are local. They rarely offer delivery.
+"""
+
+STRATEGY = """## Positioning
+- Growth is 12% a year.
+- Focus on renters in dense cities.
+"""
+
+
+def stage(*depends_on, name="narrative"):
+    return PipelineStage(name, LlmAgent(name=name), depends_on)
+
+
+def test_facts_are_scored_by_kind():
+    facts = extract_facts(RESEARCH)
+    assert ("Market", "The market is worth $2.1B in 2025.", 2) in facts
+    assert ("Competitors", "ToolCo | 30%", 2) in facts
+    assert ("Competitors", "Most rivals are local.", 0) in facts
+    assert extract_facts('{"audience": {"segment": "renters"}}') == [
+        ("", "audience.segment: renters", 3)
+    ]
+
+
+def test_facts_repeated_across_stages_are_passed_once():
+    compactor = ContextCompactor()
+    digests, counters = compactor.compact(
+        "narrative",
+        {"research": RESEARCH, "strategy": STRATEGY},
+        ["research", "strategy"],
+    )
+    assert counters["duplicates_removed"] == 1
+    assert "- Growth is 12% a year." in digests["research"]
+    assert "Growth" not in digests["strategy"]
+    assert "- Focus on renters in dense cities." in digests["strategy"]
+
+
+def test_token_cap_keeps_the_most_useful_facts_in_order():
+    compactor = ContextCompactor(max_tokens={"narrative": 20})
+    digests, counters = compactor.compact(
+        "narrative", {"research": RESEARCH}, ["research"]
+    )
+    facts = [line for line in digests["research"].splitlines() if line[0] == "-"]
+    assert sum(estimate_tokens(fact[2:]) + 1 for fact in facts) <= 20
+    assert counters["facts_dropped"] > 0
+    assert "rarely offer delivery" not in digests["research"]  # prose goes first
+    assert facts == sorted(facts, key=digests["research"].index)
+    assert compactor.cap_for("strategy") == compactor.default_max_tokens
+
+
+def test_short_outputs_are_passed_through_unchanged():
+    profile = "Tool library for renters."  # its digest is no smaller
+    inputs, report = ContextCompactor().compact_inputs(
+        stage("discovery", "research"), {"discovery": profile, "research": RESEARCH}
+    )
+    assert inputs["discovery"] == profile
+    assert inputs["research"] != RESEARCH
+    assert estimate_tokens(inputs["research"]) < estimate_tokens(RESEARCH)
+
+
+def test_report_counts_tokens_saved():
+    outputs = {"research": RESEARCH, "strategy": STRATEGY}
+    inputs, report = ContextCompactor().compact_inputs(
+        stage("research", "strategy"), outputs
+    )
+    raw = estimate_tokens(RESEARCH) + estimate_tokens(STRATEGY)
+    context = sum(estimate_tokens(text) for text in inputs.values())
+    assert report["raw_tokens"] == raw
+    assert report["context_tokens"] == context
+    assert report["tokens_saved"] == raw - context > 0
+    assert report["duplicates_removed"] == 1
+    assert report["max_context_tokens"] == 4000
@@ -0,0 +1,163 @@
+import asyncio
+import random
+
+import pytest
+
+from venturearchitect import deadlines
+from venturearchitect.deadlines import (
+    DeadlineExceeded,
+    RetryStats,
+    call,
+    deadline,
+    decorrelated_jitter,
+    record_call,
+    remaining,
+)
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    stats = RetryStats(min_samples=5)
+    monkeypatch.setattr(deadlines, "retry_stats", stats)
+    return stats
+
+
+def attempts_of(*behaviours):
+    """attempt() whose n-th try sleeps, then fails or yields, per `behaviours`."""
+    tries = []
+
+    def attempt():
+        behaviour = behaviours[min(len(tries), len(behaviours) - 1)]
+        tries.append(behaviour)
+
+        async def run():
+            delay, outcome = behaviour
+            await asyncio.sleep(delay)
+            if isinstance(outcome, Exception):
+                raise outcome
+            yield outcome
+
+        return run()
+
+    return attempt, tries
+
+
+async def collect(attempt, **kwargs):
+    options = dict(
+        attempts=3, base_delay=0.01, max_delay=0.02, retryable=lambda e: True
+    )
+    options.update(kwargs)
+    return [item async for item in call(attempt, **options)]
+
+
+def test_deadline_reaches_tasks_and_only_shortens():
+    async def main():
+        assert remaining() is None
+        with deadline(1.0):
+            outer = remaining()
+            with deadline(5.0):  # cannot extend the outer deadline
+                nested = remaining()
+            with deadline(0.2):
+                inner = await asyncio.create_task(asyncio.sleep(0, remaining()))
+        return outer, nested, inner, remaining()
+
+    outer, nested, inner, after = asyncio.run(main())
+    assert 0.9 < outer <= 1.0
+    assert nested <= outer
+    assert 0.1 < inner <= 0.2
+    assert after is None
+
+
+def test_slow_attempt_fails_with_the_deadline():
+    attempt, tries = attempts_of((1.0, "late"))
+
+    async def main():
+        with deadline(0.05):
+            return await collect(attempt)
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(main())
+    assert len(tries) == 1
+
+
+def test_no_retry_when_the_backoff_would_not_fit():
+    attempt, tries = attempts_of((0, RuntimeError("503")))
+
+    async def main():
+        with deadline(0.05):
+            return await collect(attempt, base_delay=1.0, max_delay=1.0)
+
+    with pytest.raises(DeadlineExceeded, match="no time to retry"):
+        asyncio.run(main())
+    assert len(tries) == 1
+
+
+def test_retries_until_success_and_records_them(stats):
+    attempt, tries = attempts_of(
+        (0, RuntimeError("503")), (0, RuntimeError("503")), (0, "ok")
+    )
+
+    async def main():
+        record = record_call()
+        return await collect(attempt), record
+
+    items, record = asyncio.run(main())
+    assert items == ["ok"]
+    assert (record.tries, record.retries) == (3, 2)
+    assert stats.counts["retries"] == 2
+    assert stats.counts["failures"] == 0
+
+
+def test_non_retryable_errors_are_raised_at_once(stats):
+    attempt, tries = attempts_of((0, ValueError("bad request")))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(attempt, retryable=lambda e: False))
+    assert len(tries) == 1
+    assert stats.counts["failures"] == 1
+
+
+def test_decorrelated_jitter_stays_in_bounds():
+    random.seed(7)
+    sleep, sleeps = 0.5, []
+    for _ in range(500):
+        previous, sleep = sleep, decorrelated_jitter(sleep, 0.5, 8.0)
+        assert 0.5 <= sleep <= min(8.0, previous * 3)
+        sleeps.append(sleep)
+    assert len(set(sleeps)) > 100  # spread out, not lock-step
+    assert max(sleeps) == 8.0
+
+
+def test_hedge_after_is_the_p95_latency(stats):
+    for i in range(4):
+        stats.record_latency("agent", i / 100)
+    assert stats.hedge_after("agent") is None  # too few samples
+    for i in range(4, 100):
+        stats.record_latency("agent", i / 100)
+    assert stats.hedge_after("agent") == 0.95
+    assert stats.stats()["hedge_after_seconds"] == {"agent": 0.95}
+
+
+def test_slow_call_is_hedged_and_the_faster_try_wins(stats):
+    for _ in range(5):
+        stats.record_latency("agent", 0.01)
+    attempt, tries = attempts_of((1.0, "slow"), (0, "hedge"))
+
+    async def main():
+        record = record_call()
+        return await collect(attempt, key="agent", hedge=True), record
+
+    items, record = asyncio.run(main())
+    assert items == ["hedge"]
+    assert len(tries) == 2
+    assert record.hedged
+    assert stats.counts["hedges"] == stats.counts["hedge_wins"] == 1
+
+
+def test_fast_calls_are_not_hedged(stats):
+    for _ in range(5):
+        stats.record_latency("agent", 1.0)
+    attempt, tries = attempts_of((0, "ok"))
+    assert asyncio.run(collect(attempt, key="agent", hedge=True)) == ["ok"]
+    assert len(tries) == 1
+    assert stats.counts["hedges"] == 0
+    assert stats.counts["calls"] == 1
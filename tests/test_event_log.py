@@ -0,0 +1,83 @@
+import io
+import json
+import threading
+
+from venturearchitect.event_log import (
+    EventLog,
+    LineWriter,
+    debug_capture,
+    debug_requested,
+)
+
+
+def records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def make_log(sample_rate=0.0, **kwargs):
+    stream = io.StringIO()
+    return EventLog(LineWriter(stream), sample_rate=sample_rate, **kwargs), stream
+
+
+def test_debug_records_are_copied_before_they_are_queued():
+    log, stream = make_log(max_chars=5)
+    log.start_run("run", debug=True)
+    args = {"idea": "a long idea text", "items": [1, 2]}
+    log.record("run", "tool_start", args=log.clip("run", args))
+    args["items"].append(3)  # the tool keeps using its arguments
+    args["idea"] = "changed"
+    log.end_run("run")
+    assert log.writer.flush()
+    start = records(stream)[0]
+    assert start["args"] == {"idea": "a long idea text", "items": [1, 2]}
+
+
+def test_other_runs_are_truncated_and_only_failing_tails_kept():
+    log, stream = make_log(max_chars=5)
+    for run_id, failed in (("ok", False), ("bad", True)):
+        log.start_run(run_id)
+        log.record(run_id, "model_response", text=log.clip(run_id, "x" * 50))
+        log.end_run(run_id, error=RuntimeError("boom") if failed else None)
+    assert log.writer.flush()
+    kinds = [(r["run"], r["kind"]) for r in records(stream)]
+    assert kinds == [
+        ("ok", "run_summary"),
+        ("bad", "model_response"),
+        ("bad", "run_summary"),
+    ]
+    assert records(stream)[1]["text"] == "xxxxx... [50 chars]"
+    assert log.stats()["counts"]["tail_kept"] == 1
+
+
+def test_debug_capture_marks_runs_started_inside():
+    with debug_capture():
+        assert debug_requested()
+    assert not debug_requested()
+
+
+class BrokenStream(io.StringIO):
+    def write(self, text):
+        if "fail" in text:
+            raise OSError("disk full")
+        return super().write(text)
+
+
+def test_counters_add_up_under_concurrent_writes():
+    writer = LineWriter(BrokenStream(), max_queue=50)
+    threads = [
+        threading.Thread(
+            target=lambda i=i: [
+                writer.write({"n": n, "kind": "fail" if i % 2 else "ok"})
+                for n in range(500)
+            ]
+        )
+        for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.flush()
+    counts = writer.counts()
+    assert counts["written"] + counts["dropped"] == 2000
+    assert counts["dropped"] >= 1000  # every failing record at least
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from venturearchitect.tools import TOOL_CACHE, project_scenarios, run_financial_model
+
+
+def loop_model(assumptions):
+    """The original month-by-month run_financial_model, unrounded."""
+    months = int(assumptions.get("months", 36))
+    users = float(assumptions.get("initial_users", 50))
+    growth = float(assumptions.get("monthly_growth_rate", 0.1))
+    arpu = float(assumptions.get("arpu", 5.0))
+    fixed_costs = float(assumptions.get("fixed_costs", 1500.0))
+    variable = float(assumptions.get("variable_cost_per_user", 0.1))
+    rows, break_even = [], None
+    for month in range(1, months + 1):
+        if month > 1:
+            users *= 1.0 + growth
+        rounded = int(users)
+        revenue = rounded * arpu
+        costs = fixed_costs + rounded * variable
+        profit = revenue - costs
+        rows.append((rounded, revenue, costs, profit))
+        if break_even is None and profit >= 0:
+            break_even = month
+    return rows, break_even
+
+
+SCENARIOS = [
+    {},
+    {"initial_users": 120, "monthly_growth_rate": 0.07, "arpu": 12.5, "months": 48},
+    {"monthly_growth_rate": -0.05, "arpu": 40, "fixed_costs": 900, "months": 24},
+    {"monthly_growth_rate": 0.15, "arpu": 0.05, "variable_cost_per_user": 0.2},
+    {"initial_users": 0, "months": 12},
+    {"monthly_growth_rate": 0.0, "arpu": 31, "fixed_costs": 1500, "months": 7},
+    {"months": 0},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_tool_cache():
+    TOOL_CACHE.clear()
+
+
+def test_projection_matches_loop_bit_for_bit():
+    projection = project_scenarios(SCENARIOS)
+    for i, assumptions in enumerate(SCENARIOS):
+        rows, break_even = loop_model(assumptions)
+        months = len(rows)
+        assert int(projection["months"][i]) == months
+        for column, key in enumerate(("users", "revenue", "costs", "profit")):
+            expected = [row[column] for row in rows]
+            assert projection[key][i, :months].tolist() == expected
+            # Months past a scenario's horizon are zero-padded.
+            assert not projection[key][i, months:].any()
+        assert int(projection["break_even_month"][i]) == (break_even or 0)
+
+
+def test_batch_equals_single_scenarios():
+    batch = project_scenarios(SCENARIOS)
+    for i, assumptions in enumerate(SCENARIOS):
+        single = project_scenarios([assumptions])
+        months = int(single["months"][0])
+        for key in ("users", "revenue", "costs", "profit"):
+            np.testing.assert_array_equal(
+                batch[key][i, :months], single[key][0, :months]
+            )
+
+
+@pytest.mark.parametrize("assumptions", SCENARIOS)
+def test_full_detail_matches_rounded_loop(assumptions):
+    result = run_financial_model(assumptions, detail="full")
+    rows, break_even = loop_model(assumptions)
+    assert result["break_even_month"] == break_even
+    assert [
+        (p["users"], p["revenue"], p["costs"], p["profit"])
+        for p in result["projections"]
+    ] == [
+        (users, round(revenue, 2), round(costs, 2), round(profit, 2))
+        for users, revenue, costs, profit in rows
+    ]
+
+
+def test_columns_layout_carries_the_same_values():
+    assumptions = SCENARIOS[1]
+    rows = run_financial_model(assumptions, detail="full")
+    columns = run_financial_model(assumptions, detail="full", layout="columns")
+    assert columns["projections"]["profit"] == [
+        p["profit"] for p in rows["projections"]
+    ]
+    assert columns["yearly_summary"]["revenue"] == [
+        y["revenue"] for y in rows["yearly_summary"]
+    ]
@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+import pytest
+
+from venturearchitect import http_pool
+from venturearchitect.agents.config import default_gemini_model
+from venturearchitect.http_pool import SharedHttpClients
+
+RESPONSE = {
+    "candidates": [{"content": {"role": "model", "parts": [{"text": "hi"}]}}]
+}
+
+
+class FakeConnectionPool(httpx.AsyncBaseTransport):
+    """Stands in for httpx's connection pool; remembers the loop it serves."""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.get_running_loop()
+        self.requests = 0
+        FakeConnectionPool.created.append(self)
+
+    async def handle_async_request(self, request):
+        assert asyncio.get_running_loop() is self.loop
+        self.requests += 1
+        return httpx.Response(200, json=RESPONSE, request=request)
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.delenv("VENTUREARCHITECT_HTTP_POOL", raising=False)
+    monkeypatch.setattr(FakeConnectionPool, "created", [])
+    monkeypatch.setattr(http_pool.httpx, "AsyncHTTPTransport", FakeConnectionPool)
+    clients = SharedHttpClients()
+    monkeypatch.setattr(http_pool, "http_clients", clients)
+    return clients
+
+
+def test_models_share_one_pool_per_event_loop(clients):
+    # Relies on ADK's Gemini.api_client honouring client_kwargs and on
+    # google-genai using the httpx clients from HttpOptions.
+    models = [
+        default_gemini_model("strategy_agent"),
+        default_gemini_model("financial_agent"),
+    ]
+
+    async def generate():
+        for model in models:
+            response = await model.api_client.aio.models.generate_content(
+                model=model.model, contents="hello"
+            )
+            assert response.text == "hi"
+
+    asyncio.run(generate())
+    (pool,) = FakeConnectionPool.created
+    assert pool.requests == 2
+
+    asyncio.run(generate())  # a new event loop gets its own pool
+    assert len(FakeConnectionPool.created) == 2
+    assert FakeConnectionPool.created[1].requests == 2
+
+    report = clients.report()
+    assert report["counts"]["requests"] == 4
+    assert report["counts"]["failures"] == 0
+
+
+def test_pooling_can_be_turned_off(clients, monkeypatch):
+    monkeypatch.setenv("VENTUREARCHITECT_HTTP_POOL", "0")
+    model = default_gemini_model("strategy_agent")
+    assert model.client_kwargs is None  # ADK builds its own client
@@ -0,0 +1,70 @@
+import json
+import pathlib
+import subprocess
+import sys
+
+from venturearchitect import idea_index
+from venturearchitect.idea_index import IdeaIndex
+
+
+def test_similar_ideas_are_found_and_ranked(tmp_path):
+    index = IdeaIndex(path=str(tmp_path / "ideas.jsonl"))
+    index.add("Mobile dog grooming van for busy pet owners", plan="plan A")
+    index.add("Neighbourhood tool library with a membership app", plan="plan B")
+    matches = index.query("mobile dog grooming vans for pet owners")
+    assert [m["idea"] for m in matches] == [
+        "Mobile dog grooming van for busy pet owners"
+    ]
+    assert matches[0]["similarity"] >= 0.5
+    assert index.query("quantum chip design consultancy") == []
+
+
+def test_reload_reads_only_ideas_and_serves_plans_from_disk(tmp_path, monkeypatch):
+    path = tmp_path / "ideas.jsonl"
+    index = IdeaIndex(path=str(path))
+    first = index.add("Mobile dog grooming van", profile={"a": 1}, plan="x" * 10_000)
+    index.add("Neighbourhood tool library", plan="plan B")
+
+    def no_full_decode(*args, **kwargs):
+        raise AssertionError("records should not be decoded while loading")
+
+    monkeypatch.setattr(idea_index.json, "loads", no_full_decode)
+    reloaded = IdeaIndex(path=str(path))
+    monkeypatch.undo()
+
+    assert len(reloaded) == 2
+    assert not hasattr(reloaded, "_terms")
+    match = reloaded.query("mobile dog grooming van")[0]
+    assert match["id"] == first
+    record = reloaded.get(match["id"])
+    assert record["plan"] == "x" * 10_000
+    assert record["profile"] == {"a": 1}
+
+
+def test_other_key_orders_and_bad_lines_are_handled(tmp_path):
+    path = tmp_path / "ideas.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"plan": "p", "idea": "Tool library app"}) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"idea": "Dog grooming van", "plan": "q"}) + "\n")
+    index = IdeaIndex(path=str(path))
+    assert len(index) == 2
+    assert index.get(index.query("dog grooming van")[0]["id"])["plan"] == "q"
+    assert index.get(index.query("tool library")[0]["id"])["plan"] == "p"
+
+
+def test_memory_only_index(tmp_path):
+    index = IdeaIndex(path=None)
+    idea_id = index.add("Tool library app", plan="plan")
+    assert index.get(idea_id)["plan"] == "plan"
+    assert not list(tmp_path.iterdir())
+
+
+def test_web_app_loads_the_index_lazily():
+    code = (
+        "import venturearchitect.web_app as w\n"
+        "assert w._idea_index is None\n"
+        "assert w.get_idea_index() is w.get_idea_index()\n"
+    )
+    root = pathlib.Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from venturearchitect.jobs import (
+    CANCELLED,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    InMemoryJobStore,
+    Job,
+    JobQueue,
+    JobStore,
+    QueueFullError,
+    SQLiteJobStore,
+)
+
+
+async def echo(job, report_progress):
+    report_progress({"stage": "done"})
+    return {"idea": job.request["idea"]}
+
+
+def blocking_handler():
+    release = asyncio.Event()
+
+    async def handler(job, report_progress):
+        await release.wait()
+        return {"idea": job.request["idea"]}
+
+    return handler, release
+
+
+async def wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < end, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def stored_status(store, job_id):
+    job = store.get(job_id)  # None until its first save lands
+    return job and job.status
+
+
+def test_jobs_run_and_are_stored(tmp_path):
+    async def main():
+        queue = JobQueue(echo, store=SQLiteJobStore(str(tmp_path / "jobs.db")))
+        job = queue.submit({"idea": "a"})
+        await wait_for(lambda: queue.get(job.id).status == SUCCEEDED)
+        await queue.stop()
+        return queue.store.get(job.id)
+
+    stored = asyncio.run(main())
+    assert stored.result == {"idea": "a"}
+    assert stored.progress == {"stage": "done"}
+
+
+def test_opening_the_store_keeps_live_processes_jobs(tmp_path):
+    path = str(tmp_path / "jobs.db")
+
+    async def main():
+        handler, release = blocking_handler()
+        queue = JobQueue(handler, store=SQLiteJobStore(path), workers=1)
+        running = queue.submit({"idea": "a"})
+        queued = queue.submit({"idea": "b"})
+        await wait_for(lambda: stored_status(queue.store, running.id) == RUNNING)
+        # Another process opens the same database.
+        other = SQLiteJobStore(path)
+        assert other.get(running.id).status == RUNNING
+        assert other.get(queued.id).status == QUEUED
+        release.set()
+        await wait_for(lambda: queue.get(queued.id).status == SUCCEEDED)
+        await queue.stop()
+
+    asyncio.run(main())
+
+
+def test_jobs_of_a_dead_process_are_failed(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = SQLiteJobStore(path, stale_seconds=0.05)
+    store.heartbeat("dead")
+    store.save(Job(id="old", request={}, status=RUNNING, owner="dead"))
+    store.save(Job(id="legacy", request={}, status=QUEUED))  # no owner
+    store.heartbeat("alive")
+    store.save(Job(id="live", request={}, status=RUNNING, owner="alive"))
+    assert store.get("old").status == RUNNING
+
+    time.sleep(0.1)
+    store.heartbeat("alive")
+    assert store.get("old").status == FAILED
+    assert store.get("legacy").status == FAILED
+    assert store.get("live").status == RUNNING
+    # A restart sees the same thing.
+    reopened = SQLiteJobStore(path, stale_seconds=0.05)
+    assert reopened.get("old").error.startswith("Interrupted")
+
+
+def test_cancel_from_another_process(tmp_path):
+    path = str(tmp_path / "jobs.db")
+
+    async def main():
+        handler, release = blocking_handler()
+        owner = JobQueue(
+            handler, store=SQLiteJobStore(path), workers=1, heartbeat_seconds=0.02
+        )
+        running = owner.submit({"idea": "a"})
+        queued = owner.submit({"idea": "b"})
+        await wait_for(lambda: stored_status(owner.store, running.id) == RUNNING)
+
+        other = JobQueue(echo, store=SQLiteJobStore(path))
+        assert other.cancel(running.id).status == RUNNING  # requested only
+        other.cancel(queued.id)
+        await wait_for(lambda: owner.get(running.id).status == CANCELLED)
+        await wait_for(lambda: owner.get(queued.id).status == CANCELLED)
+        await wait_for(lambda: stored_status(other.store, running.id) == CANCELLED)
+        assert owner.counts[SUCCEEDED] == 0
+        await owner.stop()
+
+    asyncio.run(main())
+
+
+def test_cancelled_queued_jobs_free_their_slots():
+    async def main():
+        handler, release = blocking_handler()
+        queue = JobQueue(handler, workers=1, max_queue=2)
+        first = queue.submit({"idea": "a"})
+        await wait_for(lambda: first.status == RUNNING)
+        waiting = [queue.submit({"idea": i}) for i in "bc"]
+        with pytest.raises(QueueFullError):
+            queue.submit({"idea": "d"})
+        for job in waiting:
+            assert queue.cancel(job.id).status == CANCELLED
+        assert queue.depth() == 0
+        last = queue.submit({"idea": "e"})
+        release.set()
+        await wait_for(lambda: last.status == SUCCEEDED)
+        assert [j.status for j in waiting] == [CANCELLED, CANCELLED]
+        assert queue.counts[SUCCEEDED] == 2
+        await queue.stop()
+
+    asyncio.run(main())
+
+
+def test_stop_fails_unfinished_jobs(tmp_path):
+    async def main():
+        handler, release = blocking_handler()
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+        queue = JobQueue(handler, store=store, workers=1)
+        running = queue.submit({"idea": "a"})
+        queued = queue.submit({"idea": "b"})
+        await wait_for(lambda: running.status == RUNNING)
+        await queue.stop()
+        return [store.get(job.id).status for job in (running, queued)]
+
+    assert asyncio.run(main()) == [FAILED, FAILED]
+
+
+class ThreadRecordingStore(InMemoryJobStore):
+    def __init__(self):
+        super().__init__()
+        self.saves = []
+
+    def save(self, job):
+        self.saves.append((threading.current_thread(), job.status, dict(job.progress)))
+        super().save(job)
+
+
+def test_store_writes_run_in_order_off_the_event_loop():
+    async def main():
+        store = ThreadRecordingStore()
+        queue = JobQueue(echo, store=store)
+        job = queue.submit({"idea": "a"})
+        await wait_for(lambda: job.status == SUCCEEDED)
+        await queue.stop()
+        return store, job
+
+    store, job = asyncio.run(main())
+    assert all(thread is not threading.main_thread() for thread, _, _ in store.saves)
+    assert [status for _, status, _ in store.saves] == [
+        QUEUED,
+        RUNNING,
+        RUNNING,
+        SUCCEEDED,
+    ]
+    assert store.saves[1][2] == {}  # snapshots, not the live job
+    assert store.get(job.id).status == SUCCEEDED
+
+
+def test_incomplete_store_fails_when_created():
+    class NoList(JobStore):
+        def save(self, job):
+            pass
+
+        def get(self, job_id):
+            return None
+
+    with pytest.raises(TypeError):
+        NoList()
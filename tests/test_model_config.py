@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from venturearchitect import deadlines
+from venturearchitect.agents import config
+from venturearchitect.agents.config import (
+    AGENT_MODELS,
+    MODEL_TIERS,
+    ModelSettings,
+    default_gemini_model,
+    describe_models,
+    model_settings,
+    quota_budget,
+)
+from venturearchitect.deadlines import RetryStats
+from venturearchitect.quota import Budget, RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv("VENTUREARCHITECT_MODEL_ROUTING", raising=False)
+    monkeypatch.delenv("VENTUREARCHITECT_HEDGING", raising=False)
+    monkeypatch.setattr(deadlines, "retry_stats", RetryStats())
+    for agent_name in AGENT_MODELS:
+        suffix = agent_name.upper()
+        for prefix in ("MODEL", "MAX_TOKENS", "RETRY", "HEDGE"):
+            monkeypatch.delenv(f"VENTUREARCHITECT_{prefix}_{suffix}", raising=False)
+
+
+def test_auto_routing_uses_the_registry_tiers():
+    assert model_settings("discovery_agent") == AGENT_MODELS["discovery_agent"]
+    assert model_settings("discovery_agent").tier == "lite"
+    assert model_settings("research_agent").tier == "standard"
+    assert model_settings("unknown_agent") == ModelSettings()
+    assert model_settings(None) == ModelSettings()
+    report = describe_models()
+    assert report["research_agent"]["model"] == MODEL_TIERS["standard"]
+    assert report["strategy_agent"]["model"] == MODEL_TIERS["lite"]
+
+
+@pytest.mark.parametrize("tier", ["lite", "standard"])
+def test_routing_pins_every_agent_to_one_tier(monkeypatch, tier):
+    monkeypatch.setenv("VENTUREARCHITECT_MODEL_ROUTING", tier)
+    assert {model_settings(name).tier for name in AGENT_MODELS} == {tier}
+    # Only the tier changes; limits and retry policies stay.
+    settings = model_settings("business_plan_agent")
+    assert settings.retry == "quick"
+
+
+def test_environment_overrides_one_agent(monkeypatch):
+    monkeypatch.setenv("VENTUREARCHITECT_MODEL_ROUTING", "lite")
+    monkeypatch.setenv("VENTUREARCHITECT_MODEL_STRATEGY_AGENT", "gemini-custom")
+    monkeypatch.setenv("VENTUREARCHITECT_MAX_TOKENS_STRATEGY_AGENT", "0")
+    monkeypatch.setenv("VENTUREARCHITECT_RETRY_STRATEGY_AGENT", "none")
+    monkeypatch.setenv("VENTUREARCHITECT_HEDGE_STRATEGY_AGENT", "1")
+    assert model_settings("strategy_agent") == ModelSettings(
+        "gemini-custom", max_output_tokens=None, retry="none", hedge=True
+    )
+    assert model_settings("financial_agent").max_output_tokens == 8192
+    monkeypatch.setenv("VENTUREARCHITECT_MAX_TOKENS_FINANCIAL_AGENT", "2048")
+    assert config.generate_content_config("financial_agent").max_output_tokens == 2048
+
+
+def test_hedging_can_be_turned_off_everywhere(monkeypatch):
+    assert model_settings("discovery_agent").hedge
+    monkeypatch.setenv("VENTUREARCHITECT_HEDGE_STRATEGY_AGENT", "1")
+    monkeypatch.setenv("VENTUREARCHITECT_HEDGING", "0")
+    assert not any(model_settings(name).hedge for name in AGENT_MODELS)
+
+
+def test_unknown_retry_policy_is_rejected(monkeypatch):
+    monkeypatch.setenv("VENTUREARCHITECT_RETRY_STRATEGY_AGENT", "forever")
+    with pytest.raises(ValueError, match="Unknown retry policy 'forever'"):
+        model_settings("strategy_agent")
+
+
+def test_quota_budget_maps_models_to_their_tier():
+    assert quota_budget("standard") == "standard"
+    assert quota_budget(MODEL_TIERS["lite"]) == "lite"
+    assert quota_budget("gemini-custom") == "gemini-custom"
+
+
+def test_models_are_built_from_the_settings(monkeypatch):
+    monkeypatch.setenv("VENTUREARCHITECT_MODEL_ROUTING", "standard")
+    model = default_gemini_model("discovery_agent")
+    assert model.model == MODEL_TIERS["standard"]
+    assert model.budget == "standard"
+    assert model.hedge
+    assert model.retry_policy == config.RETRY_POLICIES["default"]
+    assert model.retry_options.attempts == 1  # retried by deadlines.call()
+
+
+def test_resilient_gemini_acquires_from_the_limiter_on_every_try(monkeypatch):
+    limiter = RateLimiter({}, default=Budget("default", rpm=0, tpm=0))
+    monkeypatch.setattr(config, "shared_rate_limiter", lambda: limiter)
+    prompts = []
+
+    async def fake_generate(self, llm_request, stream=False):
+        prompts.append(llm_request.contents[0].parts[0].text)
+        if len(prompts) == 1:
+            raise errors.ServerError(503, {"error": {"message": "busy"}})
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=50
+            ),
+        )
+
+    monkeypatch.setattr(Gemini, "generate_content_async", fake_generate)
+    model = default_gemini_model("strategy_agent")
+    model.retry_policy = types.HttpRetryOptions(
+        attempts=3, initial_delay=0.01, max_delay=0.02, http_status_codes=[503]
+    )
+    request = LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text="x" * 400)])]
+    )
+
+    async def main():
+        return [
+            response.content.parts[0].text
+            async for response in model.generate_content_async(request)
+        ]
+
+    assert asyncio.run(main()) == ["ok"]
+    assert prompts == ["x" * 400] * 2
+    counts = limiter.stats()["lite"]["counts"]
+    assert counts["requests"] == 2  # one draw per try
+    assert counts["tokens_estimated"] == 2 * 101
+    assert counts["tokens_actual"] == 50  # settled once the usage is known
@@ -0,0 +1,219 @@
+import asyncio
+from dataclasses import replace
+from typing import AsyncGenerator, List, Tuple
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from venturearchitect.agents.pipeline_agent import PipelineAgent
+from venturearchitect.pipeline import (
+    DEFAULT_STAGES,
+    PipelineStage,
+    PlanPipeline,
+    SectionedNarrativeAgent,
+    run_agent_text,
+    stage_max_age,
+)
+from venturearchitect.stage_cache import StageCache
+
+
+class EchoAgent(BaseAgent):
+    """Answers with its name and the prompt it got, after `delay` seconds."""
+
+    delay: float = 0.0
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(self.delay)
+        prompt = ctx.user_content.parts[0].text
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(
+                role="model", parts=[types.Part(text=f"[{self.name}]\n{prompt}")]
+            ),
+        )
+
+
+def fake_stages(delay=0.0, evaluation=False):
+    agent = lambda name: EchoAgent(name=name, delay=delay)  # noqa: E731
+    stages = [
+        PipelineStage("discovery", agent("discovery")),
+        PipelineStage("research", agent("research"), ("discovery",)),
+        PipelineStage("strategy", agent("strategy"), ("discovery",)),
+        PipelineStage("financial", agent("financial"), ("discovery",)),
+        PipelineStage(
+            "narrative",
+            agent("narrative"),
+            ("discovery", "research", "strategy", "financial"),
+        ),
+    ]
+    if evaluation:
+        stages.append(PipelineStage("evaluation", agent("evaluation"), ("narrative",)))
+    return stages
+
+
+def test_independent_stages_run_concurrently():
+    pipeline = PlanPipeline(fake_stages(delay=0.2))
+    result = asyncio.run(pipeline.run("tool library"))
+    # Critical path is three stages, not five.
+    stage_seconds = sum(s.seconds for s in result.stages.values())
+    assert result.total_seconds < stage_seconds - 0.3
+    middle = [result.stages[name] for name in ("research", "strategy", "financial")]
+    assert max(s.started_at for s in middle) < min(
+        s.started_at + s.seconds for s in middle
+    )
+    assert result.plan.startswith("[narrative]")
+    assert "## Output of the financial stage" in result.plan
+
+
+def test_evaluation_runs_on_the_finished_plan():
+    pipeline = PlanPipeline(fake_stages(evaluation=True))
+    result = asyncio.run(pipeline.run("tool library"))
+    assert result.plan.startswith("[narrative]")
+    evaluation = result.stages["evaluation"]
+    assert evaluation.output.startswith("[evaluation]")
+    assert "## Output of the narrative stage\n[narrative]" in evaluation.output
+    assert evaluation.started_at >= result.stages["narrative"].started_at
+
+
+@pytest.mark.parametrize(
+    "evaluate, env, expected",
+    [(True, None, True), (False, None, False), (None, "0", False), (None, None, True)],
+)
+def test_pipeline_agent_adds_evaluation_stage(monkeypatch, evaluate, env, expected):
+    monkeypatch.setenv("VENTUREARCHITECT_STAGE_CACHE", "0")
+    if env is None:
+        monkeypatch.delenv("VENTUREARCHITECT_EVALUATE", raising=False)
+    else:
+        monkeypatch.setenv("VENTUREARCHITECT_EVALUATE", env)
+    agent = PipelineAgent(name="pipeline_under_test", evaluate=evaluate)
+    stages = agent.build_pipeline().stages
+    assert ("evaluation" in stages) is expected
+    assert agent.build_pipeline().final_stage == "narrative"
+
+
+def test_pipeline_agent_reports_evaluation_and_profile():
+    agent = PipelineAgent(name="pipeline_under_test")
+    agent.pipeline = PlanPipeline(fake_stages(evaluation=True))
+    service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="test", session_service=service)
+
+    async def main():
+        session = await service.create_session(app_name="test", user_id="u")
+        content = types.Content(role="user", parts=[types.Part(text="tool library")])
+        return [
+            event
+            async for event in runner.run_async(
+                user_id="u", session_id=session.id, new_message=content
+            )
+        ]
+
+    events = asyncio.run(main())
+    stages = [e.custom_metadata["stage"]["name"] for e in events[:-1]]
+    assert sorted(stages) == sorted(
+        ["discovery", "research", "strategy", "financial", "narrative", "evaluation"]
+    )
+    final = events[-1].custom_metadata
+    assert final["profile"].startswith("[discovery]")
+    assert final["evaluation"].startswith("[evaluation]")
+    assert events[-1].content.parts[0].text.startswith("[narrative]")
+
+
+def test_search_stages_expire_with_the_search_cache(monkeypatch):
+    monkeypatch.setenv("VENTUREARCHITECT_SEARCH_TTL_HOURS", "2")
+    research, strategy = DEFAULT_STAGES[1], DEFAULT_STAGES[2]
+    assert stage_max_age(research) == 2 * 3600
+    assert stage_max_age(strategy) is None
+    assert stage_max_age(replace(strategy, max_age_seconds=5.0)) == 5.0
+
+
+def test_expired_cached_stages_rerun():
+    cache = StageCache(directory=None)
+    stages = fake_stages()
+    stages[1] = replace(stages[1], max_age_seconds=0.05)  # research
+    pipeline = PlanPipeline(stages, cache=cache)
+
+    async def main():
+        await pipeline.run("tool library")
+        cached = await pipeline.run("tool library")
+        await asyncio.sleep(0.06)
+        return cached, await pipeline.run("tool library")
+
+    cached, expired = asyncio.run(main())
+    assert all(stage.cached for stage in cached.stages.values())
+    rerun = {name for name, stage in expired.stages.items() if not stage.cached}
+    assert rerun == {"research"}  # same output, so narrative stays cached
+
+
+class SectionWriter(BaseAgent):
+    """Writes "Text of <section>"; fails the first try of `flaky` sections."""
+
+    flaky: Tuple[str, ...] = ()
+    prompts: List[str] = []
+    finished: List[str] = []
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        prompt = ctx.user_content.parts[0].text
+        section = prompt.splitlines()[0].removeprefix("Section to write: ")
+        first_try = prompt not in self.prompts
+        self.prompts.append(prompt)
+        if section in self.flaky and first_try:
+            raise RuntimeError("model overloaded")
+        # The first body section finishes last, out of stitching order.
+        await asyncio.sleep(0.05 if section == "Market" else 0)
+        self.finished.append(section)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=f"## {section}\n\nText of {section}.")],
+            ),
+        )
+
+
+def run_sections(writer, sections):
+    agent = SectionedNarrativeAgent(
+        name="sections", section_agent=writer, sections=sections
+    )
+    service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="test", session_service=service)
+    return asyncio.run(run_agent_text(runner, "Idea: tool library", "u", "s"))
+
+
+SECTIONS = ("Executive Summary", "Market", "Strategy", "Financials")
+
+
+def test_sections_are_stitched_in_order_with_the_summary_written_last():
+    writer = SectionWriter(name="writer", prompts=[], finished=[])
+    plan = run_sections(writer, SECTIONS)
+    assert [line for line in plan.splitlines() if line.startswith("##")] == [
+        f"## {section}" for section in SECTIONS
+    ]
+    assert "## Market\n\nText of Market." in plan
+    assert writer.finished[-2:] == ["Market", "Executive Summary"]
+    summary_prompt = writer.prompts[-1]
+    assert summary_prompt.startswith("Section to write: Executive Summary")
+    assert "Idea: tool library" in summary_prompt
+    for section in SECTIONS[1:]:
+        assert f"## {section}\n\nText of {section}." in summary_prompt
+
+
+def test_a_failed_section_is_retried_on_its_own():
+    writer = SectionWriter(
+        name="writer", flaky=("Strategy",), prompts=[], finished=[]
+    )
+    plan = run_sections(writer, SECTIONS)
+    assert "Text of Strategy." in plan
+    tries = [p.splitlines()[0] for p in writer.prompts]
+    assert tries.count("Section to write: Strategy") == 2
+    assert tries.count("Section to write: Market") == 1
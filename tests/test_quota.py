@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from venturearchitect.quota import (
+    Budget,
+    InMemoryQuotaStore,
+    QuotaStore,
+    RateLimiter,
+    SQLiteQuotaStore,
+    _take,
+)
+
+
+def test_take_draws_requests_and_tokens_then_waits():
+    budget = Budget("tier", rpm=60, tpm=600, burst_seconds=2)  # 2 req, 20 tok
+    state, wait = _take(budget, None, 15, now=0.0)
+    assert wait == 0.0 and state == (1.0, 5.0, 0.0)
+    state, wait = _take(budget, state, 15, now=0.0)
+    assert wait == pytest.approx(1.0)  # 10 tokens short at 10 tokens/second
+    state, wait = _take(budget, state, 15, now=1.0)
+    assert wait == 0.0
+    state, wait = _take(budget, state, 0, now=1.0)
+    assert wait == 0.0
+    state, wait = _take(budget, state, 0, now=1.0)
+    assert wait == pytest.approx(1.0)  # out of requests at 1/second
+
+
+def test_take_caps_oversized_calls_and_ignores_zero_limits():
+    budget = Budget("tier", rpm=60, tpm=600, burst_seconds=2)
+    state, wait = _take(budget, None, 10_000, now=0.0)
+    assert wait == 0.0  # charged a full bucket rather than waiting forever
+    unlimited = Budget("free", rpm=0, tpm=0)
+    state = None
+    for _ in range(100):
+        state, wait = _take(unlimited, state, 10_000, now=0.0)
+        assert wait == 0.0
+
+
+@pytest.mark.parametrize("kind", ["memory", "sqlite"])
+def test_stores_share_state_and_settle(kind, tmp_path):
+    budget = Budget("tier", rpm=600, tpm=600, burst_seconds=10)  # 100 tokens
+    if kind == "memory":
+        first = second = InMemoryQuotaStore()
+    else:
+        path = str(tmp_path / "quota.db")
+        first, second = SQLiteQuotaStore(path), SQLiteQuotaStore(path)
+    assert first.try_acquire(budget, 60) == 0.0
+    assert second.try_acquire(budget, 60) > 0  # the other process's draw counts
+    first.adjust(budget, -50)  # the call turned out smaller than estimated
+    assert second.try_acquire(budget, 60) == 0.0
+
+
+def test_limiter_paces_callers_in_order():
+    async def main():
+        limiter = RateLimiter(
+            {"tier": Budget("tier", rpm=600, tpm=0, burst_seconds=0.1)},
+            default=Budget("other", rpm=0, tpm=0),
+        )
+        order = []
+
+        async def call(i):
+            await limiter.acquire("tier", 10)
+            order.append(i)
+
+        await asyncio.gather(*(call(i) for i in range(4)))
+        return order, limiter.stats()["tier"]
+
+    order, stats = asyncio.run(main())
+    assert order == [0, 1, 2, 3]
+    assert stats["counts"]["requests"] == 4
+    assert stats["counts"]["waited"] == 3
+    assert stats["waiting"] == 0
+
+
+def test_cancelled_waiters_leave_the_queue():
+    async def main():
+        limiter = RateLimiter(
+            {"tier": Budget("tier", rpm=1, tpm=0, burst_seconds=60)},
+            default=Budget("other", rpm=0, tpm=0),
+        )
+        await limiter.acquire("tier", 1)
+        waiter = asyncio.create_task(limiter.acquire("tier", 1))
+        await asyncio.sleep(0.01)
+        assert limiter.stats()["tier"]["waiting"] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # Unknown budgets use the default (here unlimited) limits.
+        assert await limiter.acquire("some-model", 1) < 0.01
+        return limiter.stats()["tier"]["waiting"]
+
+    assert asyncio.run(main()) == 0
+
+
+def test_disabled_limiter_only_counts():
+    async def main():
+        limiter = RateLimiter(
+            {}, default=Budget("tier", rpm=1, tpm=1), enabled=False
+        )
+        waits = [await limiter.acquire("tier", 100) for _ in range(3)]
+        limiter.settle("tier", 100, 80)
+        return waits, limiter.stats()["tier"]["counts"]
+
+    waits, counts = asyncio.run(main())
+    assert waits == [0.0, 0.0, 0.0]
+    assert counts["tokens_estimated"] == 300 and counts["tokens_actual"] == 80
+
+
+def test_incomplete_store_fails_when_created():
+    class NoAdjust(QuotaStore):
+        def try_acquire(self, budget, tokens):
+            return 0.0
+
+    with pytest.raises(TypeError):
+        NoAdjust()
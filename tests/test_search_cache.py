@@ -0,0 +1,202 @@
+import asyncio
+import json
+import time
+
+import pytest
+from google.genai import errors, types
+
+from venturearchitect import deadlines, search_cache
+from venturearchitect.quota import shared_rate_limiter
+from venturearchitect.search_cache import (
+    GeminiSearchBackend,
+    LocalSearchBackend,
+    SearchCache,
+    normalize_query,
+    web_search,
+)
+
+QUERY = "tool library market size"
+
+
+class FailingBackend:
+    def __init__(self, delay_seconds=0.05):
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    async def search(self, query):
+        self.calls += 1
+        await asyncio.sleep(self.delay_seconds)
+        raise RuntimeError("backend down")
+
+
+def test_normalize_query_keeps_word_order():
+    assert normalize_query("Flights  London, to PARIS!") == "flights london to paris"
+    assert normalize_query("flights london to paris") != normalize_query(
+        "flights paris to london"
+    )
+    assert normalize_query("very cheap flights") != normalize_query(
+        "very very cheap flights"
+    )
+
+
+def test_concurrent_misses_share_one_backend_call():
+    backend = LocalSearchBackend(delay_seconds=0.05)
+    cache = SearchCache(backend)
+
+    async def main():
+        return await asyncio.gather(
+            cache.search(QUERY), cache.search("  Tool library, market SIZE?")
+        )
+
+    first, second = asyncio.run(main())
+    assert backend.calls == 1
+    assert first == second
+    assert first["cached"] is False
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    backend = LocalSearchBackend(delay_seconds=0.1)
+    cache = SearchCache(backend)
+
+    async def main():
+        leader = asyncio.ensure_future(cache.search(QUERY))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.search(QUERY))
+        await asyncio.sleep(0.01)
+        leader.cancel()  # e.g. the leader's client disconnected
+        result = await follower
+        return leader, result
+
+    leader, result = asyncio.run(main())
+    assert leader.cancelled()
+    assert result["summary"].startswith("[offline search backend]")
+    assert backend.calls == 1
+
+
+def test_call_completes_and_is_cached_when_every_caller_leaves():
+    backend = LocalSearchBackend(delay_seconds=0.05)
+    cache = SearchCache(backend)
+
+    async def main():
+        caller = asyncio.ensure_future(cache.search(QUERY))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+        return await cache.search(QUERY)
+
+    result = asyncio.run(main())
+    assert result["cached"] is True
+    assert backend.calls == 1
+
+
+def test_backend_errors_reach_every_waiter_once():
+    backend = FailingBackend()
+    cache = SearchCache(backend)
+
+    async def main():
+        return await asyncio.gather(
+            cache.search(QUERY), cache.search(QUERY), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert backend.calls == 1
+    assert cache.stats()["backend_errors"] == 1
+
+
+def test_web_search_returns_backend_errors_to_the_model(monkeypatch):
+    backend = FailingBackend(delay_seconds=0)
+    monkeypatch.setattr(search_cache, "_default_search_cache", SearchCache(backend))
+
+    result = asyncio.run(web_search(QUERY))
+    assert result == {
+        "error": "Search failed: backend down",
+        "summary": "",
+        "sources": [],
+    }
+
+
+def test_stale_entry_is_served_while_refreshing():
+    backend = LocalSearchBackend(delay_seconds=0.02)
+    cache = SearchCache(backend, ttl_seconds=60, stale_seconds=3600)
+    key = cache._key(normalize_query(QUERY))
+    entry = {
+        "query": QUERY,
+        "fetched_at": time.time() - 120,
+        "result": {"summary": "old", "sources": []},
+    }
+    cache.store.put(key, "search", json.dumps(entry))
+
+    async def main():
+        stale = await cache.search(QUERY)
+        await asyncio.sleep(0.05)
+        return stale, await cache.search(QUERY)
+
+    stale, fresh = asyncio.run(main())
+    assert stale["summary"] == "old" and stale["age_seconds"] >= 120
+    assert fresh["summary"] != "old" and fresh["age_seconds"] < 5
+    assert backend.calls == 1
+    assert cache.stats()["background_refreshes"] == 1
+
+
+class FakeModels:
+    def __init__(self, failures, code=503):
+        self.failures = failures
+        self.code = code
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise errors.ServerError(self.code, {"error": {"message": "busy"}})
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(
+                        role="model", parts=[types.Part(text="summary")]
+                    )
+                )
+            ],
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=30
+            ),
+        )
+
+
+def gemini_backend(failures):
+    backend = GeminiSearchBackend(
+        model="search-test-model",
+        retry_policy=types.HttpRetryOptions(
+            attempts=3, initial_delay=0.01, max_delay=0.02, http_status_codes=[503]
+        ),
+    )
+    models = FakeModels(failures)
+    backend._client = type("Client", (), {"aio": type("Aio", (), {"models": models})})
+    return backend, models
+
+
+def test_gemini_backend_retries_and_is_paced():
+    backend, models = gemini_backend(failures=2)
+    requests_before = (
+        shared_rate_limiter().stats().get("search-test-model", {}).get("counts", {})
+    ).get("requests", 0)
+    result = asyncio.run(backend.search(QUERY))
+    assert result == {"summary": "summary", "sources": []}
+    assert models.calls == 3
+    counts = shared_rate_limiter().stats()["search-test-model"]["counts"]
+    assert counts["requests"] - requests_before == 3  # one draw per try
+
+
+def test_gemini_backend_respects_the_request_deadline():
+    backend, models = gemini_backend(failures=100)
+    backend.retry_policy = types.HttpRetryOptions(
+        attempts=50, initial_delay=0.05, max_delay=0.05, http_status_codes=[503]
+    )
+
+    async def main():
+        with deadlines.deadline(0.12):
+            await backend.search(QUERY)
+
+    with pytest.raises(deadlines.DeadlineExceeded):
+        asyncio.run(main())
+    assert models.calls < 50
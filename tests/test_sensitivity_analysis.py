@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from venturearchitect import tools
+from venturearchitect.tools import (
+    TOOL_CACHE,
+    run_sensitivity_analysis,
+    sensitivity_analysis,
+    shutdown_simulation_pool,
+)
+
+ASSUMPTIONS = {
+    "initial_users": 200,
+    "monthly_growth_rate": 0.08,
+    "arpu": 9.0,
+    "fixed_costs": 2500,
+    "variable_cost_per_user": 0.5,
+    "months": 24,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_tool_cache():
+    TOOL_CACHE.clear()
+
+
+@pytest.mark.parametrize(
+    "distributions",
+    [
+        {"arpu": {"distribution": "normal", "sd": -1}},
+        {"arpu": {"distribution": "uniform", "low": 10, "high": 5}},
+        {"arpu": {"low": "x"}},
+        {"arpu": {"low": 12}},  # triangular low above the base (mode) value
+        {"arpu": {"mode": 20}},
+        {"arpu": {"distribution": "normal", "mean": float("nan")}},
+        {"arpu": {"distribution": "lognormal"}},
+        {"arpu": 5},
+        ["arpu"],
+    ],
+)
+def test_invalid_distributions_return_an_error(distributions):
+    result = sensitivity_analysis(ASSUMPTIONS, distributions, num_samples=100)
+    assert set(result) == {"error"}
+    assert result["error"].startswith("Invalid distributions")
+
+
+def test_negative_spread_is_an_error():
+    assert "error" in sensitivity_analysis(ASSUMPTIONS, spread=-0.2, num_samples=100)
+
+
+def test_numeric_strings_are_accepted():
+    result = sensitivity_analysis(
+        ASSUMPTIONS,
+        {"fixed_costs": {"distribution": "uniform", "low": "2000", "high": "3000"}},
+        num_samples=500,
+    )
+    assert "error" not in result
+    row = next(r for r in result["tornado"] if r["assumption"] == "fixed_costs")
+    assert 2000 <= row["low_value"] <= row["high_value"] <= 3000
+
+
+def test_results_are_deterministic_and_bounds_ordered():
+    first = sensitivity_analysis(ASSUMPTIONS, num_samples=2000, seed=7)
+    TOOL_CACHE.clear()
+    second = sensitivity_analysis(ASSUMPTIONS, num_samples=2000, seed=7)
+    assert first == second
+    assert first["num_samples"] == 2000
+    assert 0.0 <= first["break_even_probability"] <= 1.0
+    for row in first["tornado"]:
+        assert row["low_value"] <= row["high_value"]
+    bands = first["bands"]["total_profit"]
+    assert bands["p10"] <= bands["p50"] <= bands["p90"]
+
+
+def test_process_pool_matches_in_process_run(monkeypatch):
+    samples = tools._SIMULATION_CHUNK * 2 + 10
+    monkeypatch.setattr(tools.os, "cpu_count", lambda: 2)
+    try:
+        pooled = sensitivity_analysis(ASSUMPTIONS, num_samples=samples, seed=3)
+        pool = tools._simulation_pool
+        assert pool is not None
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        shutdown_simulation_pool()
+    assert tools._simulation_pool is None
+    TOOL_CACHE.clear()
+    monkeypatch.setattr(tools, "_get_simulation_pool", lambda: None)
+    inline = sensitivity_analysis(ASSUMPTIONS, num_samples=samples, seed=3)
+    assert pooled == inline
+
+
+def test_tool_runs_off_the_event_loop(monkeypatch):
+    def slow_analysis(*args):
+        import time
+
+        time.sleep(0.3)
+        return {"ok": True}
+
+    monkeypatch.setattr(tools, "sensitivity_analysis", slow_analysis)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        result = await run_sensitivity_analysis(ASSUMPTIONS)
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(main())
+    assert result == {"ok": True}
+    assert ticks >= 10  # the loop kept running while the analysis did
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from venturearchitect.sessions import EvictingSessionService, SQLiteSessionService
+
+
+def event(text, author="user", partial=None, state=None):
+    # Only agent events can be final responses, which flush right away.
+    return Event(
+        author=author,
+        invocation_id="run",
+        partial=partial,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta=state or {}),
+    )
+
+
+def texts(session):
+    return [e.content.parts[0].text for e in session.events]
+
+
+def service(tmp_path, **kwargs):
+    kwargs.setdefault("flush_interval", 60)
+    return SQLiteSessionService(str(tmp_path / "sessions.db"), **kwargs)
+
+
+async def new_session(sessions, session_id="s"):
+    return await sessions.create_session(
+        app_name="app", user_id="u", session_id=session_id
+    )
+
+
+def test_events_are_batched_and_survive_a_restart(tmp_path):
+    async def main():
+        sessions = service(tmp_path)
+        session = await new_session(sessions)
+        await sessions.append_event(session, event("a", partial=True))
+        await sessions.append_event(session, event("b", state={"step": 1}))
+        assert sessions.stats()["pending_events"] == 1
+        await sessions.append_event(session, event("plan", author="agent"))
+        await sessions.close()
+        assert sessions.counts["flushes"] == 1
+
+        reopened = service(tmp_path)
+        stored = await reopened.get_session(app_name="app", user_id="u", session_id="s")
+        await reopened.close()
+        return stored
+
+    stored = asyncio.run(main())
+    assert texts(stored) == ["b", "plan"]
+    assert stored.state["step"] == 1
+
+
+def test_failed_flush_keeps_events_in_order(tmp_path, monkeypatch):
+    async def main():
+        sessions = service(tmp_path)
+        session = await new_session(sessions)
+        await sessions.append_event(session, event("a", state={"step": 1}))
+        write_batch = sessions._write_batch
+
+        def broken(batch):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(sessions, "_write_batch", broken)
+        with pytest.raises(OSError):
+            await sessions.flush()
+        await sessions.append_event(session, event("b", state={"step": 2}))
+        assert sessions.stats()["pending_events"] == 2
+
+        monkeypatch.setattr(sessions, "_write_batch", write_batch)
+        stored = await sessions.get_session(app_name="app", user_id="u", session_id="s")
+        counts = dict(sessions.counts)
+        await sessions.close()
+        return stored, counts
+
+    stored, counts = asyncio.run(main())
+    assert texts(stored) == ["a", "b"]
+    assert stored.state["step"] == 2
+    assert counts["flush_errors"] == 1
+
+
+def test_background_flush_errors_are_logged(tmp_path, monkeypatch, caplog):
+    async def main():
+        sessions = service(tmp_path, flush_interval=0.01)
+        session = await new_session(sessions)
+
+        def broken(batch):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(sessions, "_write_batch", broken)
+        await sessions.append_event(session, event("a"))
+        await asyncio.sleep(0.1)
+        pending = sessions.stats()["pending_events"]
+        monkeypatch.undo()
+        await sessions.close()
+        return pending
+
+    with caplog.at_level(logging.ERROR, logger="venturearchitect.sessions"):
+        assert asyncio.run(main()) == 1
+    assert "Background session flush failed" in caplog.text
+
+
+def test_concurrent_runs_share_commits(tmp_path):
+    async def run(sessions, session_id):
+        session = await new_session(sessions, session_id)
+        for i in range(5):
+            await sessions.append_event(session, event(f"{session_id}-{i}"))
+            await asyncio.sleep(0)
+
+    async def main():
+        sessions = service(tmp_path, flush_interval=0.01)
+        await asyncio.gather(*(run(sessions, f"s{i}") for i in range(10)))
+        stored = [
+            await sessions.get_session(app_name="app", user_id="u", session_id=f"s{i}")
+            for i in range(10)
+        ]
+        flushes = sessions.counts["flushes"]
+        await sessions.close()
+        return stored, flushes
+
+    stored, flushes = asyncio.run(main())
+    for i, session in enumerate(stored):
+        assert texts(session) == [f"s{i}-{n}" for n in range(5)]
+    assert flushes < 50
+
+
+def test_sessions_past_the_retention_period_are_deleted(tmp_path):
+    async def main():
+        sessions = service(tmp_path, max_age_seconds=3600)
+        old = await new_session(sessions, "old")
+        old_event = event("old plan")
+        old_event.timestamp = time.time() - 7200
+        await sessions.append_event(old, old_event)
+        recent = await new_session(sessions, "recent")
+        await sessions.append_event(recent, event("plan", author="agent"))
+        await sessions.flush()
+        await sessions.compact()
+        listed = await sessions.list_sessions(app_name="app", user_id="u")
+        events = sessions._conn.execute("SELECT COUNT(*) FROM events").fetchone()
+        expired = sessions.counts["expired_sessions"]
+        await sessions.close()
+        return [s.id for s in listed.sessions], events[0], expired
+
+    assert asyncio.run(main()) == (["recent"], 1, 1)
+
+
+def test_idle_sessions_expire(tmp_path):
+    async def main():
+        sessions = EvictingSessionService(ttl_seconds=0.05)
+        for session_id in ("a", "b"):
+            await new_session(sessions, session_id)
+        time.sleep(0.06)
+        await new_session(sessions, "c")
+        expired = await sessions.inner.get_session(
+            app_name="app", user_id="u", session_id="a"
+        )
+        return sessions, expired
+
+    sessions, expired = asyncio.run(main())
+    assert expired is None
+    assert sessions.counts["evicted_ttl"] == 2
+    assert sessions.stats()["sessions"] == 1
+
+
+def test_capacity_eviction_skips_sessions_in_use(tmp_path):
+    async def main():
+        sessions = EvictingSessionService(max_sessions=2)
+        # Seen through writes only, e.g. created before this service.
+        for session_id in ("old1", "old2"):
+            old = await sessions.inner.create_session(
+                app_name="app", user_id="u", session_id=session_id
+            )
+            await sessions.append_event(old, event(session_id))
+        running = [await new_session(sessions, i) for i in ("r1", "r2", "r3")]
+        for session in running:  # every run can still write its events
+            await sessions.append_event(session, event("x"))
+        stored = [
+            await sessions.get_session(app_name="app", user_id="u", session_id=i)
+            for i in ("old1", "r1", "r2", "r3")
+        ]
+        return sessions, stored
+
+    sessions, (old1, *running) = asyncio.run(main())
+    assert old1 is None
+    assert [texts(session) for session in running] == [["x"]] * 3
+    assert sessions.counts["evicted_capacity"] == 2
+    stats = sessions.stats()
+    assert (stats["sessions"], stats["in_use"]) == (3, 3)
+
+
+def test_deleted_sessions_become_evictable_again(tmp_path):
+    async def main():
+        sessions = EvictingSessionService(max_sessions=1)
+        await new_session(sessions, "a")
+        await new_session(sessions, "b")
+        await sessions.delete_session(app_name="app", user_id="u", session_id="a")
+        return sessions
+
+    sessions = asyncio.run(main())
+    assert sessions.counts["deleted"] == 1
+    assert sessions.counts["evicted_capacity"] == 0
+    assert sessions.stats()["sessions"] == sessions.stats()["in_use"] == 1
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+
+from google.adk.agents import LlmAgent
+
+from venturearchitect import stage_cache
+from venturearchitect.stage_cache import StageCache, agent_fingerprint, stage_key
+
+
+def lookup_prices(city: str) -> dict:
+    """Look up prices in a city."""
+    return {"city": city}
+
+
+def lookup_prices_v2(city: str, currency: str = "EUR") -> dict:
+    """Look up prices in a city, in a currency."""
+    return {"city": city, "currency": currency}
+
+
+def instruction(ctx) -> str:
+    return "Be brief."
+
+
+def make_agent(tools=(lookup_prices,), instruction=instruction):
+    return LlmAgent(name="agent", instruction=instruction, tools=list(tools))
+
+
+def test_round_trip_through_disk(tmp_path):
+    StageCache(directory=str(tmp_path)).put("ab" * 32, "research", "output")
+    fresh = StageCache(directory=str(tmp_path))
+    assert fresh.get("ab" * 32) == "output"
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_async_round_trip(tmp_path):
+    async def main():
+        cache = StageCache(directory=str(tmp_path))
+        await cache.aput("cd" * 32, "research", "output")
+        return await StageCache(directory=str(tmp_path)).aget("cd" * 32)
+
+    assert asyncio.run(main()) == "output"
+
+
+def test_disk_write_errors_are_counted_not_raised(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    cache = StageCache(directory=str(tmp_path))
+    monkeypatch.setattr(stage_cache.tempfile, "mkstemp", fail)
+    cache.put("ef" * 32, "research", "output")
+    assert cache.stats()["disk_errors"] == 1
+    assert cache.get("ef" * 32) == "output"  # still served from memory
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_failed_rename_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    cache = StageCache(directory=str(tmp_path))
+    monkeypatch.setattr(stage_cache.os, "replace", fail)
+    cache.put("12" * 32, "research", "output")
+    assert cache.stats()["disk_errors"] == 1
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_unusable_directory_does_not_raise(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    cache = StageCache(directory=str(blocker / "stages"))
+    cache.put("34" * 32, "research", "output")
+    assert cache.get("34" * 32) == "output"
+    assert cache.stats()["disk_errors"] >= 1
+
+
+def test_eviction_keeps_disk_under_limit(tmp_path):
+    cache = StageCache(directory=str(tmp_path), max_disk_bytes=2000)
+    for i in range(20):
+        cache.put(f"{i:02d}" * 32, "research", "x" * 300)
+    stats = cache.stats()
+    assert stats["disk_evictions"] > 0
+    assert stats["disk_bytes"] <= 2000
+    on_disk = sum(os.path.getsize(p) for p in tmp_path.rglob("*.json"))
+    assert on_disk == stats["disk_bytes"]
+
+
+def test_fingerprint_is_stable_for_equal_agents():
+    def provider_for(text):
+        def provider(ctx) -> str:
+            return text
+
+        return provider
+
+    # Two closures at different addresses, same source: same fingerprint.
+    first = make_agent(instruction=provider_for("Be brief."))
+    second = make_agent(instruction=provider_for("Be brief."))
+    assert first.instruction is not second.instruction
+    assert agent_fingerprint(first) == agent_fingerprint(second)
+    assert agent_fingerprint(make_agent()) != agent_fingerprint(first)
+
+
+def test_fingerprint_changes_with_tool_declarations():
+    assert agent_fingerprint(make_agent()) != agent_fingerprint(
+        make_agent(tools=(lookup_prices_v2,))
+    )
+    assert agent_fingerprint(make_agent()) != agent_fingerprint(make_agent(tools=()))
+
+
+def test_stage_key_depends_on_inputs_and_normalized_idea():
+    agent = make_agent()
+    key = stage_key("Tool  Library", "research", agent, {"discovery": "a"})
+    assert key == stage_key("tool library", "research", agent, {"discovery": "a"})
+    assert key != stage_key("tool library", "research", agent, {"discovery": "b"})
+
+
+
+def test_entries_older_than_max_age_are_misses(tmp_path):
+    cache = StageCache(directory=str(tmp_path))
+    cache.put("56" * 32, "research", "output")
+    assert cache.get("56" * 32, max_age_seconds=60) == "output"
+    time.sleep(0.02)
+    assert cache.get("56" * 32, max_age_seconds=0.01) is None
+    # The disk copy carries its creation time across processes.
+    fresh = StageCache(directory=str(tmp_path))
+    assert asyncio.run(fresh.aget("56" * 32, max_age_seconds=0.01)) is None
+    assert fresh.get("56" * 32) == "output"
+    assert cache.stats()["expired"] == 1
+    assert fresh.stats()["expired"] == 1
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from venturearchitect.tools import (
+    TOOL_CACHE,
+    ToolCache,
+    _canonical,
+    cached_tool,
+    run_financial_model,
+    tool_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_tool_cache():
+    TOOL_CACHE.clear()
+
+
+def test_key_ignores_dict_order_and_number_types():
+    assert _canonical({"a": 1, "b": 2.5}) == _canonical({"b": 2.5, "a": 1})
+    assert _canonical({"arpu": 5}) == _canonical({"arpu": 5.0})
+    assert _canonical([0.0, 3]) == _canonical((-0.0, 3.0))
+    assert _canonical(True) != _canonical(1)
+    assert _canonical({"arpu": 5}) != _canonical({"arpu": 6})
+
+
+def test_hit_echoes_the_callers_own_assumptions():
+    before = tool_cache_stats().get("financial_model", {"hits": 0})["hits"]
+    as_int = run_financial_model({"arpu": 5, "months": 12})
+    as_float = run_financial_model({"arpu": 5.0, "months": 12})
+    assert tool_cache_stats()["financial_model"]["hits"] == before + 1
+    assert type(as_int["assumptions"]["arpu"]) is int
+    assert type(as_float["assumptions"]["arpu"]) is float
+    assert list(as_float) == list(as_int)
+    assert {**as_float, "assumptions": None} == {**as_int, "assumptions": None}
+    as_float["assumptions"]["arpu"] = 0
+    assert run_financial_model({"months": 12, "arpu": 5.0}) == as_int
+
+
+def test_cached_values_cannot_be_mutated_by_callers():
+    calls = []
+
+    @cached_tool(cache=ToolCache())
+    def tool(x: int):
+        calls.append(x)
+        return {"items": [x]}
+
+    tool(1)["items"].append("mutated")
+    assert tool(1) == {"items": [1]}
+    assert calls == [1]
+
+
+def test_lru_eviction_and_ttl():
+    cache = ToolCache(max_entries=2, ttl_seconds=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    time.sleep(0.06)
+    assert cache.get("c") == (False, None)
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+
+
+def test_uncacheable_arguments_bypass_the_cache():
+    calls = []
+
+    @cached_tool(cache=ToolCache())
+    def tool(x):
+        calls.append(x)
+        return len(calls)
+
+    assert tool(object()) == 1
+    assert tool(object()) == 2
+
+
+def test_stats_are_reported_per_tool():
+    run_financial_model({"months": 6})
+    run_financial_model({"months": 6})
+    stats = tool_cache_stats()["financial_model"]
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
+    assert stats["cache"]["max_entries"] == TOOL_CACHE.max_entries
@@ -0,0 +1,189 @@
+import asyncio
+from typing import AsyncGenerator, List
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import StatusCode
+
+from venturearchitect.pipeline import run_agent_text
+from venturearchitect.tracing import TracingPlugin
+
+
+class ScriptedLlm(BaseLlm):
+    """Returns the next of `responses` on every call."""
+
+    responses: List[LlmResponse] = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        yield self.responses.pop(0)
+
+
+def text(value, tokens=None):
+    usage = None
+    if tokens is not None:
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=tokens, candidates_token_count=5
+        )
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=value)]),
+        usage_metadata=usage,
+    )
+
+
+def tool_call(name):
+    call = types.FunctionCall(id="call-1", name=name, args={"topic": "vans"})
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(function_call=call)])
+    )
+
+
+def tracing():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return TracingPlugin(provider), exporter
+
+
+def runner(agent, plugin):
+    return Runner(
+        agent=agent,
+        app_name="test",
+        session_service=InMemorySessionService(),
+        plugins=[plugin],
+    )
+
+
+def spans_by_name(exporter):
+    spans = {}
+    for span in exporter.get_finished_spans():
+        spans.setdefault(span.name, []).append(span)
+    return spans
+
+
+def parent_of(span, spans):
+    (parent,) = [
+        other
+        for group in spans.values()
+        for other in group
+        if span.parent and other.context.span_id == span.parent.span_id
+    ]
+    return parent.name
+
+
+def test_run_agent_model_and_tool_spans_are_nested():
+    plugin, exporter = tracing()
+    writer = LlmAgent(
+        name="writer", model=ScriptedLlm(model="fake", responses=[text("notes")])
+    )
+
+    async def research(topic: str) -> dict:
+        """Research a topic."""
+        notes = await run_agent_text(runner(writer, plugin), topic, "user", "inner")
+        return {"notes": notes}
+
+    planner = LlmAgent(
+        name="planner",
+        model=ScriptedLlm(
+            model="fake", responses=[tool_call("research"), text("plan", tokens=40)]
+        ),
+        tools=[research],
+    )
+    plan = asyncio.run(
+        run_agent_text(runner(planner, plugin), "Dog van", "user", "outer")
+    )
+    assert plan == "plan"
+
+    spans = spans_by_name(exporter)
+    assert sorted(spans) == [
+        "agent planner",
+        "agent writer",
+        "execute_tool research",
+        "generate_content fake",
+        "run planner",
+        "run writer",
+    ]
+    (run,) = spans["run planner"]
+    assert run.parent is None
+    assert run.attributes["venturearchitect.session_id"] == "outer"
+    assert parent_of(spans["agent planner"][0], spans) == "run planner"
+    assert parent_of(spans["execute_tool research"][0], spans) == "agent planner"
+    # The nested run started by the tool belongs to the same trace.
+    assert parent_of(spans["run writer"][0], spans) == "execute_tool research"
+    assert parent_of(spans["agent writer"][0], spans) == "run writer"
+    assert {span.context.trace_id for group in spans.values() for span in group} == {
+        run.context.trace_id
+    }
+
+    models = spans["generate_content fake"]
+    assert sorted(parent_of(span, spans) for span in models) == [
+        "agent planner",
+        "agent planner",
+        "agent writer",
+    ]
+    (final,) = [s for s in models if "gen_ai.usage.input_tokens" in s.attributes]
+    assert final.attributes["gen_ai.usage.input_tokens"] == 40
+    assert final.attributes["gen_ai.usage.output_tokens"] == 5
+    assert final.attributes["gen_ai.agent.name"] == "planner"
+    assert "venturearchitect.time_to_first_token_seconds" in final.attributes
+    tool = spans["execute_tool research"][0]
+    assert tool.attributes["gen_ai.tool.call.id"] == "call-1"
+    assert all(
+        span.status.status_code != StatusCode.ERROR
+        for group in spans.values()
+        for span in group
+    )
+
+
+def test_separate_runs_get_separate_traces():
+    plugin, exporter = tracing()
+    agent = LlmAgent(
+        name="writer",
+        model=ScriptedLlm(model="fake", responses=[text("a"), text("b")]),
+    )
+
+    async def main():
+        shared = runner(agent, plugin)
+        await run_agent_text(shared, "one", "user", "first")
+        await run_agent_text(shared, "two", "user", "second")
+
+    asyncio.run(main())
+    runs = spans_by_name(exporter)["run writer"]
+    assert len(runs) == 2
+    assert all(run.parent is None for run in runs)
+    assert runs[0].context.trace_id != runs[1].context.trace_id
+    assert not plugin._open  # nothing left open
+
+
+def test_tool_errors_are_recorded_on_the_tool_span():
+    plugin, exporter = tracing()
+
+    def broken(topic: str) -> dict:
+        """Always fails."""
+        raise RuntimeError("no data")
+
+    agent = LlmAgent(
+        name="planner",
+        model=ScriptedLlm(model="fake", responses=[tool_call("broken")]),
+        tools=[broken],
+    )
+    with pytest.raises(RuntimeError, match="no data"):
+        asyncio.run(run_agent_text(runner(agent, plugin), "Dog van", "user", "s"))
+    spans = spans_by_name(exporter)
+    (tool,) = spans["execute_tool broken"]
+    assert tool.status.status_code == StatusCode.ERROR
+    assert "no data" in tool.status.description
+    assert parent_of(tool, spans) == "agent planner"
+    assert not plugin._open  # the run's open spans were ended with it
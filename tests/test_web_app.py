@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import threading
+
+import httpx
+import pytest
+from google.adk.events import Event
+from google.adk.models.google_llm import Gemini
+from google.genai import types
+
+from venturearchitect import web_app
+from venturearchitect.admission import AdmissionController
+from venturearchitect.idea_index import IdeaIndex
+from venturearchitect.runners import iter_agents
+from venturearchitect.sessions import EvictingSessionService
+
+
+class FakeRunner:
+    """Streams a plan in chunks; each run waits for `gate` before finishing."""
+
+    def __init__(self, chunks=("Plan ", "text")):
+        self.chunks = chunks
+        self.runs = 0
+        self.closed = 0
+        self.active = 0
+        self.max_active = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def run_async(self, *, user_id, session_id, new_message, **kwargs):
+        self.runs += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            for chunk in self.chunks:
+                yield Event(
+                    author="agent",
+                    partial=True,
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                )
+                await asyncio.sleep(0)
+            await self.gate.wait()
+            yield Event(
+                author="agent",
+                content=types.Content(
+                    role="model", parts=[types.Part(text="".join(self.chunks))]
+                ),
+            )
+        finally:
+            self.active -= 1
+            self.closed += 1
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    runner = FakeRunner()
+    monkeypatch.setattr(web_app, "_idea_index", IdeaIndex(path=None))
+    monkeypatch.setitem(web_app.RUNNERS, "single", runner)
+    return runner
+
+
+def client():
+    transport = httpx.ASGITransport(app=web_app.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def frames(body):
+    parsed = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+async def wait_for(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < end, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_stream_sends_start_deltas_and_done(runner):
+    async def main():
+        async with client() as c:
+            response = await c.post("/generate/stream", json={"idea": "Dog van"})
+        return response
+
+    response = asyncio.run(main())
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = frames(response.text)
+    assert [name for name, _ in events] == ["start", "delta", "delta", "done"]
+    assert events[-1][1]["plan"] == "Plan text"
+    assert web_app.admission.in_flight == 0
+
+
+def test_identical_streams_share_one_run(runner):
+    async def main():
+        runner.gate.clear()
+        async with client() as c:
+            requests = [
+                asyncio.create_task(
+                    c.post("/generate/stream", json={"idea": idea})
+                )
+                for idea in ("Dog van", "dog  VAN")
+            ]
+            await wait_for(lambda: web_app.stream_flights.stats()["callers"] == 2)
+            runner.gate.set()
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(main())
+    assert runner.runs == 1
+    assert [frames(r.text) for r in responses][0] == frames(responses[1].text)
+    assert web_app.admission.in_flight == 0
+
+
+def test_client_disconnect_stops_the_run(runner):
+    async def main():
+        runner.gate.clear()
+        http_request = web_app.Request(
+            {"type": "http", "headers": [], "client": ("203.0.113.9", 1234)}
+        )
+        response = await web_app.generate_stream(
+            web_app.GenerateRequest(idea="Tool library"), http_request
+        )
+        body = response.body_iterator
+        first = await body.__anext__()
+        await body.__anext__()  # a delta: the run is under way
+        await body.aclose()  # the client went away
+        await wait_for(lambda: runner.closed == 1)
+        return first
+
+    assert asyncio.run(main()).startswith("event: start")
+    assert runner.runs == 1
+    assert web_app.admission.in_flight == 0
+    assert web_app.stream_flights.stats()["in_flight"] == 0
+
+
+def test_batch_ideas_take_admission_slots(runner, monkeypatch):
+    monkeypatch.setattr(web_app, "admission", AdmissionController(max_concurrent=1))
+    monkeypatch.setattr(web_app, "batch_budget", None)
+
+    async def main():
+        async with client() as c:
+            return await c.post(
+                "/generate/batch",
+                json={"ideas": ["Dog van", "Tool library", "Bike repair"]},
+            )
+
+    response = asyncio.run(main())
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1, 2]
+    assert all(line["status"] == "ok" for line in lines[:-1])
+    assert lines[-1]["summary"]["succeeded"] == 3
+    assert runner.runs == 3
+    assert runner.max_active == 1  # never above the global limit
+    assert web_app.admission.in_flight == 0
+
+
+def test_zero_batch_rate_disables_pacing():
+    code = (
+        "import venturearchitect.web_app as w\n"
+        "assert w.batch_budget is None\n"
+    )
+    root = pathlib.Path(__file__).resolve().parent.parent
+    env = dict(os.environ, VENTUREARCHITECT_BATCH_RATE_PER_MINUTE="0")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root, env=env)
+
+
+def test_importing_the_app_builds_no_agents():
+    code = (
+        "import sys\n"
+        "import venturearchitect.web_app as w\n"
+        "assert w.RUNNERS == {}\n"
+        "assert w._session_service is None and w._idea_index is None\n"
+        "loaded = [m for m in sys.modules if m.startswith('venturearchitect.')]\n"
+        "assert 'venturearchitect.runners' not in loaded, loaded\n"
+        "assert not [m for m in loaded if '.agents.' in m and 'config' not in m]\n"
+    )
+    root = pathlib.Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
+
+
+def test_warm_up_builds_runners_and_model_clients(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(web_app, "RUNNERS", {})
+    monkeypatch.setattr(web_app, "_session_service", EvictingSessionService())
+    monkeypatch.setattr(web_app, "_idea_index", IdeaIndex(path=None))
+
+    report = web_app.warm_up(["single", "sections"])
+    assert set(web_app.RUNNERS) == {"single", "sections"}
+    assert web_app.get_runner("single") is web_app.RUNNERS["single"]
+    for mode in ("single", "sections"):
+        assert report[mode]["model_clients"] > 0
+        assert report[mode]["model_client_errors"] == 0
+    # The pipeline's stages, and the section writer, are part of it.
+    assert report["sections"]["agents"] > report["single"]["agents"]
+    agents = list(iter_agents(web_app.RUNNERS["sections"].agent))
+    assert "narrative_section_agent" in {agent.name for agent in agents}
+    models = [a.model for a in agents if isinstance(getattr(a, "model", None), Gemini)]
+    assert report["sections"]["model_clients"] == len(models)
+    client = models[0].api_client
+    assert models[0].api_client is client  # built once, then cached
+
+
+class ThreadRecordingIndex(IdeaIndex):
+    def __init__(self):
+        super().__init__(path=None)
+        self.threads = []
+
+    def query(self, idea, **kwargs):
+        self.threads.append(threading.current_thread())
+        return super().query(idea, **kwargs)
+
+    def get(self, idea_id):
+        self.threads.append(threading.current_thread())
+        return super().get(idea_id)
+
+    def add(self, idea, **kwargs):
+        self.threads.append(threading.current_thread())
+        return super().add(idea, **kwargs)
+
+
+def test_index_work_runs_off_the_event_loop(runner, monkeypatch):
+    index = ThreadRecordingIndex()
+    monkeypatch.setattr(web_app, "_idea_index", index)
+
+    async def main():
+        async with client() as c:
+            first = await c.post("/generate", json={"idea": "Dog van"})
+            again = await c.post(
+                "/generate", json={"idea": "Dog van", "reuse": "return"}
+            )
+        return first.json(), again.json()
+
+    first, again = asyncio.run(main())
+    assert first["plan"] == again["plan"] == "Plan text"
+    assert "reused_from" in again
+    assert len(index.threads) == 4  # query, add, query, get
+    assert threading.main_thread() not in index.threads
+
+
+def test_sessions_are_deleted_after_each_generation(runner, monkeypatch):
+    sessions = EvictingSessionService()
+    monkeypatch.setattr(web_app, "_session_service", sessions)
+    monkeypatch.setattr(web_app, "admission", AdmissionController())
+
+    async def main():
+        async with client() as c:
+            await c.post("/generate", json={"idea": "Dog van"})
+            await c.post("/generate/stream", json={"idea": "Tool library"})
+
+    asyncio.run(main())
+    assert sessions.counts["created"] == sessions.counts["deleted"] == 2
+    assert sessions.stats()["sessions"] == 0
@@ -1,5 +1,38 @@
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.auth.credential_service.in_memory_credential_service import (
+    InMemoryCredentialService,
+)
+from google.adk.memory import InMemoryMemoryService
+from google.adk.sessions import InMemorySessionService
+
 from .agents.root_agent import venture_architect_root_agent
+from .agents.pipeline_agent import venture_architect_pipeline_agent
+from .runners import CoalescingRunner
+from .tracing import tracing_plugins
+
+
+def _coalescing_runner(agent) -> CoalescingRunner:
+    # Same in-memory services to_a2a() would create, but identical concurrent
+    # requests (e.g. a consumer retrying) share one agent run.
+    return CoalescingRunner(
+        app_name=agent.name,
+        agent=agent,
+        artifact_service=InMemoryArtifactService(),
+        session_service=InMemorySessionService(),
+        memory_service=InMemoryMemoryService(),
+        credential_service=InMemoryCredentialService(),
+        plugins=tracing_plugins(),
+    )
+
 
 # FastAPI/Starlette application exposing VentureArchitect via A2A protocol.
-app = to_a2a(venture_architect_root_agent, port=8001)
+runner = _coalescing_runner(venture_architect_root_agent)
+app = to_a2a(venture_architect_root_agent, port=8001, runner=runner)
+
+# Same service backed by the parallel specialist pipeline; serve it with
+# `uvicorn venturearchitect.a2a_server:pipeline_app --port 8002`.
+pipeline_runner = _coalescing_runner(venture_architect_pipeline_agent)
+pipeline_app = to_a2a(
+    venture_architect_pipeline_agent, port=8002, runner=pipeline_runner
+)
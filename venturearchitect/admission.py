@@ -0,0 +1,273 @@
+"""
+Admission control for generation requests.
+
+Every generation fans out into several Gemini calls, so accepting unlimited
+work during a burst only turns into 429 storms and long tails for everyone.
+The AdmissionController decides up front, in O(1):
+
+- per-user token buckets: a user over their rate gets 429 + Retry-After,
+- a global concurrency limit: when it is reached, new requests get 503 +
+  Retry-After instead of queueing behind the in-flight ones (queued work,
+  such as the ideas of a batch, waits for a slot with acquire() instead),
+- optional degrade mode: once the load passes `degrade_at` (a fraction of
+  the limit), admitted requests are flagged to get a shorter plan.
+
+Users are told apart by client address (user_key()); identity headers set
+by a reverse proxy are only believed when the request comes from one of the
+configured trusted proxies.
+"""
+
+import asyncio
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` tokens."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens`; returns 0.0 on success, else seconds until available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        if self.rate <= 0:
+            return math.inf
+        return (tokens - self.tokens) / self.rate
+
+
+@dataclass
+class Admission:
+    """Outcome of AdmissionController.admit()."""
+
+    admitted: bool
+    status: int = 200  # 429 (user over rate) or 503 (overloaded) when rejected
+    retry_after: int = 0  # seconds, for the Retry-After header
+    degraded: bool = False
+    reason: str = ""
+    started: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(self.retry_after)} if self.retry_after else {}
+
+
+class AdmissionController:
+    """
+    Global concurrency limit + per-user token buckets + degrade threshold.
+
+    Args:
+        max_concurrent: generations allowed in flight at once.
+        user_rate_per_minute: sustained generations per user per minute.
+        user_burst: generations a user may start back to back.
+        degrade_at: fraction of max_concurrent (0-1) above which admitted
+          requests are degraded; None disables degrade mode.
+        max_users: per-user buckets kept (least recently seen dropped).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        user_rate_per_minute: float = 6.0,
+        user_burst: float = 3.0,
+        degrade_at: Optional[float] = None,
+        max_users: int = 10_000,
+    ):
+        self.max_concurrent = max_concurrent
+        self.user_rate_per_minute = user_rate_per_minute
+        self.user_burst = user_burst
+        self.degrade_at = degrade_at
+        self.max_users = max_users
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.in_flight = 0
+        # Smoothed generation time, used to estimate Retry-After on overload.
+        self._avg_seconds = 60.0
+        self.counts = {
+            "admitted": 0,
+            "degraded": 0,
+            "rejected_rate_limited": 0,
+            "rejected_overloaded": 0,
+        }
+
+    def _bucket(self, user_id: str) -> TokenBucket:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate_per_minute / 60.0, self.user_burst)
+            self._buckets[user_id] = bucket
+            if len(self._buckets) > self.max_users:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(user_id)
+        return bucket
+
+    def should_degrade(self, load: Optional[float] = None) -> bool:
+        """Whether work started at `load` (default: current concurrency) degrades."""
+        if self.degrade_at is None:
+            return False
+        if load is None:
+            load = self.in_flight / self.max_concurrent
+        return load >= self.degrade_at
+
+    def check_rate(self, user_id: str) -> Admission:
+        """Per-user rate check only (for work that is queued, not run inline)."""
+        with self._lock:
+            wait = self._bucket(user_id).try_acquire()
+            if wait:
+                self.counts["rejected_rate_limited"] += 1
+                return Admission(
+                    admitted=False,
+                    status=429,
+                    retry_after=max(1, math.ceil(min(wait, 3600))),
+                    reason="Too many requests for this user; slow down.",
+                )
+            return Admission(admitted=True)
+
+    def admit(self, user_id: str) -> Admission:
+        """
+        Admit or reject one generation for `user_id`.
+
+        Admitted requests must be paired with release().
+        """
+        with self._lock:
+            if self.in_flight >= self.max_concurrent:
+                self.counts["rejected_overloaded"] += 1
+                return Admission(
+                    admitted=False,
+                    status=503,
+                    retry_after=max(
+                        1, math.ceil(self._avg_seconds / self.max_concurrent)
+                    ),
+                    reason="Server is at capacity; try again shortly.",
+                )
+            admission = self.check_rate(user_id)
+            if not admission.admitted:
+                return admission
+            return self._start(admission)
+
+    async def acquire(self, poll_seconds: float = 0.25) -> Admission:
+        """
+        Wait for a concurrency slot, without a per-user rate check (for work
+        rate-checked as a whole, e.g. the ideas of a batch).
+
+        Waiting callers poll, so requests admitted with admit() go first.
+        Must be paired with release().
+        """
+        while True:
+            with self._lock:
+                if self.in_flight < self.max_concurrent:
+                    return self._start(Admission(admitted=True))
+            await asyncio.sleep(poll_seconds)
+
+    def _start(self, admission: Admission) -> Admission:
+        admission.degraded = self.should_degrade()
+        self.in_flight += 1
+        self.counts["admitted"] += 1
+        self.counts["degraded"] += admission.degraded
+        admission.started = time.monotonic()
+        return admission
+
+    def release(self, admission: Admission) -> None:
+        if not admission.admitted or not admission.started:
+            return
+        elapsed = time.monotonic() - admission.started
+        with self._lock:
+            self.in_flight -= 1
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+        admission.started = 0.0  # make a second release() a no-op
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "in_flight": self.in_flight,
+                "utilization": round(self.in_flight / self.max_concurrent, 3),
+                "user_rate_per_minute": self.user_rate_per_minute,
+                "user_burst": self.user_burst,
+                "degrade_at": self.degrade_at,
+                "tracked_users": len(self._buckets),
+                "avg_generation_seconds": round(self._avg_seconds, 3),
+                "counts": dict(self.counts),
+            }
+
+
+def default_admission_controller() -> AdmissionController:
+    """
+    AdmissionController configured from the environment.
+
+    VENTUREARCHITECT_MAX_CONCURRENT (default 8),
+    VENTUREARCHITECT_USER_RATE_PER_MINUTE (default 6),
+    VENTUREARCHITECT_USER_BURST (default 3) and
+    VENTUREARCHITECT_DEGRADE_AT (e.g. 0.75; unset disables degrade mode).
+    """
+    degrade_at = os.getenv("VENTUREARCHITECT_DEGRADE_AT")
+    return AdmissionController(
+        max_concurrent=int(os.getenv("VENTUREARCHITECT_MAX_CONCURRENT", "8")),
+        user_rate_per_minute=float(
+            os.getenv("VENTUREARCHITECT_USER_RATE_PER_MINUTE", "6")
+        ),
+        user_burst=float(os.getenv("VENTUREARCHITECT_USER_BURST", "3")),
+        degrade_at=float(degrade_at) if degrade_at else None,
+    )
+
+
+def _trusted(address: Optional[str], proxies: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address((address or "").strip())
+    except ValueError:
+        return False
+    return any(ip in network for network in proxies)
+
+
+def user_key(
+    client: Optional[str],
+    headers: Mapping[str, str],
+    trusted_proxies: Sequence[Network] = (),
+) -> str:
+    """
+    Caller identity for per-user rate limits.
+
+    The client address, unless the request comes from a trusted proxy: then
+    the proxy's X-User-Id header (the identity it authenticated), else the
+    nearest untrusted address in X-Forwarded-For. Headers from anyone else
+    are ignored, so clients cannot pick their own bucket.
+    """
+    if not _trusted(client, trusted_proxies):
+        return client or "anonymous"
+    user = headers.get("x-user-id")
+    if user:
+        return f"user:{user}"
+    forwarded = [a.strip() for a in headers.get("x-forwarded-for", "").split(",")]
+    for address in reversed(forwarded):
+        if address and not _trusted(address, trusted_proxies):
+            return address
+    return client
+
+
+def default_trusted_proxies() -> List[Network]:
+    """
+    VENTUREARCHITECT_TRUSTED_PROXIES: comma-separated addresses or networks
+    (e.g. "10.0.0.0/8,127.0.0.1") of reverse proxies whose X-User-Id and
+    X-Forwarded-For headers are trusted; unset trusts none.
+    """
+    setting = os.getenv("VENTUREARCHITECT_TRUSTED_PROXIES", "")
+    return [
+        ipaddress.ip_network(entry.strip(), strict=False)
+        for entry in setting.split(",")
+        if entry.strip()
+    ]
@@ -1,25 +1,282 @@
 # venturearchitect/agents/config.py
 
+"""
+Central model registry for every agent in the project.
+
+Each agent gets a model tier ("lite" or "standard"), an optional output
+token limit and a named retry policy from AGENT_MODELS. Everything can be
+overridden from the environment without touching agent code:
+
+- VENTUREARCHITECT_LITE_MODEL / VENTUREARCHITECT_STANDARD_MODEL:
+  the Gemini model behind each tier.
+- VENTUREARCHITECT_MODEL_ROUTING: "auto" (default) uses the per-agent tiers
+  below, which route cheap structuring stages to the lite tier and the
+  long-form writing / research stages to the standard tier; "lite" or
+  "standard" pins every agent to one tier.
+- VENTUREARCHITECT_MODEL_<AGENT>, e.g. VENTUREARCHITECT_MODEL_DISCOVERY_AGENT:
+  a tier name or a literal model name for one agent.
+- VENTUREARCHITECT_MAX_TOKENS_<AGENT> ("0" removes the limit),
+  VENTUREARCHITECT_RETRY_<AGENT> (a RETRY_POLICIES name) and
+  VENTUREARCHITECT_HEDGE_<AGENT> ("1" / "0"; VENTUREARCHITECT_HEDGING=0
+  turns hedging off for every agent).
+
+Retries and hedging are done by ResilientGemini (see deadlines.py), within
+the deadline of the request being served. Its calls are paced per model
+tier to stay under the key's RPM/TPM quotas (see quota.py).
+
+Every model sends its requests through the shared HTTP pool in
+http_pool.py (VENTUREARCHITECT_HTTP_POOL=0 turns that off).
+"""
+
+import os
+from contextlib import aclosing
+from dataclasses import dataclass, replace
+from typing import AsyncGenerator, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
 from google.adk.models.google_llm import Gemini
-from google.genai import types
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from .. import deadlines
+from ..http_pool import gemini_client_kwargs, pooling_enabled
+from ..quota import estimate_tokens, shared_rate_limiter
+
+# Agents are built at import time, so pick up .env overrides before that.
+load_dotenv()
 
 # Default Gemini model for all agents in this project
-DEFAULT_GEMINI_MODEL = "gemini-2.5-flash-lite"
+DEFAULT_GEMINI_MODEL = os.getenv(
+    "VENTUREARCHITECT_LITE_MODEL", "gemini-2.5-flash-lite"
+)
+
+MODEL_TIERS: Dict[str, str] = {
+    "lite": DEFAULT_GEMINI_MODEL,
+    "standard": os.getenv("VENTUREARCHITECT_STANDARD_MODEL", "gemini-2.5-flash"),
+}
 
 # Shared retry configuration for robustness (rate limits, transient errors, etc.)
+# Sleeps between attempts are jittered between initial_delay and max_delay
+# (see deadlines.decorrelated_jitter) and never outlast the request deadline.
 retry_config = types.HttpRetryOptions(
-    attempts=5,          # max retries
-    exp_base=7,          # exponential backoff base
+    attempts=5,          # attempts in total
     initial_delay=1,     # seconds
+    max_delay=20,        # seconds
     http_status_codes=[429, 500, 503, 504],
 )
 
-def default_gemini_model() -> Gemini:
+RETRY_POLICIES: Dict[str, types.HttpRetryOptions] = {
+    "default": retry_config,
+    # Shorter backoff for interactive, single-call agents
+    "quick": types.HttpRetryOptions(
+        attempts=5,
+        initial_delay=0.5,
+        max_delay=5,
+        http_status_codes=[429, 500, 503, 504],
+    ),
+    "none": types.HttpRetryOptions(attempts=1),
+}
+
+
+@dataclass(frozen=True)
+class ModelSettings:
     """
-    Factory function that returns a Gemini model instance
-    with our standard retry configuration.
+    Model tier (or literal model name), output token limit, retry policy and
+    whether slow calls are hedged.
     """
-    return Gemini(
-        model="gemini-2.5-flash-lite",
-        retry_options=retry_config,
+
+    tier: str = "lite"
+    max_output_tokens: Optional[int] = None
+    retry: str = "default"
+    hedge: bool = False
+
+
+# Structuring stages (short JSON / bullet outputs) run on the lite tier;
+# web research and the full long-form plan run on the standard tier.
+# Hedging duplicates slow calls, so only the short, cheap stages use it.
+AGENT_MODELS: Dict[str, ModelSettings] = {
+    "discovery_agent": ModelSettings("lite", max_output_tokens=4096, hedge=True),
+    "strategy_agent": ModelSettings("lite", max_output_tokens=8192),
+    "financial_agent": ModelSettings("lite", max_output_tokens=8192),
+    "evaluation_agent": ModelSettings("lite", max_output_tokens=8192, hedge=True),
+    "narrative_section_agent": ModelSettings("lite", max_output_tokens=8192),
+    "research_agent": ModelSettings("standard", max_output_tokens=8192),
+    "narrative_agent": ModelSettings("standard"),
+    "venture_architect_root_agent": ModelSettings("standard"),
+    "business_plan_agent": ModelSettings("lite", retry="quick"),
+}
+
+
+def _env_suffix(agent_name: str) -> str:
+    return agent_name.upper().replace("-", "_")
+
+
+def model_settings(agent_name: Optional[str] = None) -> ModelSettings:
+    """
+    Resolve an agent's settings: AGENT_MODELS, then routing, then env overrides.
+
+    Unknown (or None) agent names get the lite tier with the default retry
+    policy.
+    """
+    settings = AGENT_MODELS.get(agent_name or "", ModelSettings())
+    routing = os.getenv("VENTUREARCHITECT_MODEL_ROUTING", "auto")
+    if routing in MODEL_TIERS:
+        settings = replace(settings, tier=routing)
+    if agent_name:
+        suffix = _env_suffix(agent_name)
+        tier = os.getenv(f"VENTUREARCHITECT_MODEL_{suffix}")
+        if tier:
+            settings = replace(settings, tier=tier)
+        max_tokens = os.getenv(f"VENTUREARCHITECT_MAX_TOKENS_{suffix}")
+        if max_tokens:
+            settings = replace(settings, max_output_tokens=int(max_tokens) or None)
+        retry = os.getenv(f"VENTUREARCHITECT_RETRY_{suffix}")
+        if retry:
+            settings = replace(settings, retry=retry)
+        hedge = os.getenv(f"VENTUREARCHITECT_HEDGE_{suffix}")
+        if hedge:
+            settings = replace(settings, hedge=hedge != "0")
+    if os.getenv("VENTUREARCHITECT_HEDGING", "1") == "0":
+        settings = replace(settings, hedge=False)
+    if settings.retry not in RETRY_POLICIES:
+        raise ValueError(
+            f"Unknown retry policy {settings.retry!r} for {agent_name!r}; "
+            f"expected one of {sorted(RETRY_POLICIES)}"
+        )
+    return settings
+
+
+def quota_budget(model: str) -> str:
+    """Rate-limit budget of a tier or model name: its tier, else the name."""
+    if model in MODEL_TIERS:
+        return model
+    for tier, tier_model in MODEL_TIERS.items():
+        if tier_model == model:
+            return tier
+    return model
+
+
+def _prompt_characters(llm_request: LlmRequest) -> int:
+    """Size of the text a request sends (contents and system instruction)."""
+    total = 0
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text:
+                total += len(part.text)
+            elif part.function_call or part.function_response:
+                total += len(part.model_dump_json(exclude_none=True))
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if isinstance(instruction, str):
+        total += len(instruction)
+    return total
+
+
+def is_retryable(error: BaseException, policy: types.HttpRetryOptions) -> bool:
+    """Whether a failed Gemini call may be retried under `policy`."""
+    if isinstance(error, errors.APIError):
+        return error.code in (policy.http_status_codes or ())
+    return isinstance(error, (httpx.TransportError, httpx.TimeoutException))
+
+
+class ResilientGemini(Gemini):
+    """
+    Gemini whose calls are retried (and optionally hedged) by deadlines.call()
+    instead of by google-genai, so retries respect the request deadline.
+    Every try first waits for room in its tier's rate-limit budget.
+    """
+
+    agent_name: str = ""
+    retry_policy: types.HttpRetryOptions = retry_config
+    hedge: bool = False
+    budget: str = "lite"
+
+    def _retryable(self, error: BaseException) -> bool:
+        return is_retryable(error, self.retry_policy)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        limiter = shared_rate_limiter()
+        estimate = estimate_tokens(_prompt_characters(llm_request))
+
+        async def attempt() -> AsyncGenerator[LlmResponse, None]:
+            # Gemini mutates the request, so every try gets its own copy.
+            request = llm_request.model_copy(deep=True)
+            waited = await limiter.acquire(self.budget, estimate)
+            record = deadlines.current_record()
+            if record is not None:
+                record.quota_wait_seconds += waited
+            actual = None
+            responses = Gemini.generate_content_async(self, request, stream)
+            async with aclosing(responses):
+                async for response in responses:
+                    usage = response.usage_metadata
+                    if usage and usage.prompt_token_count:
+                        actual = usage.prompt_token_count
+                    yield response
+            if actual is not None:
+                limiter.settle(self.budget, estimate, actual)
+
+        policy = self.retry_policy
+        responses = deadlines.call(
+            attempt,
+            attempts=policy.attempts or 1,
+            base_delay=policy.initial_delay or 1.0,
+            max_delay=policy.max_delay or 20.0,
+            retryable=self._retryable,
+            key=f"{self.agent_name}:stream" if stream else self.agent_name,
+            hedge=self.hedge and not stream,
+        )
+        async with aclosing(responses):
+            async for response in responses:
+                yield response
+
+
+def default_gemini_model(agent_name: Optional[str] = None) -> Gemini:
+    """
+    Factory function that returns a Gemini model instance for an agent,
+    with the model tier, retry policy and hedging from the registry, sharing
+    the process-wide HTTP pool.
+    """
+    settings = model_settings(agent_name)
+    model = ResilientGemini(
+        model=MODEL_TIERS.get(settings.tier, settings.tier),
+        # ResilientGemini retries; google-genai makes a single attempt.
+        retry_options=RETRY_POLICIES["none"],
+        agent_name=agent_name or "",
+        retry_policy=RETRY_POLICIES[settings.retry],
+        hedge=settings.hedge,
+        budget=quota_budget(settings.tier),
     )
+    if pooling_enabled():
+        model.client_kwargs = gemini_client_kwargs(model)
+    return model
+
+
+def generate_content_config(
+    agent_name: Optional[str] = None,
+) -> Optional[types.GenerateContentConfig]:
+    """Generation config for an agent (its output token limit), if any."""
+    max_output_tokens = model_settings(agent_name).max_output_tokens
+    if max_output_tokens is None:
+        return None
+    return types.GenerateContentConfig(max_output_tokens=max_output_tokens)
+
+
+def describe_models() -> Dict[str, Dict[str, object]]:
+    """
+    Resolved model, token limit, retry policy and hedging of every registered
+    agent.
+    """
+    report = {}
+    for agent_name in AGENT_MODELS:
+        settings = model_settings(agent_name)
+        report[agent_name] = {
+            "model": MODEL_TIERS.get(settings.tier, settings.tier),
+            "max_output_tokens": settings.max_output_tokens,
+            "retry": settings.retry,
+            "hedge": settings.hedge,
+        }
+    return report
@@ -1,11 +1,12 @@
 # venturearchitect/agents/discovery_agent.py
 
 from google.adk.agents import LlmAgent
-from .config import default_gemini_model
+from .config import default_gemini_model, generate_content_config
 
 discovery_agent = LlmAgent(
-    model=default_gemini_model(),
+    model=default_gemini_model("discovery_agent"),
     name="discovery_agent",
+    generate_content_config=generate_content_config("discovery_agent"),
     description="Expands a short idea into a structured business profile JSON.",
     instruction="""
 You are the Discovery Agent in the VentureArchitect system.
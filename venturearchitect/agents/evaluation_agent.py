@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
-from .config import default_gemini_model
+from .config import default_gemini_model, generate_content_config
 
 evaluation_agent = LlmAgent(
     name="evaluation_agent",
-    model=default_gemini_model(),
+    generate_content_config=generate_content_config("evaluation_agent"),
+    model=default_gemini_model("evaluation_agent"),
     description="Critically evaluates business plans for coherence and feasibility.",
     instruction="""
 You are the Evaluation Agent in the VentureArchitect system.
@@ -1,10 +1,11 @@
 from google.adk.agents import LlmAgent
-from .config import default_gemini_model
-from ..tools import run_financial_model
+from .config import default_gemini_model, generate_content_config
+from ..tools import run_financial_model, run_sensitivity_analysis
 
 financial_agent = LlmAgent(
     name="financial_agent",
-    model=default_gemini_model(),
+    generate_content_config=generate_content_config("financial_agent"),
+    model=default_gemini_model("financial_agent"),
     description="Builds simple financial projections and unit economics.",
     instruction="""
 You are the Financial Agent in the VentureArchitect system.
@@ -19,15 +20,22 @@ Your responsibilities:
    - variable_cost_per_user
    - months (at least 36)
 3. Call the run_financial_model tool with a JSON object of assumptions.
-4. Use the returned projections to:
-   - summarize revenue, costs, profit for each year
-   - identify whether and when the business breaks even
-   - highlight key sensitivities (what assumptions matter most).
-5. Output Markdown with headings:
+   It returns yearly rollups, revenue CAGR, break-even month, cumulative
+   cash burn and peak funding need directly; only pass detail="full" if
+   you genuinely need the month-by-month table (and then prefer
+   layout="columns" with precision=0 to keep the response compact).
+4. Call the run_sensitivity_analysis tool with the same assumptions to get
+   P10/P50/P90 bands, the break-even probability and a tornado ranking of
+   which assumptions move total profit the most.
+5. Use the returned projections and sensitivity results to:
+   - summarize revenue, costs, profit for each year (use yearly_summary)
+   - identify whether and when the business breaks even, and how likely it is
+   - highlight key sensitivities using the tornado ranking (do not guess).
+6. Output Markdown with headings:
    - Key Assumptions
    - Projection Summary
    - Break-even Analysis
    - Risks & Sensitivities
 """,
-    tools=[run_financial_model],
+    tools=[run_financial_model, run_sensitivity_analysis],
 )
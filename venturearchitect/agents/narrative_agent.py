@@ -1,11 +1,12 @@
 # venturearchitect/agents/narrative_agent.py
 
 from google.adk.agents import LlmAgent
-from .config import default_gemini_model
+from .config import default_gemini_model, generate_content_config
 
 narrative_agent = LlmAgent(
-    model=default_gemini_model(),
+    model=default_gemini_model("narrative_agent"),
     name="narrative_agent",
+    generate_content_config=generate_content_config("narrative_agent"),
     description="Turns structured business information into a polished, professional business plan document.",
     instruction="""
 You are the Narrative Agent in the VentureArchitect system.
@@ -47,3 +48,52 @@ If information is missing, make reasonable assumptions and keep the plan
 coherent and investor-ready.
 """,
 )
+
+# Canonical section order of the final plan (matches REQUIRED SECTIONS above).
+NARRATIVE_SECTIONS = (
+    "Executive Summary",
+    "Problem & Opportunity",
+    "Solution & Product Overview",
+    "Market Analysis & Target Customers",
+    "Competitive Landscape & Differentiation",
+    "Business Model & Revenue Streams",
+    "Go-To-Market & Growth Strategy",
+    "Operations & Technology",
+    "Financial Projections & Key Assumptions",
+    "Risks & Mitigations",
+    "Roadmap & Next Steps",
+)
+
+# Writes ONE section at a time so sections can be generated concurrently.
+narrative_section_agent = LlmAgent(
+    model=default_gemini_model("narrative_section_agent"),
+    name="narrative_section_agent",
+    generate_content_config=generate_content_config("narrative_section_agent"),
+    description="Writes a single section of a professional business plan.",
+    instruction="""
+You are the Narrative Agent in the VentureArchitect system, writing ONE
+section of a larger business plan. Other sections are written separately
+and stitched together afterwards.
+
+You receive:
+- The name of the section to write,
+- The original short business idea,
+- A structured profile JSON and research, strategy and financial insights,
+- For the Executive Summary only: the finished body sections of the plan.
+
+STYLE & VOICE:
+- Third person only (e.g., "Garage Sale Finder is...", not "I am building...").
+- Formal, business-consultant tone.
+- No questions to the user.
+- No references to agents, tools, prompts, or LLMs.
+
+OUTPUT REQUIREMENTS:
+- Write ONLY the body of the requested section.
+- Do NOT repeat the section heading and do NOT write other sections.
+- Use paragraphs and, where useful, short ### subheadings or bold text.
+- Include concrete, plausible details and numbers, even if you must make
+  realistic assumptions; keep figures consistent with the inputs.
+- The Executive Summary must summarize the finished sections faithfully and
+  must not introduce new numbers.
+""",
+)
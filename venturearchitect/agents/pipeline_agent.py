@@ -0,0 +1,133 @@
+# venturearchitect/agents/pipeline_agent.py
+
+import asyncio
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+
+from ..compaction import default_compactor
+from ..pipeline import (
+    DEFAULT_STAGES,
+    EVALUATION_STAGE,
+    SECTIONED_STAGES,
+    PlanPipeline,
+    StageResult,
+    evaluation_enabled,
+)
+from ..stage_cache import default_stage_cache
+from ..tracing import tracing_plugins
+
+
+class PipelineAgent(BaseAgent):
+    """
+    Exposes the orchestrated PlanPipeline as a regular ADK agent.
+
+    Runner-based entry points (web UI, CLI, A2A) can switch to pipeline mode
+    just by running this agent. One content-less progress event is emitted
+    per finished stage, with its timing under custom_metadata["stage"], then
+    a final event carrying the plan, custom_metadata["pipeline"] timings,
+    the discovery output under custom_metadata["profile"] and the evaluation
+    stage's output (if it ran) under custom_metadata["evaluation"].
+    """
+
+    pipeline: Optional[Any] = None  # PlanPipeline, built on first use
+    # Write the narrative section by section in parallel (SECTIONED_STAGES).
+    sectioned_narrative: bool = False
+    # Run EVALUATION_STAGE after the narrative (None: evaluation_enabled()).
+    evaluate: Optional[bool] = None
+
+    def _stage_event(self, ctx: InvocationContext, result: StageResult) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            custom_metadata={
+                "stage": {
+                    "name": result.name,
+                    "started_at": round(result.started_at, 3),
+                    "seconds": round(result.seconds, 3),
+                    "cached": result.cached,
+                    "context": result.context,
+                }
+            },
+        )
+
+    def build_pipeline(self) -> PlanPipeline:
+        """The PlanPipeline this agent runs, built on first use."""
+        if self.pipeline is None:
+            stages = SECTIONED_STAGES if self.sectioned_narrative else DEFAULT_STAGES
+            evaluate = evaluation_enabled() if self.evaluate is None else self.evaluate
+            if evaluate:
+                stages += (EVALUATION_STAGE,)
+            self.pipeline = PlanPipeline(
+                stages,
+                # Stage runs are traced under this agent's span.
+                plugins=tracing_plugins(),
+                cache=default_stage_cache(),
+                compactor=default_compactor(),
+            )
+        return self.pipeline
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        self.build_pipeline()
+
+        parts = ctx.user_content.parts if ctx.user_content else None
+        idea = "\n".join(p.text for p in parts or [] if getattr(p, "text", None))
+
+        progress: "asyncio.Queue[Optional[StageResult]]" = asyncio.Queue()
+
+        async def drive():
+            try:
+                return await self.pipeline.run(
+                    idea,
+                    user_id=ctx.session.user_id,
+                    on_stage_complete=progress.put_nowait,
+                )
+            finally:
+                progress.put_nowait(None)
+
+        task = asyncio.create_task(drive())
+        try:
+            while (stage := await progress.get()) is not None:
+                yield self._stage_event(ctx, stage)
+            result = await task
+        finally:
+            task.cancel()
+
+        metadata = {"pipeline": result.timings()}
+        if "discovery" in result.stages:
+            # Lets callers index the idea's profile alongside the plan.
+            metadata["profile"] = result.stages["discovery"].output
+        if "evaluation" in result.stages:
+            metadata["evaluation"] = result.stages["evaluation"].output
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=result.plan)]),
+            custom_metadata=metadata,
+        )
+
+
+venture_architect_pipeline_agent = PipelineAgent(
+    name="venture_architect_pipeline_agent",
+    description=(
+        "Runs the VentureArchitect specialist agents as a parallel pipeline "
+        "(discovery, then research/strategy/financial concurrently, then "
+        "narrative) and returns the finished business plan."
+    ),
+)
+
+venture_architect_sectioned_pipeline_agent = PipelineAgent(
+    name="venture_architect_sectioned_pipeline_agent",
+    description=(
+        "Runs the VentureArchitect pipeline and writes the business plan "
+        "sections concurrently, stitching them in canonical order."
+    ),
+    sectioned_narrative=True,
+)
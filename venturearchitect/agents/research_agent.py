@@ -1,19 +1,20 @@
 from google.adk.agents import LlmAgent
-from .config import default_gemini_model
-from google.adk.tools.google_search_tool import google_search
+from .config import default_gemini_model, generate_content_config
+from ..search_cache import web_search
 
 
 research_agent = LlmAgent(
     name="research_agent",
-    model=default_gemini_model(),
-    description="Performs market and competitor research using Google Search.",
+    generate_content_config=generate_content_config("research_agent"),
+    model=default_gemini_model("research_agent"),
+    description="Performs market and competitor research using cached web search.",
     instruction="""
 You are the Research Agent in the VentureArchitect system.
 
 Given a structured business profile and/or a description of the business idea,
 you must:
 
-1. Use the google_search tool to search for:
+1. Use the web_search tool to search for:
    - comparable products or competitors
    - market size estimates (TAM/SAM-style)
    - major trends and risks in the space
@@ -25,5 +26,5 @@ you must:
    - Risks
 3. Be explicit when numbers are approximate or based on public heuristics.
 """,
-    tools=[google_search],
+    tools=[web_search],
 )
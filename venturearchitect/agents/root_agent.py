@@ -1,16 +1,17 @@
 # venturearchitect/agents/root_agent.py
 
 from google.adk.agents import LlmAgent
-from google.adk.tools import google_search  # Built-in Google Search tool
-# Docs: https://google.github.io/adk-docs/tools/built-in-tools/  (google_search)
 
-# IMPORTANT:
-# google_search only works with Gemini 2.x models.
-# We'll use gemini-2.5-flash which supports tools + long outputs.
+from ..search_cache import web_search  # Cached, Google-Search-grounded lookups
+from .config import default_gemini_model, generate_content_config
+
+# Routed to the standard tier (gemini-2.5-flash), which supports tools + long
+# outputs; see AGENT_MODELS in config.py.
 
 venture_architect_root_agent = LlmAgent(
     name="venture_architect_root_agent",
-    model="gemini-2.5-flash",  # use a Gemini 2 model for google_search
+    model=default_gemini_model("venture_architect_root_agent"),
+    generate_content_config=generate_content_config("venture_architect_root_agent"),
     description=(
         "A professional business-planning agent that uses web research "
         "to draft long, formal, investor-ready business plans."
@@ -27,7 +28,7 @@ Your task:
 
 1. **Write a long, formal, investor-ready business plan** based solely on:
    - The user's short idea description, and
-   - Any information you retrieve using the `google_search` tool.
+   - Any information you retrieve using the `web_search` tool.
 
 2. The output must be:
    - Written in a **formal, professional tone** (no chatty language).
@@ -38,7 +39,7 @@ Your task:
      document.
 
 3. Whenever facts, numbers, or examples could improve the plan:
-   - **Use the `google_search` tool** to get up-to-date information,
+   - **Use the `web_search` tool** to get up-to-date information,
      such as:
        * Market size figures
        * Trends in the relevant industry
@@ -59,8 +60,8 @@ Your task:
    3. Solution & Product Overview  
    4. Market Analysis  
       - Target segments  
-      - Market size & trends (use google_search)  
-      - Competitive landscape (use google_search for key players)  
+      - Market size & trends (use web_search)  
+      - Competitive landscape (use web_search for key players)  
    5. Business Model & Monetization  
    6. Go-to-Market Strategy  
    7. Operations & Technology  
@@ -85,7 +86,7 @@ Your task:
        * The size of the market,
        * Major competitors,
        * Recent trends,
-     **call `google_search`** with a short, focused query.
+     **call `web_search`** with a short, focused query.
    - Then integrate those findings into:
        * Market Analysis
        * Competitive Landscape
@@ -110,5 +111,5 @@ or stakeholders.
 Always write in clear, formal,
 investor-ready English and keep assumptions clearly labeled.
 """,
-    tools=[google_search],  # enable online search
+    tools=[web_search],  # enable online search (results are cached)
 )
\ No newline at end of file
@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
-from .config import default_gemini_model
+from .config import default_gemini_model, generate_content_config
 
 strategy_agent = LlmAgent(
     name="strategy_agent",
-    model=default_gemini_model(),
+    generate_content_config=generate_content_config("strategy_agent"),
+    model=default_gemini_model("strategy_agent"),
     description="Defines problem, solution, positioning, and go-to-market strategy.",
     instruction="""
 You are the Strategy Agent in the VentureArchitect system.
@@ -0,0 +1,253 @@
+"""
+Request coalescing ("singleflight") for identical in-flight generations.
+
+When several clients submit the same idea at the same time (a demo, a
+double-clicked button, a client retrying after a timeout), each of them
+would otherwise start its own full pipeline run. A SingleFlight keeps one
+run per key: the first request starts it, later identical requests attach
+to it and receive the same result or the same stream, replayed from the
+start. A run is only cancelled when every attached caller has gone.
+
+- SingleFlight.run(): for request/response callers (one shared result),
+- SingleFlight.stream(): for streaming callers (one shared item stream).
+  Each caller reads from its own bounded queue and the run only moves on
+  once every caller has room, so a shared stream is paced by its slowest
+  reader like an unshared one. Only the first `max_replay` items are kept
+  for late joiners; after that the stream can no longer be joined.
+
+runners.CoalescingRunner applies the same to ADK runs, for servers that
+hand a Runner to a framework (A2A).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import weakref
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+def normalize_idea(text: str) -> str:
+    """Case- and whitespace-insensitive form of an idea, for coalescing keys."""
+    return " ".join(text.casefold().split())
+
+
+def coalesce_key(idea: str, **options: Any) -> str:
+    """Key shared by requests for the same normalized idea and options."""
+    payload = json.dumps(
+        {"idea": normalize_idea(idea), **options}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_END = object()  # end of a stream, in a subscriber's queue
+
+
+class _Subscriber:
+    """A streaming caller: the items it missed, then its own bounded queue."""
+
+    def __init__(self, replay: List[Any], max_queue: int):
+        self.replay = replay
+        self.queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_queue)
+
+
+class _Flight:
+    """One in-flight run, its results so far and the callers attached to it."""
+
+    def __init__(self):
+        self.task: Optional["asyncio.Task[Any]"] = None
+        self.callers = 0
+        # Streams only:
+        self.items: List[Any] = []  # replayed to late joiners
+        self.joinable = True
+        self.subscribers: List[_Subscriber] = []
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    At most one run per key; identical concurrent calls share it.
+
+    Args:
+        enabled: False runs every call independently (for comparison).
+        max_queue: items buffered per streaming caller before the shared
+            stream waits for it.
+        max_replay: items of a stream kept for callers that join late.
+    """
+
+    def __init__(
+        self, enabled: bool = True, max_queue: int = 32, max_replay: int = 1000
+    ):
+        self.enabled = enabled
+        self.max_queue = max_queue
+        self.max_replay = max_replay
+        self._flights: Dict[str, _Flight] = {}
+        self.counts = {"runs": 0, "coalesced": 0, "cancelled": 0}
+
+    def in_flight(self, key: str) -> bool:
+        """Whether a call for `key` would attach to a run already in flight."""
+        return self.enabled and key in self._flights
+
+    def _join(
+        self, key: str, start: Callable[[_Flight], Awaitable[Any]]
+    ) -> Tuple[_Flight, bool]:
+        flight = self._flights.get(key) if self.enabled else None
+        if flight is not None:
+            self.counts["coalesced"] += 1
+            return flight, True
+        flight = _Flight()
+        flight.task = asyncio.ensure_future(start(flight))
+        self.counts["runs"] += 1
+        if self.enabled:
+            self._flights[key] = flight
+
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        return flight, False
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _leave(self, flight: _Flight) -> None:
+        flight.callers -= 1
+        if flight.callers == 0 and not flight.task.done():
+            # Nobody is waiting for the result any more.
+            flight.task.cancel()
+            self.counts["cancelled"] += 1
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await `fn()`, or the identical run already in flight for `key`.
+
+        Returns:
+            (result, shared) where shared is True when this call attached to
+            another caller's run.
+        """
+
+        async def start(_: _Flight) -> T:
+            return await fn()
+
+        flight, shared = self._join(key, start)
+        flight.callers += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            self._leave(flight)
+
+    def stream(
+        self, key: str, factory: Callable[[], AsyncIterator[T]]
+    ) -> AsyncGenerator[T, None]:
+        """
+        Items of `factory()`, or of the identical stream already in flight.
+
+        The run starts (or is joined) right away, so a concurrent identical
+        call made before this generator is first iterated still attaches to
+        it. Late joiners get every item from the beginning. The caller is
+        attached until the generator is closed, or garbage collected if it
+        is never iterated; the run is cancelled when the last one detaches.
+        """
+
+        async def start(flight: _Flight) -> None:
+            try:
+                async with aclosing(factory()) as items:
+                    async for item in items:
+                        if not flight.subscribers:
+                            # Everyone left; the run swallowed its cancellation
+                            # (e.g. asyncio.wait_for on Python < 3.12).
+                            return
+                        await self._publish(key, flight, item)
+            except asyncio.CancelledError:
+                for subscriber in flight.subscribers:  # (shutdown only)
+                    _drain(subscriber.queue)
+                    subscriber.queue.put_nowait(_END)
+                raise
+            except Exception as e:
+                flight.error = e
+            self._forget(key, flight)  # later callers would miss the end
+            for subscriber in list(flight.subscribers):
+                await subscriber.queue.put(_END)
+
+        flight, _ = self._join(key, start)
+        subscriber = _Subscriber(list(flight.items), self.max_queue)
+        flight.subscribers.append(subscriber)
+        items = self._follow(flight, subscriber)
+        weakref.finalize(items, self._unsubscribe, flight, subscriber)
+        return items
+
+    async def _publish(self, key: str, flight: _Flight, item: Any) -> None:
+        if flight.joinable:
+            flight.items.append(item)
+            if len(flight.items) > self.max_replay:
+                # Too long to replay: later identical calls start their own run.
+                flight.items = []
+                flight.joinable = False
+                self._forget(key, flight)
+        for subscriber in list(flight.subscribers):
+            await subscriber.queue.put(item)  # waits for slow readers
+
+    def _unsubscribe(self, flight: _Flight, subscriber: _Subscriber) -> None:
+        if subscriber not in flight.subscribers:
+            return
+        flight.subscribers.remove(subscriber)
+        _drain(subscriber.queue)  # unblocks the run if it waits on this queue
+        if not flight.subscribers and not flight.task.done():
+            # Nobody is reading the stream any more.
+            flight.task.cancel()
+            self.counts["cancelled"] += 1
+
+    async def _follow(
+        self, flight: _Flight, subscriber: _Subscriber
+    ) -> AsyncGenerator[Any, None]:
+        try:
+            replay, subscriber.replay = subscriber.replay, []
+            for item in replay:
+                yield item
+            while True:
+                item = await subscriber.queue.get()
+                if item is _END:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                yield item
+        finally:
+            self._unsubscribe(flight, subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        """In-flight runs, and how many duplicate runs coalescing avoided."""
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "callers": sum(
+                f.callers + len(f.subscribers) for f in self._flights.values()
+            ),
+            "counts": dict(self.counts),
+        }
+
+
+def _drain(queue: "asyncio.Queue[Any]") -> None:
+    while not queue.empty():
+        queue.get_nowait()
+
+
+def default_single_flight() -> SingleFlight:
+    """
+    SingleFlight configured from the environment.
+
+    VENTUREARCHITECT_COALESCE=0 disables coalescing.
+    """
+    return SingleFlight(enabled=os.getenv("VENTUREARCHITECT_COALESCE", "1") != "0")
+
@@ -0,0 +1,251 @@
+"""
+Context compaction between pipeline stages.
+
+Without compaction every stage receives the raw idea plus the full output
+of each upstream stage, so prompts grow with every step (narrative sees
+the discovery JSON and three long Markdown reports). The compactor instead
+passes each stage a structured digest of its inputs:
+
+- JSON outputs (the discovery profile) become flat `key: value` fields,
+- Markdown outputs become their headings plus one line per bullet, table
+  row or sentence, with formatting stripped,
+- facts repeated across upstream stages are passed only once,
+- if the digest is still over the stage's token cap, the least useful facts
+  (no figures, plain prose) are dropped first, keeping the original order.
+
+Token counts are estimated (about four characters per token for Gemini
+models) so compaction needs no API call.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .pipeline import PipelineStage
+
+DEFAULT_CONTEXT_TOKENS = 4000
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$")
+_BULLET = re.compile(r"^(?:[-*+•]|\d+[.)])\s+(.*)$")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_FORMATTING = re.compile(r"\*\*|__|`|\[(?=[^\]]*\]\()|\]\([^)]*\)")
+_FIGURE = re.compile(r"\d")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate Gemini token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class _Fact:
+    source: str
+    heading: str
+    text: str
+    score: int
+    order: int
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", _FORMATTING.sub("", text)).strip(" -*:")
+
+
+def _fact_key(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.casefold()))
+
+
+def _parse_json(text: str) -> Optional[Any]:
+    stripped = text.strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", stripped, re.DOTALL)
+    if fenced:
+        stripped = fenced.group(1)
+    if not stripped.startswith(("{", "[")):
+        return None
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        return None
+
+
+def _flatten(value: Any, prefix: str = "") -> List[str]:
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            lines.extend(_flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return lines
+    if isinstance(value, list):
+        if all(not isinstance(item, (dict, list)) for item in value):
+            joined = "; ".join(str(item) for item in value if item not in ("", None))
+            return [f"{prefix}: {joined}"] if joined else []
+        lines = []
+        for i, item in enumerate(value, 1):
+            lines.extend(_flatten(item, f"{prefix}[{i}]"))
+        return lines
+    if value in ("", None):
+        return []
+    return [f"{prefix}: {value}" if prefix else str(value)]
+
+
+def extract_facts(text: str) -> List[Tuple[str, str, int]]:
+    """
+    Split one stage output into (heading, fact, score) triples.
+
+    Keyed JSON fields score highest, then lines with figures, then bullets
+    and table rows, then plain prose sentences.
+    """
+    data = _parse_json(text)
+    if data is not None:
+        return [("", line, 3) for line in _flatten(data)]
+
+    facts = []
+    heading = ""
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("```") or set(line) <= set("-|:=* "):
+            continue
+        match = _HEADING.match(line)
+        if match:
+            heading = _clean(match.group(1))
+            continue
+        if line.startswith("|"):
+            cells = [_clean(cell) for cell in line.strip("|").split("|")]
+            pieces, base = [" | ".join(cell for cell in cells if cell)], 1
+        else:
+            match = _BULLET.match(line)
+            if match:
+                pieces, base = [match.group(1)], 1
+            else:
+                pieces, base = _SENTENCE_END.split(line), 0
+        for piece in pieces:
+            fact = _clean(piece)
+            if len(fact) < 3:
+                continue
+            score = base + (1 if _FIGURE.search(fact) else 0)
+            facts.append((heading, fact, score))
+    return facts
+
+
+@dataclass
+class ContextCompactor:
+    """
+    Builds compacted stage prompts under a per-stage token cap.
+
+    Args:
+        default_max_tokens: cap on the upstream facts passed to any stage
+          (section labels not counted).
+        max_tokens: per-stage caps overriding the default, by stage name.
+    """
+
+    default_max_tokens: int = DEFAULT_CONTEXT_TOKENS
+    max_tokens: Dict[str, int] = field(default_factory=dict)
+
+    def cap_for(self, stage_name: str) -> int:
+        return self.max_tokens.get(stage_name, self.default_max_tokens)
+
+    def compact(
+        self, stage_name: str, outputs: Mapping[str, str], order: List[str]
+    ) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        Compact the outputs of upstream stages for one stage.
+
+        Returns:
+            ({upstream stage: digest}, counters) where counters has
+            duplicates_removed and facts_dropped.
+        """
+        facts: List[_Fact] = []
+        seen = set()
+        duplicates = 0
+        for source in order:
+            for heading, text, score in extract_facts(outputs[source]):
+                key = _fact_key(text)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                facts.append(_Fact(source, heading, text, score, len(facts)))
+
+        # Keep the most useful facts that fit, then restore document order.
+        budget = self.cap_for(stage_name)
+        kept = []
+        for fact in sorted(facts, key=lambda f: (-f.score, f.order)):
+            cost = estimate_tokens(fact.text) + 1
+            if cost <= budget:
+                kept.append(fact)
+                budget -= cost
+        kept.sort(key=lambda f: f.order)
+
+        digests: Dict[str, str] = {}
+        for source in order:
+            lines = []
+            heading = None
+            for fact in kept:
+                if fact.source != source:
+                    continue
+                if fact.heading and fact.heading != heading:
+                    heading = fact.heading
+                    lines.append(f"[{heading}]")
+                lines.append(f"- {fact.text}")
+            digests[source] = "\n".join(lines) or "- (no facts beyond the stages above)"
+        counters = {
+            "duplicates_removed": duplicates,
+            "facts_dropped": len(facts) - len(kept),
+        }
+        return digests, counters
+
+    def compact_inputs(
+        self, stage: PipelineStage, outputs: Mapping[str, str]
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Compacted replacement for the upstream outputs a stage receives.
+
+        An upstream output is passed unchanged when its digest would not be
+        smaller (e.g. a short discovery profile).
+
+        Returns:
+            (inputs, report) where inputs maps each dependency to the text to
+            pass on, and report has raw_tokens, context_tokens, tokens_saved,
+            max_context_tokens, duplicates_removed and facts_dropped.
+        """
+        order = list(stage.depends_on)
+        digests, counters = self.compact(stage.name, outputs, order)
+        inputs = {}
+        for dep in order:
+            raw = outputs[dep]
+            smaller = estimate_tokens(digests[dep]) < estimate_tokens(raw)
+            inputs[dep] = digests[dep] if smaller else raw
+        raw_tokens = sum(estimate_tokens(outputs[dep]) for dep in order)
+        context_tokens = sum(estimate_tokens(text) for text in inputs.values())
+        report = {
+            "raw_tokens": raw_tokens,
+            "context_tokens": context_tokens,
+            "tokens_saved": raw_tokens - context_tokens,
+            "max_context_tokens": self.cap_for(stage.name),
+            **counters,
+        }
+        return inputs, report
+
+
+def default_compactor() -> Optional[ContextCompactor]:
+    """
+    ContextCompactor configured from the environment.
+
+    VENTUREARCHITECT_COMPACTION=0 passes full stage outputs instead,
+    VENTUREARCHITECT_CONTEXT_TOKENS sets the default per-stage cap and
+    VENTUREARCHITECT_CONTEXT_TOKENS_<STAGE> (e.g. ..._NARRATIVE) a
+    stage-specific one.
+    """
+    if os.getenv("VENTUREARCHITECT_COMPACTION", "1") == "0":
+        return None
+    prefix = "VENTUREARCHITECT_CONTEXT_TOKENS_"
+    return ContextCompactor(
+        default_max_tokens=int(
+            os.getenv("VENTUREARCHITECT_CONTEXT_TOKENS", str(DEFAULT_CONTEXT_TOKENS))
+        ),
+        max_tokens={
+            name[len(prefix):].lower(): int(value)
+            for name, value in os.environ.items()
+            if name.startswith(prefix) and value
+        },
+    )
@@ -0,0 +1,290 @@
+"""
+Request deadlines, retries with jitter, and hedged model calls.
+
+google-genai's own retries back off exponentially (exp_base=7 took 1s, 7s,
+49s, ... between attempts) without knowing that the web client gave up
+long ago. Instead, model calls (agents/config.py) go through call():
+
+- deadline(): a per-request deadline, set by the web app around a run. It
+  reaches every agent's model call through a context variable (asyncio
+  tasks copy it), bounds each attempt and stops retrying once the next
+  backoff would not fit,
+- retries with decorrelated jitter (sleep = min(cap, uniform(base,
+  3 * previous sleep))), so clients hit by the same 503 do not retry in
+  lock-step,
+- optional hedging for short calls: when an attempt is slower than the
+  recent p95 latency of that call, a second identical one is started and
+  the first to finish wins,
+- retry_stats: counters for retries, hedges and deadline expiries, and
+  per call a CallRecord (see record_call()) for tracing.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# time.monotonic() by which the current request must be done, if any.
+_deadline: ContextVar[Optional[float]] = ContextVar(
+    "venturearchitect_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed (or would pass before the next retry)."""
+
+
+@dataclass
+class CallRecord:
+    """What happened during one model call, filled in by call() and callers."""
+
+    tries: int = 0
+    retries: int = 0
+    hedged: bool = False
+    quota_wait_seconds: float = 0.0
+
+
+_record: ContextVar[Optional[CallRecord]] = ContextVar(
+    "venturearchitect_call_record", default=None
+)
+
+
+def record_call() -> CallRecord:
+    """
+    A new CallRecord for the next model call made in the current context
+    (e.g. from a plugin's before-model callback).
+    """
+    record = CallRecord()
+    _record.set(record)
+    return record
+
+
+def current_record() -> Optional[CallRecord]:
+    """The CallRecord of the model call in progress, if one was started."""
+    return _record.get()
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Model calls inside the block must finish within `seconds`.
+
+    None (or 0) sets no deadline. A nested deadline can only shorten the
+    one already in effect.
+    """
+    if not seconds:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (None without a deadline)."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def decorrelated_jitter(previous: float, base: float, cap: float) -> float:
+    """Next retry sleep after `previous` ("decorrelated jitter" backoff)."""
+    return min(cap, random.uniform(base, max(base, previous * 3)))
+
+
+class RetryStats:
+    """Counters for call(), and recent latencies for hedging decisions."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._window = window
+        self.counts = {
+            "calls": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "deadline_expired": 0,
+            "failures": 0,
+        }
+
+    def record_latency(self, key: str, seconds: float) -> None:
+        self._latencies.setdefault(key, deque(maxlen=self._window)).append(seconds)
+
+    def hedge_after(self, key: str) -> Optional[float]:
+        """p95 latency of `key`, once there are enough samples to trust it."""
+        latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedge_after_seconds": {
+                key: round(after, 3)
+                for key in self._latencies
+                if (after := self.hedge_after(key)) is not None
+            },
+            "counts": dict(self.counts),
+        }
+
+
+retry_stats = RetryStats()
+
+
+def _expired(message: str) -> DeadlineExceeded:
+    retry_stats.counts["deadline_expired"] += 1
+    return DeadlineExceeded(message)
+
+
+async def _next(items: AsyncIterator[T]) -> T:
+    """Next item, within the current deadline."""
+    left = remaining()
+    if left is None:
+        return await items.__anext__()
+    try:
+        async with asyncio.timeout(max(left, 0.0)):
+            return await items.__anext__()
+    except TimeoutError:
+        raise _expired("Request deadline exceeded during a model call") from None
+
+
+async def _collect(items: AsyncIterator[T]) -> List[T]:
+    async with aclosing(items):
+        return [item async for item in items]
+
+
+async def _hedged(
+    attempt: Callable[[], AsyncIterator[T]],
+    after: float,
+    record: Optional[CallRecord] = None,
+) -> List[T]:
+    """Run `attempt()`; if it takes longer than `after`, race a second one."""
+    primary = asyncio.ensure_future(_collect(attempt()))
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=after)
+        if done:
+            return primary.result()
+        retry_stats.counts["hedges"] += 1
+        if record is not None:
+            record.hedged = True
+        tasks.add(asyncio.ensure_future(_collect(attempt())))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        retry_stats.counts["hedge_wins"] += 1
+                    return task.result()
+        return primary.result()  # both failed: raise the primary's error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call(
+    attempt: Callable[[], AsyncIterator[T]],
+    *,
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+    retryable: Callable[[BaseException], bool],
+    key: str = "",
+    hedge: bool = False,
+) -> AsyncGenerator[T, None]:
+    """
+    Items of `attempt()`, retried and (optionally) hedged within the deadline.
+
+    Args:
+        attempt: starts one try of the call (a fresh async iterator each time).
+        attempts: tries in total, including the first.
+        base_delay / max_delay: bounds of the jittered retry sleeps (seconds).
+        retryable: whether a failed try may be retried.
+        key: names the call for latency tracking (e.g. the agent's name).
+        hedge: race a second try once the first is slower than the p95
+            latency of `key`. The items are then only yielded once a try
+            has finished, so use it for non-streaming calls.
+
+    A try is only retried if it failed before yielding anything.
+    """
+    retry_stats.counts["calls"] += 1
+    record = _record.get()
+    sleep = base_delay
+    for tries in range(1, attempts + 1):
+        if record is not None:
+            record.tries = tries
+        left = remaining()
+        if left is not None and left <= 0:
+            retry_stats.counts["failures"] += 1
+            raise _expired("Request deadline exceeded before a model call")
+        started = time.monotonic()
+        yielded = False
+        try:
+            after = retry_stats.hedge_after(key) if hedge else None
+            if after is not None:
+                if left is None:
+                    items = await _hedged(attempt, after, record)
+                else:
+                    try:
+                        async with asyncio.timeout(left):
+                            items = await _hedged(attempt, after, record)
+                    except TimeoutError:
+                        raise _expired(
+                            "Request deadline exceeded during a model call"
+                        ) from None
+                retry_stats.record_latency(key, time.monotonic() - started)
+                for item in items:
+                    yield item
+                return
+            async with aclosing(attempt()) as stream:
+                while True:
+                    try:
+                        item = await _next(stream)
+                    except StopAsyncIteration:
+                        break
+                    yielded = True
+                    yield item
+            retry_stats.record_latency(key, time.monotonic() - started)
+            return
+        except DeadlineExceeded:
+            retry_stats.counts["failures"] += 1
+            raise
+        except Exception as e:
+            if yielded or tries == attempts or not retryable(e):
+                retry_stats.counts["failures"] += 1
+                raise
+            sleep = decorrelated_jitter(sleep, base_delay, max_delay)
+            left = remaining()
+            if left is not None and sleep >= left:
+                retry_stats.counts["failures"] += 1
+                raise _expired(
+                    f"Request deadline leaves no time to retry after: {e}"
+                ) from e
+            retry_stats.counts["retries"] += 1
+            if record is not None:
+                record.retries += 1
+            await asyncio.sleep(sleep)
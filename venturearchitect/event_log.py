@@ -0,0 +1,325 @@
+"""
+Sampled, structured run logging that stays off the event loop.
+
+ADK's LoggingPlugin prints every callback of every run, full plan text
+included, with synchronous console writes on the event loop. The EventLog
+(fed by logging_plugin.SampledLoggingPlugin) keeps the useful part at a
+fraction of the cost:
+
+- one JSON summary line per run (duration, model and tool calls, tokens,
+  errors), always,
+- head sampling: a `sample_rate` share of runs is logged in detail,
+- tail sampling: the last records of other runs are buffered and only
+  written if the run fails or is slower than `slow_seconds`,
+- long text (prompts, plan text, tool results) is truncated to `max_chars`,
+- records are queued and serialized/written by a background thread; when
+  the queue is full they are dropped and counted, never waited for,
+- debug_capture(): full, untruncated capture of a single run (e.g. the web
+  app's `"debug": true`).
+"""
+
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Any, Deque, Dict, Iterator, Optional
+
+_debug: ContextVar[bool] = ContextVar("venturearchitect_debug_capture", default=False)
+
+
+@contextmanager
+def debug_capture(enabled: bool = True) -> Iterator[None]:
+    """Runs started inside the block are logged in full when `enabled`."""
+    token = _debug.set(enabled or _debug.get())
+    try:
+        yield
+    finally:
+        _debug.reset(token)
+
+
+def debug_requested() -> bool:
+    """Whether the current context asked for full capture."""
+    return _debug.get()
+
+
+class LineWriter:
+    """Writes records as JSON lines from a background thread."""
+
+    def __init__(self, stream: Optional[IO[str]] = None, max_queue: int = 10_000):
+        self.stream = stream or sys.stderr
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        # Updated by the caller's thread (drops) and the writer thread.
+        self._counts_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._drain, name="event-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Queue a record; drops it (and counts it) if the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._counts_lock:
+                self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            lines = []
+            # Write whatever has piled up in one go.
+            while True:
+                if isinstance(item, threading.Event):
+                    self._write(lines)
+                    lines = []
+                    item.set()
+                else:
+                    lines.append(json.dumps(item, default=str))
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(lines)
+
+    def _write(self, lines: list) -> None:
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+            written = len(lines)
+        except (OSError, ValueError):
+            written = 0
+        with self._counts_lock:
+            self.written += written
+            self.dropped += len(lines) - written
+
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            return {"written": self.written, "dropped": self.dropped}
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait (up to `timeout` seconds) until queued records are written."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+
+class _Run:
+    """Logging state of one run."""
+
+    def __init__(self, mode: str, tail_records: int):
+        self.mode = mode  # "debug", "sampled" or "tail" (buffered)
+        self.started = time.monotonic()
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=tail_records)
+        self.failed = False
+        self.counts = {
+            "model_calls": 0,
+            "tool_calls": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "errors": 0,
+        }
+
+
+class EventLog:
+    """
+    Head/tail-sampled run logs with truncated payloads.
+
+    Args:
+        writer: where records go.
+        sample_rate: share of runs logged in detail from the start (0-1).
+        slow_seconds: other runs' buffered records are written when the
+            run takes longer than this (or fails).
+        max_chars: text longer than this is truncated (except in debug).
+        tail_records: records buffered per unsampled run (the latest kept).
+        max_runs: runs tracked at once; beyond it the oldest is forgotten.
+    """
+
+    def __init__(
+        self,
+        writer: LineWriter,
+        sample_rate: float = 0.1,
+        slow_seconds: float = 120.0,
+        max_chars: int = 300,
+        tail_records: int = 200,
+        max_runs: int = 10_000,
+    ):
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.max_chars = max_chars
+        self.tail_records = tail_records
+        self.max_runs = max_runs
+        self._runs: Dict[str, _Run] = {}
+        self.counts = {
+            "runs": 0,
+            "debug": 0,
+            "sampled": 0,
+            "tail_kept": 0,
+            "tail_discarded": 0,
+        }
+
+    def start_run(self, run_id: str, debug: bool = False) -> None:
+        """Decide how run `run_id` is logged (no-op if already started)."""
+        if run_id in self._runs:
+            return
+        if debug:
+            mode = "debug"
+        elif random.random() < self.sample_rate:
+            mode = "sampled"
+        else:
+            mode = "tail"
+        self.counts["runs"] += 1
+        if mode != "tail":
+            self.counts[mode] += 1
+        self._runs[run_id] = _Run(mode, self.tail_records)
+        if len(self._runs) > self.max_runs:
+            del self._runs[next(iter(self._runs))]
+
+    def full(self, run_id: str) -> bool:
+        """Whether the run is captured without truncation."""
+        run = self._runs.get(run_id)
+        return run is not None and run.mode == "debug"
+
+    def clip(self, run_id: str, value: Any) -> Any:
+        """
+        A copy of `value` with long strings truncated (in full if the run is
+        in debug), safe to hand to the writer thread.
+        """
+        if self.full(run_id):
+            # The caller may still change it (tool args, results) before the
+            # writer serializes it.
+            return json.loads(json.dumps(value, default=str))
+        return _clip(value, self.max_chars)
+
+    def count(self, run_id: str, **increments: int) -> None:
+        run = self._runs.get(run_id)
+        if run is not None:
+            for name, value in increments.items():
+                run.counts[name] += value
+
+    def record(self, run_id: str, kind: str, error: bool = False, **fields) -> None:
+        """Log (or buffer) one record of a run; error=True keeps its tail."""
+        run = self._runs.get(run_id)
+        if run is None:
+            return
+        if error:
+            run.failed = True
+            run.counts["errors"] += 1
+        record = {"ts": round(time.time(), 3), "run": run_id, "kind": kind, **fields}
+        if run.mode == "tail":
+            run.buffer.append(record)
+        else:
+            self.writer.write(record)
+
+    def end_run(
+        self, run_id: str, error: Optional[BaseException] = None, **fields
+    ) -> None:
+        """Write the run's summary, and its buffered tail if it was kept."""
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        seconds = time.monotonic() - run.started
+        failed = run.failed or error is not None
+        if run.mode == "tail":
+            if failed or seconds >= self.slow_seconds:
+                self.counts["tail_kept"] += 1
+                for record in run.buffer:
+                    self.writer.write(dict(record, tail=True))
+            else:
+                self.counts["tail_discarded"] += 1
+        summary = {
+            "ts": round(time.time(), 3),
+            "run": run_id,
+            "kind": "run_summary",
+            "logged": run.mode,
+            "seconds": round(seconds, 3),
+            "status": "error" if failed else "ok",
+            **run.counts,
+            **fields,
+        }
+        if error is not None:
+            summary["error"] = _clip(f"{type(error).__name__}: {error}", 500)
+        self.writer.write(summary)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "slow_seconds": self.slow_seconds,
+            "open_runs": len(self._runs),
+            "queued": self.writer.queued(),
+            "counts": dict(self.counts, **self.writer.counts()),
+        }
+
+
+def _clip(value: Any, max_chars: int, depth: int = 0) -> Any:
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"{value[:max_chars]}... [{len(value)} chars]"
+    if depth >= 3:
+        return _clip(str(value), max_chars, depth)
+    if isinstance(value, dict):
+        items = list(value.items())
+        clipped = {str(k): _clip(v, max_chars, depth + 1) for k, v in items[:20]}
+        if len(items) > 20:
+            clipped["..."] = f"{len(items) - 20} more"
+        return clipped
+    if isinstance(value, (list, tuple)):
+        clipped = [_clip(v, max_chars, depth + 1) for v in value[:20]]
+        if len(value) > 20:
+            clipped.append(f"... {len(value) - 20} more")
+        return clipped
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return _clip(str(value), max_chars, depth)
+
+
+def default_event_log() -> EventLog:
+    """
+    EventLog configured from the environment.
+
+    VENTUREARCHITECT_LOG_SAMPLE_RATE (default 0.1),
+    VENTUREARCHITECT_LOG_SLOW_SECONDS (default 120),
+    VENTUREARCHITECT_LOG_MAX_CHARS (default 300) and
+    VENTUREARCHITECT_LOG_FILE (JSON lines; default stderr).
+    """
+    path = os.getenv("VENTUREARCHITECT_LOG_FILE")
+    stream = None
+    if path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        stream = open(path, "a", encoding="utf-8")
+    return EventLog(
+        LineWriter(stream),
+        sample_rate=float(os.getenv("VENTUREARCHITECT_LOG_SAMPLE_RATE", "0.1")),
+        slow_seconds=float(os.getenv("VENTUREARCHITECT_LOG_SLOW_SECONDS", "120")),
+        max_chars=int(os.getenv("VENTUREARCHITECT_LOG_MAX_CHARS", "300")),
+    )
+
+
+_event_log: Optional[EventLog] = None
+_event_log_lock = threading.Lock()
+
+
+def shared_event_log() -> EventLog:
+    """The process-wide EventLog, built (and its writer started) on first use."""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = default_event_log()
+        return _event_log
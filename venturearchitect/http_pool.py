@@ -0,0 +1,326 @@
+"""
+One process-wide HTTP connection pool for every Gemini model.
+
+Left alone, each Gemini model builds its own google-genai Client and each
+client its own httpx connection pools, so the six agents of a pipeline
+open (and TLS-handshake) six sets of connections to the same host. Models
+built by agents/config.py, and the search backend, share instead:
+
+- one httpx.AsyncClient (plus one httpx.Client for sync calls) with
+  keep-alive and configurable limits, using HTTP/2 when the `h2` package is
+  installed,
+- underneath, one connection pool per event loop (async connections cannot
+  cross loops), created on first use,
+- PoolStats: requests, connections opened, reuse ratio and time spent
+  waiting for a free connection, to size the limits.
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+import httpx
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection limits of the shared pool (per event loop)."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True  # used only if `h2` is installed
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def use_http2(self) -> bool:
+        return self.http2 and importlib.util.find_spec("h2") is not None
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class PoolStats:
+    """Counters and recent timings for requests sent through the pool."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self._wait_seconds: Deque[float] = deque(maxlen=window)
+        self._connect_seconds: Deque[float] = deque(maxlen=window)
+
+    def record_request(self, failed: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.failures += failed
+
+    def record_connect(self, seconds: float, tls: bool) -> None:
+        with self._lock:
+            if tls:
+                self.tls_handshakes += 1
+            else:
+                self.connections_opened += 1
+            self._connect_seconds.append(seconds)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._wait_seconds.append(max(0.0, seconds))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._wait_seconds)
+            connects = list(self._connect_seconds)
+            requests = self.requests
+            opened = self.connections_opened
+            return {
+                # Share of requests sent on an already open connection.
+                "reuse_ratio": round(1 - opened / requests, 3) if requests else None,
+                "wait_seconds": {
+                    "p50": round(_percentile(waits, 0.5), 4),
+                    "p95": round(_percentile(waits, 0.95), 4),
+                    "max": round(max(waits, default=0.0), 4),
+                },
+                "connect_seconds": {
+                    "p50": round(_percentile(connects, 0.5), 4),
+                    "max": round(max(connects, default=0.0), 4),
+                },
+                "counts": {
+                    "requests": requests,
+                    "failures": self.failures,
+                    "connections_opened": opened,
+                    "tls_handshakes": self.tls_handshakes,
+                },
+            }
+
+
+class _RequestTrace:
+    """
+    httpcore `trace` extension for one request.
+
+    Time from sending the request to the pool until its headers go out,
+    minus any time spent connecting, is time spent waiting for a free
+    connection.
+    """
+
+    def __init__(self, stats: PoolStats, inner: Optional[Callable] = None):
+        self.stats = stats
+        self.inner = inner
+        self.started = time.perf_counter()
+        self.connecting = 0.0
+        self._phase_started: Dict[str, float] = {}
+        self._sent = False
+
+    def record(self, name: str) -> None:
+        now = time.perf_counter()
+        for phase in ("connect_tcp", "start_tls"):
+            if name.endswith(f"{phase}.started"):
+                self._phase_started[phase] = now
+            elif name.endswith(f"{phase}.complete") and phase in self._phase_started:
+                seconds = now - self._phase_started.pop(phase)
+                self.connecting += seconds
+                self.stats.record_connect(seconds, tls=phase == "start_tls")
+        if not self._sent and name.endswith("send_request_headers.started"):
+            self._sent = True
+            self.stats.record_wait(now - self.started - self.connecting)
+
+    def sync(self, name: str, info: Dict[str, Any]) -> None:
+        self.record(name)
+        if self.inner is not None:
+            self.inner(name, info)
+
+    async def aio(self, name: str, info: Dict[str, Any]) -> None:
+        self.record(name)
+        if self.inner is not None:
+            await self.inner(name, info)
+
+
+class PooledAsyncTransport(httpx.AsyncBaseTransport):
+    """One httpx connection pool per event loop, with PoolStats."""
+
+    def __init__(self, settings: PoolSettings, stats: PoolStats):
+        self.settings = settings
+        self.stats = stats
+        self._pools: "weakref.WeakKeyDictionary[Any, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = self._pools[loop] = httpx.AsyncHTTPTransport(
+                    http2=self.settings.use_http2(), limits=self.settings.limits()
+                )
+            return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trace = _RequestTrace(self.stats, request.extensions.get("trace"))
+        request.extensions["trace"] = trace.aio
+        try:
+            response = await self._pool().handle_async_request(request)
+        except Exception:
+            self.stats.record_request(failed=True)
+            raise
+        self.stats.record_request()
+        return response
+
+    async def aclose(self) -> None:
+        """Close the current event loop's pool."""
+        with self._lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+    def pools(self) -> int:
+        with self._lock:
+            return len(self._pools)
+
+
+class PooledTransport(httpx.BaseTransport):
+    """Sync counterpart of PooledAsyncTransport (one pool, thread-safe)."""
+
+    def __init__(self, settings: PoolSettings, stats: PoolStats):
+        self.stats = stats
+        self._pool = httpx.HTTPTransport(
+            http2=settings.use_http2(), limits=settings.limits()
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        trace = _RequestTrace(self.stats, request.extensions.get("trace"))
+        request.extensions["trace"] = trace.sync
+        try:
+            response = self._pool.handle_request(request)
+        except Exception:
+            self.stats.record_request(failed=True)
+            raise
+        self.stats.record_request()
+        return response
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+def default_pool_settings() -> PoolSettings:
+    """
+    PoolSettings configured from the environment.
+
+    VENTUREARCHITECT_HTTP_MAX_CONNECTIONS (default 100),
+    VENTUREARCHITECT_HTTP_MAX_KEEPALIVE (default 20),
+    VENTUREARCHITECT_HTTP_KEEPALIVE_SECONDS (default 30) and
+    VENTUREARCHITECT_HTTP2 ("0" disables HTTP/2).
+    """
+    return PoolSettings(
+        max_connections=int(os.getenv("VENTUREARCHITECT_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(
+            os.getenv("VENTUREARCHITECT_HTTP_MAX_KEEPALIVE", "20")
+        ),
+        keepalive_expiry=float(
+            os.getenv("VENTUREARCHITECT_HTTP_KEEPALIVE_SECONDS", "30")
+        ),
+        http2=os.getenv("VENTUREARCHITECT_HTTP2", "1") != "0",
+    )
+
+
+class SharedHttpClients:
+    """The process-wide httpx clients (built on first use) and their stats."""
+
+    def __init__(self, settings: Optional[PoolSettings] = None):
+        self.settings = settings or default_pool_settings()
+        self.stats = PoolStats()
+        self._lock = threading.Lock()
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[httpx.Client] = None
+
+    def async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    transport=PooledAsyncTransport(self.settings, self.stats),
+                    follow_redirects=True,
+                )
+            return self._async_client
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    transport=PooledTransport(self.settings, self.stats),
+                    follow_redirects=True,
+                )
+            return self._client
+
+    def http_options(self, **options: Any) -> Any:
+        """google-genai HttpOptions that send requests through the pool."""
+        from google.genai import types
+
+        return types.HttpOptions(
+            httpx_client=self.client(),
+            httpx_async_client=self.async_client(),
+            **options,
+        )
+
+    async def aclose(self) -> None:
+        """Close the running event loop's connections (e.g. at shutdown)."""
+        if self._async_client is not None:
+            await self._async_client._transport.aclose()
+
+    def report(self) -> Dict[str, Any]:
+        """Pool settings and PoolStats, for /metrics."""
+        transport = self._async_client._transport if self._async_client else None
+        return {
+            "max_connections": self.settings.max_connections,
+            "max_keepalive_connections": self.settings.max_keepalive_connections,
+            "keepalive_expiry": self.settings.keepalive_expiry,
+            "http2": self.settings.use_http2(),
+            "event_loop_pools": transport.pools() if transport else 0,
+            **self.stats.stats(),
+        }
+
+
+# Shared by every model in the process (see agents/config.py).
+http_clients = SharedHttpClients()
+
+
+def pooling_enabled() -> bool:
+    """VENTUREARCHITECT_HTTP_POOL=0 gives every model its own client again."""
+    return os.getenv("VENTUREARCHITECT_HTTP_POOL", "1") != "0"
+
+
+def gemini_client_kwargs(model: Any) -> Dict[str, Any]:
+    """
+    `client_kwargs` for a Gemini model so its clients use the shared pool.
+
+    They replace the HttpOptions ADK would build (see Gemini.api_client), so
+    the model's headers, retry options, base URL and API version are
+    carried over.
+    """
+    base_url, api_version = model._base_url_and_api_version
+    options: Dict[str, Any] = {
+        "headers": model._tracking_headers(),
+        "retry_options": model.retry_options,
+        "base_url": base_url,
+    }
+    api_version = api_version or model._configured_api_version()
+    if api_version:
+        options["api_version"] = api_version
+    return {"http_options": http_clients.http_options(**options)}
@@ -0,0 +1,232 @@
+"""
+Near-duplicate detection over previously generated business ideas.
+
+Ideas are reduced to sets of content words, summarized with MinHash
+signatures and bucketed with LSH banding, so a lookup only compares the
+query against the handful of stored ideas that share a band bucket. This
+keeps lookups well under a millisecond at hundreds of thousands of ideas,
+with no external service.
+
+Records (idea, discovery profile, plan) are appended to a JSON-lines file;
+only the idea texts, their LSH bucket entries and file offsets are kept in
+memory. Loading reads just the idea of each record (plans are never parsed)
+and full records are read back on demand.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.getcwd(), ".venturearchitect_cache", "ideas.jsonl"
+)
+
+_STOPWORDS = frozenset(
+    """
+    a an and app are as at be build business by create for from i idea in
+    into is it like local make my of on or our platform service services
+    that the their this to want we which will with you your
+    """.split()
+)
+_MERSENNE_PRIME = (1 << 31) - 1
+
+# add() writes "idea" first, so loading can decode it alone.
+_IDEA_PREFIX = '{"idea": '
+_decoder = json.JSONDecoder()
+
+
+def idea_terms(idea: str) -> FrozenSet[str]:
+    """Content words of an idea: lower-cased, stopwords and plural 's' removed."""
+    terms = set()
+    for word in re.findall(r"[a-z0-9]+", idea.lower()):
+        if word in _STOPWORDS or len(word) < 2:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.add(word)
+    return frozenset(terms)
+
+
+def _record_idea(line: bytes) -> str:
+    """The idea of a stored record line, without decoding the rest of it."""
+    text = line.decode("utf-8")
+    if text.startswith(_IDEA_PREFIX):
+        idea, _ = _decoder.raw_decode(text, len(_IDEA_PREFIX))
+        if isinstance(idea, str):
+            return idea
+    return json.loads(text)["idea"]
+
+
+def _term_hash(term: str) -> int:
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big")
+
+
+class IdeaIndex:
+    """
+    MinHash + LSH index of past ideas.
+
+    With the defaults (64 permutations in 16 bands of 4 rows) ideas whose
+    word sets have a Jaccard similarity of about 0.5 or more are very
+    likely to become candidates; candidates are then ranked by their exact
+    Jaccard similarity.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_INDEX_PATH,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        self._buckets: List[Dict[bytes, List[int]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+        self._ideas: List[str] = []
+        self._offsets: List[int] = []
+        # Records of a memory-only index (path=None), keyed by id.
+        self._records: Dict[int, Dict[str, Any]] = {}
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._ideas)
+
+    def signature(self, terms: FrozenSet[str]) -> np.ndarray:
+        """MinHash signature (num_perm,) of a term set."""
+        if not terms:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.fromiter((_term_hash(t) for t in terms), dtype=np.uint64)
+        permuted = (hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[i * self.rows : (i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def _insert(self, idea: str, terms: FrozenSet[str], offset: int) -> int:
+        idea_id = len(self._ideas)
+        self._ideas.append(idea)
+        self._offsets.append(offset)
+        if terms:
+            for band, key in enumerate(self._band_keys(self.signature(terms))):
+                self._buckets[band][key].append(idea_id)
+        return idea_id
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    idea = _record_idea(line)
+                except (ValueError, KeyError, TypeError):
+                    offset += len(line)
+                    continue
+                self._insert(idea, idea_terms(idea), offset)
+                offset += len(line)
+
+    def add(
+        self,
+        idea: str,
+        profile: Optional[Any] = None,
+        plan: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Store an idea (and optionally its discovery profile and plan)."""
+        record = {
+            "idea": idea,
+            "profile": profile,
+            "plan": plan,
+            "metadata": metadata,
+        }
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            offset = -1
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "ab") as f:
+                    offset = f.tell()
+                    f.write(line)
+            idea_id = self._insert(idea, idea_terms(idea), offset)
+            if not self.path:
+                self._records[idea_id] = record
+            return idea_id
+
+    def get(self, idea_id: int) -> Dict[str, Any]:
+        """Full stored record (idea, profile, plan, metadata) for an id."""
+        if not self.path:
+            return dict(self._records[idea_id])
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[idea_id])
+            return json.loads(f.readline())
+
+    def query(
+        self, idea: str, threshold: float = 0.5, limit: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Stored ideas similar to `idea`, best first.
+
+        Returns:
+            list of {id, idea, similarity} with similarity >= threshold
+            (exact Jaccard similarity of the content-word sets).
+        """
+        terms = idea_terms(idea)
+        if not terms:
+            return []
+        candidates = set()
+        keys = self._band_keys(self.signature(terms))
+        with self._lock:  # add() may run in another thread
+            for band, key in enumerate(keys):
+                candidates.update(self._buckets[band].get(key, ()))
+
+        matches = []
+        for idea_id in candidates:
+            # Candidates are few: re-derive their terms instead of keeping
+            # every idea's term set in memory.
+            other = idea_terms(self._ideas[idea_id])
+            similarity = len(terms & other) / len(terms | other)
+            if similarity >= threshold:
+                matches.append(
+                    {
+                        "id": idea_id,
+                        "idea": self._ideas[idea_id],
+                        "similarity": round(similarity, 3),
+                    }
+                )
+        matches.sort(key=lambda m: (-m["similarity"], -m["id"]))
+        return matches[:limit]
+
+
+def seed_prompt(idea: str, record: Dict[str, Any]) -> str:
+    """Prefix a new idea with a previously generated profile as reference."""
+    reference = record.get("profile") or record.get("plan") or ""
+    if not isinstance(reference, str):
+        reference = json.dumps(reference)
+    return (
+        f"{idea}\n\n"
+        "Reference material: a closely related idea was planned before.\n"
+        f"Related idea: {record['idea']}\n"
+        f"Previous business profile / plan:\n{reference}\n\n"
+        "Use the reference only as a starting point and tailor everything "
+        "to the idea above."
+    )
@@ -0,0 +1,517 @@
+"""
+Asynchronous generation jobs.
+
+A generation can take minutes, longer than most load balancers keep a
+request open. Instead of holding the connection, clients submit a job,
+poll it and fetch the result later:
+
+- JobQueue: a bounded priority queue drained by a fixed pool of asyncio
+  workers, with queue-depth and wait-time metrics,
+- JobStore: where job state lives; InMemoryJobStore for a single process,
+  SQLiteJobStore to keep jobs across restarts or share them between
+  processes (each queue heartbeats; jobs of a queue that stopped
+  heartbeating are failed, and cancelling another process's job asks that
+  process to cancel it).
+
+Store writes run in order on a single background thread, so a SQLite write
+per progress update never blocks the event loop.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+@dataclass
+class Job:
+    """State of one submitted job, as stored and returned by the API."""
+
+    id: str
+    request: Dict[str, Any]
+    priority: str = "normal"
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    owner: Optional[str] = None  # id of the JobQueue that runs it
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit() when the queue is at capacity."""
+
+
+# ------------------------------------------------------------
+# Stores
+# ------------------------------------------------------------
+
+
+class JobStore(ABC):
+    """Interface for job persistence."""
+
+    @abstractmethod
+    def save(self, job: Job) -> None:
+        """Insert or replace `job`."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """The stored job, or None."""
+
+    @abstractmethod
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        """Newest jobs first, optionally only those with `status`."""
+
+    def heartbeat(self, owner: str) -> List[str]:
+        """
+        Record that queue `owner` is alive; returns the ids of its jobs whose
+        cancellation another process requested.
+        """
+        return []
+
+    def request_cancel(self, job_id: str) -> None:
+        """Ask the queue running job `job_id` (in another process) to cancel it."""
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local store; keeps at most `max_jobs` (oldest finished dropped)."""
+
+    def __init__(self, max_jobs: int = 10_000):
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            if len(self._jobs) > self.max_jobs:
+                for job_id, stored in list(self._jobs.items()):
+                    if stored.status in FINISHED_STATUSES:
+                        del self._jobs[job_id]
+                        break
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if status in (None, j.status)]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)[:limit]
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Durable store in a SQLite file, shareable between processes.
+
+    Every JobQueue using the store heartbeats (see JobQueue); queued or
+    running jobs whose queue has not heartbeated for `stale_seconds` (e.g.
+    left by a process that crashed) cannot be resumed, so they are marked
+    failed. Jobs of live queues, in this process or another, are left alone.
+    """
+
+    def __init__(self, path: str, stale_seconds: float = 30.0):
+        self.path = path
+        self.stale_seconds = stale_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, status TEXT NOT NULL,"
+                " created_at REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_owners ("
+                " owner TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_cancellations (id TEXT PRIMARY KEY)"
+            )
+            self._recover()
+
+    def _save(self, job: Job) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO jobs (id, status, created_at, data)"
+            " VALUES (?, ?, ?, ?)",
+            (job.id, job.status, job.created_at, json.dumps(job.to_dict())),
+        )
+        if job.status in FINISHED_STATUSES:
+            self._conn.execute("DELETE FROM job_cancellations WHERE id = ?", (job.id,))
+
+    def _unfinished(self) -> List[Job]:
+        rows = self._conn.execute(
+            "SELECT data FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchall()
+        return [Job(**json.loads(row[0])) for row in rows]
+
+    def _live_owners(self) -> set:
+        rows = self._conn.execute(
+            "SELECT owner FROM job_owners WHERE heartbeat_at >= ?",
+            (time.time() - self.stale_seconds,),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def _recover(self) -> None:
+        # Caller holds the lock and a transaction.
+        live = self._live_owners()
+        self._conn.execute(
+            "DELETE FROM job_owners WHERE heartbeat_at < ?",
+            (time.time() - self.stale_seconds,),
+        )
+        for job in self._unfinished():
+            if job.owner not in live:
+                job.status = FAILED
+                job.error = "Interrupted: the server running it stopped."
+                job.finished_at = time.time()
+                self._save(job)
+
+    def save(self, job: Job) -> None:
+        with self._lock, self._conn:
+            self._save(job)
+
+    def heartbeat(self, owner: str) -> List[str]:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_owners (owner, heartbeat_at)"
+                " VALUES (?, ?)",
+                (owner, time.time()),
+            )
+            self._recover()
+            requested = {
+                row[0]
+                for row in self._conn.execute("SELECT id FROM job_cancellations")
+            }
+            if not requested:
+                return []
+            return [
+                job.id
+                for job in self._unfinished()
+                if job.owner == owner and job.id in requested
+            ]
+
+    def request_cancel(self, job_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO job_cancellations (id) VALUES (?)", (job_id,)
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job(**json.loads(row[0])) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        query = "SELECT data FROM jobs"
+        params: List[Any] = []
+        if status is not None:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [Job(**json.loads(row[0])) for row in rows]
+
+
+# ------------------------------------------------------------
+# Queue + workers
+# ------------------------------------------------------------
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+JobHandler = Callable[[Job, ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class JobQueue:
+    """
+    Bounded priority queue of jobs served by `workers` asyncio tasks.
+
+    Workers start on the first submit() (inside the running event loop).
+    Jobs are served by priority ("high" before "normal" before "low"),
+    first-come first-served within a level. Cancelled jobs stop counting
+    against `max_queue` right away.
+
+    While started, the queue heartbeats to the store every
+    `heartbeat_seconds` (so other processes sharing it know its jobs are
+    alive) and picks up cancellations requested by other processes.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        store: Optional[JobStore] = None,
+        workers: int = 4,
+        max_queue: int = 100,
+        heartbeat_seconds: float = 5.0,
+    ):
+        self.handler = handler
+        self.store = store or InMemoryJobStore()
+        self.workers = workers
+        self.max_queue = max_queue
+        self.heartbeat_seconds = heartbeat_seconds
+        self.owner = uuid.uuid4().hex
+        self._queue: Optional["asyncio.PriorityQueue"] = None
+        self._worker_tasks: List["asyncio.Task[None]"] = []
+        self._heartbeat_task: Optional["asyncio.Task[None]"] = None
+        self._stopping = False
+        self._running: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        self._jobs: Dict[str, Job] = {}  # queued, running or being saved
+        # One thread, so saves of the same job land in order.
+        self._store_thread = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="job-store"
+        )
+        self._sequence = itertools.count()
+        self._wait_seconds: Deque[float] = deque(maxlen=1000)
+        self._run_seconds: Deque[float] = deque(maxlen=1000)
+        self.counts = {
+            "submitted": 0,
+            "rejected": 0,
+            SUCCEEDED: 0,
+            FAILED: 0,
+            CANCELLED: 0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            # Unbounded: max_queue is enforced on live (queued) jobs instead,
+            # so cancelled entries left in the heap don't take up slots.
+            self._queue = asyncio.PriorityQueue()
+            self._worker_tasks = [
+                asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+                for i in range(self.workers)
+            ]
+            # Register before the first job is saved under our name.
+            self._in_store_thread(self.store.heartbeat, self.owner)
+            self._heartbeat_task = asyncio.create_task(
+                self._heartbeat(), name="job-heartbeat"
+            )
+
+    def submit(self, request: Dict[str, Any], priority: str = "normal") -> Job:
+        """Queue a job; raises QueueFullError when the queue is full."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}")
+        self._ensure_started()
+        if self.depth() >= self.max_queue:
+            self.counts["rejected"] += 1
+            raise QueueFullError(f"Job queue is full ({self.max_queue} jobs waiting)")
+        job = Job(
+            id=uuid.uuid4().hex, request=request, priority=priority, owner=self.owner
+        )
+        self._queue.put_nowait((PRIORITIES[priority], next(self._sequence), job))
+        self._jobs[job.id] = job
+        self._save(job)
+        self.counts["submitted"] += 1
+        return job
+
+    def depth(self) -> int:
+        """Jobs waiting to start."""
+        return sum(1 for job in self._jobs.values() if job.status == QUEUED)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id) or self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job; finished jobs are returned unchanged.
+
+        A job of another process (sharing the store) is cancelled by that
+        process on its next heartbeat.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self.store.get(job_id)
+            if job is not None and job.status not in FINISHED_STATUSES:
+                self.store.request_cancel(job_id)
+            return job
+        if job.status in FINISHED_STATUSES:
+            return job  # finished, its final save still pending
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()  # the worker records the cancellation
+        else:
+            self._finish(job, CANCELLED)  # workers skip cancelled jobs
+        return job
+
+    def _finish(
+        self,
+        job: Job,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        if job.started_at is not None:
+            self._run_seconds.append(job.finished_at - job.started_at)
+        self.counts[status] += 1
+        # Served from memory until saved, so get() never sees an older copy.
+        self._save(job).add_done_callback(lambda _: self._forget(job))
+
+    def _forget(self, job: Job) -> None:
+        if self._jobs.get(job.id) is job:
+            del self._jobs[job.id]
+
+    def _in_store_thread(self, fn: Callable[..., Any], *args: Any) -> "asyncio.Future":
+        future = asyncio.get_running_loop().run_in_executor(
+            self._store_thread, fn, *args
+        )
+        future.add_done_callback(self._store_done)
+        return future
+
+    @staticmethod
+    def _store_done(future: "asyncio.Future") -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Job store write failed: %s", future.exception())
+
+    def _save(self, job: Job) -> "asyncio.Future":
+        """Save a snapshot of `job` in the store thread, after earlier saves."""
+        return self._in_store_thread(self.store.save, Job(**job.to_dict()))
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                requested = await asyncio.to_thread(self.store.heartbeat, self.owner)
+            except sqlite3.Error:
+                continue  # try again on the next beat
+            for job_id in requested:
+                self.cancel(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                if job.status != QUEUED:  # cancelled while waiting
+                    continue
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        self._wait_seconds.append(job.started_at - job.created_at)
+        self._save(job)
+
+        def report_progress(update: Dict[str, Any]) -> None:
+            job.progress.update(update)
+            self._save(job)
+
+        task = asyncio.create_task(self.handler(job, report_progress))
+        self._running[job.id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            worker = asyncio.current_task()
+            if self._stopping or not task.cancelled() or worker.cancelling():
+                raise  # the worker itself is being shut down
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._finish(job, FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(job, SUCCEEDED, result=result)
+        finally:
+            del self._running[job.id]
+
+    async def stop(self) -> None:
+        """Cancel running jobs, fail queued ones and stop the workers."""
+        self._stopping = True
+        for task in list(self._running.values()):
+            task.cancel()
+        tasks = self._worker_tasks + [self._heartbeat_task]
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*filter(None, tasks), return_exceptions=True)
+        for job in list(self._jobs.values()):
+            if job.status not in FINISHED_STATUSES:
+                self._finish(job, FAILED, error="Interrupted by a server shutdown.")
+        # Wait for every pending save (the thread runs them in order).
+        await self._in_store_thread(lambda: None)
+        await asyncio.sleep(0)  # let the saves' callbacks forget their jobs
+        self._worker_tasks = []
+        self._heartbeat_task = None
+        self._queue = None
+        self._stopping = False
+
+    def stats(self) -> Dict[str, Any]:
+        waits = list(self._wait_seconds)
+        runs = list(self._run_seconds)
+        now = time.time()
+        queued = [j for j in self._jobs.values() if j.status == QUEUED]
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queue_depth": len(queued),
+            "queue_depth_by_priority": {
+                name: sum(1 for j in queued if j.priority == name)
+                for name in PRIORITIES
+            },
+            "running": len(self._running),
+            "oldest_queued_seconds": round(
+                max((now - j.created_at for j in queued), default=0.0), 3
+            ),
+            "wait_seconds": {
+                "p50": round(_percentile(waits, 0.5), 3),
+                "p95": round(_percentile(waits, 0.95), 3),
+                "max": round(max(waits, default=0.0), 3),
+            },
+            "run_seconds": {
+                "p50": round(_percentile(runs, 0.5), 3),
+                "p95": round(_percentile(runs, 0.95), 3),
+            },
+            "counts": dict(self.counts),
+        }
+
+
+def default_job_store() -> JobStore:
+    """
+    Job store configured from the environment.
+
+    VENTUREARCHITECT_JOB_DB: SQLite file for durable jobs; unset keeps jobs
+    in memory.
+    """
+    path = os.getenv("VENTUREARCHITECT_JOB_DB")
+    return SQLiteJobStore(path) if path else InMemoryJobStore()
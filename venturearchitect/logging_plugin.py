@@ -0,0 +1,243 @@
+"""
+ADK plugin that logs runs through the sampled EventLog (see event_log.py).
+
+Drop-in replacement for ADK's LoggingPlugin on the serving path: the same
+callbacks are logged (user message, agents, model requests and responses,
+tools, errors), as structured records that are sampled, truncated and
+written off the event loop.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from .event_log import EventLog, debug_requested, shared_event_log
+
+
+def _text(content: Optional[types.Content]) -> str:
+    parts = content.parts if content else None
+    return "\n".join(p.text for p in parts or [] if getattr(p, "text", None))
+
+
+def _function_calls(content: Optional[types.Content]) -> List[str]:
+    parts = content.parts if content else None
+    return [p.function_call.name for p in parts or [] if p.function_call]
+
+
+class SampledLoggingPlugin(BasePlugin):
+    """
+    Logs every run's summary, and sampled runs (or failing / slow ones, or
+    runs started under event_log.debug_capture()) in detail.
+    """
+
+    def __init__(self, event_log: Optional[EventLog] = None):
+        super().__init__(name="venturearchitect_logging")
+        self.log = event_log or shared_event_log()
+
+    def _start(self, invocation_context: InvocationContext) -> str:
+        run_id = invocation_context.invocation_id
+        self.log.start_run(run_id, debug=debug_requested())
+        return run_id
+
+    async def on_user_message_callback(
+        self, *, invocation_context: InvocationContext, user_message: types.Content
+    ) -> None:
+        run_id = self._start(invocation_context)
+        self.log.record(
+            run_id,
+            "user_message",
+            text=self.log.clip(run_id, _text(user_message)),
+        )
+        return None
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        run_id = self._start(invocation_context)
+        session = invocation_context.session
+        self.log.record(
+            run_id,
+            "run_start",
+            app_name=session.app_name,
+            user_id=session.user_id,
+            session_id=session.id,
+            agent=invocation_context.agent.name,
+        )
+        return None
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        self.log.end_run(
+            invocation_context.invocation_id, agent=invocation_context.agent.name
+        )
+
+    async def on_run_error_callback(
+        self, *, invocation_context: InvocationContext, error: Exception
+    ) -> None:
+        self.log.end_run(
+            invocation_context.invocation_id,
+            error=error,
+            agent=invocation_context.agent.name,
+        )
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        self.log.record(
+            callback_context.invocation_id, "agent_start", agent=agent.name
+        )
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        self.log.record(
+            callback_context.invocation_id, "agent_end", agent=agent.name
+        )
+        return None
+
+    async def on_agent_error_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext, error: Exception
+    ) -> None:
+        self.log.record(
+            callback_context.invocation_id,
+            "agent_error",
+            error=True,
+            agent=agent.name,
+            message=f"{type(error).__name__}: {error}",
+        )
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        run_id = callback_context.invocation_id
+        config = llm_request.config
+        instruction = config.system_instruction if config else None
+        self.log.count(run_id, model_calls=1)
+        self.log.record(
+            run_id,
+            "model_request",
+            agent=callback_context.agent_name,
+            model=llm_request.model,
+            tools=list(llm_request.tools_dict),
+            contents=len(llm_request.contents),
+            system_instruction=self.log.clip(
+                run_id, instruction if isinstance(instruction, str) else None
+            ),
+        )
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        run_id = callback_context.invocation_id
+        if llm_response.partial and not self.log.full(run_id):
+            return None  # streamed chunks are only logged in debug
+        fields: Dict[str, Any] = {
+            "agent": callback_context.agent_name,
+            "partial": bool(llm_response.partial),
+            "text": self.log.clip(run_id, _text(llm_response.content)),
+            "function_calls": _function_calls(llm_response.content),
+        }
+        usage = llm_response.usage_metadata
+        if usage is not None and not llm_response.partial:
+            fields["input_tokens"] = usage.prompt_token_count
+            fields["output_tokens"] = usage.candidates_token_count
+            self.log.count(
+                run_id,
+                input_tokens=usage.prompt_token_count or 0,
+                output_tokens=usage.candidates_token_count or 0,
+            )
+        if llm_response.finish_reason is not None:
+            fields["finish_reason"] = str(llm_response.finish_reason)
+        if llm_response.error_code:
+            fields["error_code"] = llm_response.error_code
+            fields["error_message"] = llm_response.error_message
+        self.log.record(
+            run_id, "model_response", error=bool(llm_response.error_code), **fields
+        )
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> None:
+        self.log.record(
+            callback_context.invocation_id,
+            "model_error",
+            error=True,
+            agent=callback_context.agent_name,
+            model=llm_request.model,
+            message=f"{type(error).__name__}: {error}",
+        )
+        return None
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        run_id = tool_context.invocation_id
+        self.log.count(run_id, tool_calls=1)
+        self.log.record(
+            run_id,
+            "tool_start",
+            agent=tool_context.agent_name,
+            tool=tool.name,
+            call_id=tool_context.function_call_id,
+            args=self.log.clip(run_id, tool_args),
+        )
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+        result: Dict[str, Any],
+    ) -> None:
+        run_id = tool_context.invocation_id
+        self.log.record(
+            run_id,
+            "tool_end",
+            agent=tool_context.agent_name,
+            tool=tool.name,
+            call_id=tool_context.function_call_id,
+            result=self.log.clip(run_id, result),
+        )
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        self.log.record(
+            tool_context.invocation_id,
+            "tool_error",
+            error=True,
+            agent=tool_context.agent_name,
+            tool=tool.name,
+            call_id=tool_context.function_call_id,
+            message=f"{type(error).__name__}: {error}",
+        )
+        return None
+
+    async def close(self) -> None:
+        # The EventLog is shared by every runner: flush it, keep it open.
+        await asyncio.to_thread(self.log.writer.flush)
@@ -0,0 +1,456 @@
+"""
+Orchestrated multi-agent pipeline for VentureArchitect.
+
+Instead of one monolithic agent doing everything in a single turn, the
+specialist agents run as a dependency graph:
+
+    discovery -> research | strategy | financial (concurrently) -> narrative
+              -> evaluation (optional)
+
+Each stage runs as its own ADK invocation with a prompt built from the
+original idea plus the outputs of the stages it depends on, so independent
+stages can run at the same time and end-to-end latency approaches the
+critical path instead of the sum of all steps.
+"""
+
+import asyncio
+import inspect
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+from .agents.discovery_agent import discovery_agent
+from .agents.evaluation_agent import evaluation_agent
+from .agents.financial_agent import financial_agent
+from .agents.narrative_agent import (
+    NARRATIVE_SECTIONS,
+    narrative_agent,
+    narrative_section_agent,
+)
+from .agents.research_agent import research_agent
+from .agents.strategy_agent import strategy_agent
+from .search_cache import search_ttl_seconds, web_search
+from .stage_cache import StageCache, stage_key
+from .tracing import tracing_plugins
+
+if TYPE_CHECKING:
+    from .compaction import ContextCompactor
+
+APP_NAME = "venturearchitect_pipeline"
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """
+    One node of the pipeline graph.
+
+    `max_age_seconds` bounds how long a cached output is reused; None
+    derives it from the agent (see stage_max_age()).
+    """
+
+    name: str
+    agent: BaseAgent
+    depends_on: Tuple[str, ...] = ()
+    max_age_seconds: Optional[float] = None
+
+
+def _searches_the_web(agent: BaseAgent) -> bool:
+    for tool in getattr(agent, "tools", None) or []:
+        if getattr(tool, "func", tool) is web_search:
+            return True
+    nested = list(agent.sub_agents)
+    section_agent = getattr(agent, "section_agent", None)
+    if isinstance(section_agent, BaseAgent):
+        nested.append(section_agent)
+    return any(_searches_the_web(sub_agent) for sub_agent in nested)
+
+
+def stage_max_age(stage: PipelineStage) -> Optional[float]:
+    """
+    How long a cached output of `stage` may be reused: its max_age_seconds,
+    else the search cache's TTL if its agent uses web_search (the output is
+    built from search results that go stale), else no limit.
+    """
+    if stage.max_age_seconds is not None:
+        return stage.max_age_seconds
+    return search_ttl_seconds() if _searches_the_web(stage.agent) else None
+
+
+@dataclass
+class StageResult:
+    """Output and wall-clock timing of one completed stage."""
+
+    name: str
+    output: str
+    started_at: float  # seconds since the pipeline started
+    seconds: float
+    cached: bool = False
+    # Compaction report (raw_tokens, prompt_tokens, tokens_saved, ...), if any
+    context: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class PipelineResult:
+    plan: str
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    def timings(self) -> Dict[str, Any]:
+        """JSON-friendly per-stage timing (and context compaction) report."""
+        report: Dict[str, Any] = {
+            "total_seconds": round(self.total_seconds, 3),
+            "stages": {},
+        }
+        tokens_saved = None
+        for name, result in self.stages.items():
+            stage = {
+                "started_at": round(result.started_at, 3),
+                "seconds": round(result.seconds, 3),
+                "cached": result.cached,
+            }
+            if result.context is not None:
+                stage["context"] = result.context
+                tokens_saved = (tokens_saved or 0) + result.context["tokens_saved"]
+            report["stages"][name] = stage
+        if tokens_saved is not None:
+            report["tokens_saved"] = tokens_saved
+        return report
+
+
+StageCallback = Callable[[StageResult], Union[None, Awaitable[None]]]
+
+
+async def run_agent_text(
+    runner: Runner, prompt: str, user_id: str, session_id: str
+) -> str:
+    """
+    Run one agent invocation in a throwaway session and return its final text.
+
+    The session is created on the runner's own session service and deleted
+    afterwards, so repeated stage runs do not accumulate state.
+    """
+    session_service = runner.session_service
+    await session_service.create_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session_id
+    )
+    content = types.Content(role="user", parts=[types.Part(text=prompt)])
+    final_chunks: List[str] = []
+    try:
+        async for event in runner.run_async(
+            user_id=user_id, session_id=session_id, new_message=content
+        ):
+            if event.is_final_response() and event.content:
+                for part in event.content.parts or []:
+                    if getattr(part, "text", None):
+                        final_chunks.append(part.text)
+    finally:
+        await session_service.delete_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+    return "\n".join(final_chunks)
+
+
+def build_stage_prompt(
+    idea: str, stage: PipelineStage, outputs: Dict[str, str]
+) -> str:
+    """Compose a stage's input from the raw idea and its dependencies' outputs."""
+    sections = [f"Business idea:\n{idea}"]
+    for dep in stage.depends_on:
+        sections.append(f"## Output of the {dep} stage\n{outputs[dep]}")
+    return "\n\n".join(sections)
+
+
+class SectionedNarrativeAgent(BaseAgent):
+    """
+    Narrative stage that writes plan sections concurrently.
+
+    Every body section is generated in parallel from the same stage inputs;
+    the Executive Summary is written last from the finished sections, and
+    everything is stitched in NARRATIVE_SECTIONS order under uniform "##"
+    headings. A section that fails or comes back empty is retried on its
+    own (up to max_attempts) instead of regenerating the whole plan.
+    """
+
+    section_agent: BaseAgent
+    sections: Tuple[str, ...] = NARRATIVE_SECTIONS
+    summary_section: str = "Executive Summary"
+    max_attempts: int = 3
+    section_runner: Optional[Any] = None  # Runner, built on first use
+
+    def _get_runner(self) -> Runner:
+        if self.section_runner is None:
+            self.section_runner = Runner(
+                agent=self.section_agent,
+                app_name=f"{APP_NAME}_sections",
+                session_service=InMemorySessionService(),
+                plugins=tracing_plugins(),
+            )
+        return self.section_runner
+
+    async def _write_section(
+        self, section: str, context: str, user_id: str, run_id: str
+    ) -> Tuple[str, Dict[str, Any]]:
+        runner = self._get_runner()
+        prompt = f"Section to write: {section}\n\n{context}"
+        start = time.perf_counter()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                text = await run_agent_text(
+                    runner, prompt, user_id, f"{run_id}_{attempt}_{_slug(section)}"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                continue
+            body = _strip_heading(text, section)
+            if body:
+                return body, {
+                    "attempts": attempt,
+                    "seconds": round(time.perf_counter() - start, 3),
+                }
+        raise RuntimeError(
+            f"Section {section!r} came back empty after {self.max_attempts} attempts"
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        parts = ctx.user_content.parts if ctx.user_content else None
+        context = "\n".join(p.text for p in parts or [] if getattr(p, "text", None))
+        user_id = ctx.session.user_id
+        run_id = uuid.uuid4().hex
+
+        body_sections = [s for s in self.sections if s != self.summary_section]
+        written = await asyncio.gather(
+            *(
+                self._write_section(section, context, user_id, run_id)
+                for section in body_sections
+            )
+        )
+        bodies = {section: text for section, (text, _) in zip(body_sections, written)}
+        report = {section: info for section, (_, info) in zip(body_sections, written)}
+
+        if self.summary_section in self.sections:
+            finished = "\n\n".join(
+                f"## {section}\n\n{bodies[section]}" for section in body_sections
+            )
+            summary, info = await self._write_section(
+                self.summary_section,
+                f"{context}\n\n## Finished sections of the plan\n\n{finished}",
+                user_id,
+                run_id,
+            )
+            bodies[self.summary_section] = summary
+            report[self.summary_section] = info
+
+        plan = "\n\n".join(
+            f"## {section}\n\n{bodies[section]}" for section in self.sections
+        )
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=plan)]),
+            custom_metadata={"sections": report},
+        )
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _strip_heading(text: str, section: str) -> str:
+    """Drop a leading heading that repeats the section name, for uniform stitching."""
+    text = text.strip()
+    first_line, _, rest = text.partition("\n")
+    heading = first_line.strip().lstrip("#").strip().strip("*").strip()
+    if first_line.lstrip().startswith(("#", "**")) and _slug(section) in _slug(heading):
+        return rest.strip()
+    return text
+
+
+sectioned_narrative_agent = SectionedNarrativeAgent(
+    name="sectioned_narrative_agent",
+    description="Writes plan sections concurrently and stitches them in order.",
+    section_agent=narrative_section_agent,
+)
+
+
+# Research, strategy and financial only need the discovery profile, so they
+# run side by side; narrative waits for all of them.
+DEFAULT_STAGES: Tuple[PipelineStage, ...] = (
+    PipelineStage("discovery", discovery_agent),
+    PipelineStage("research", research_agent, ("discovery",)),
+    PipelineStage("strategy", strategy_agent, ("discovery",)),
+    PipelineStage("financial", financial_agent, ("discovery",)),
+    PipelineStage(
+        "narrative",
+        narrative_agent,
+        ("discovery", "research", "strategy", "financial"),
+    ),
+)
+
+# Same graph, but the narrative is generated section by section in parallel.
+SECTIONED_STAGES: Tuple[PipelineStage, ...] = DEFAULT_STAGES[:-1] + (
+    PipelineStage(
+        "narrative",
+        sectioned_narrative_agent,
+        ("discovery", "research", "strategy", "financial"),
+    ),
+)
+
+# Scores and critiques the finished plan; appended to either graph by
+# PipelineAgent unless VENTUREARCHITECT_EVALUATE=0 (see evaluation_enabled()).
+EVALUATION_STAGE = PipelineStage("evaluation", evaluation_agent, ("narrative",))
+
+
+def evaluation_enabled() -> bool:
+    """Whether pipelines end with EVALUATION_STAGE (VENTUREARCHITECT_EVALUATE)."""
+    return os.getenv("VENTUREARCHITECT_EVALUATE", "1") != "0"
+
+
+class PlanPipeline:
+    """
+    Runs pipeline stages as a dependency graph with per-stage timing.
+
+    Every stage gets its own short-lived session, which is deleted once the
+    stage finishes. With a StageCache, stages whose idea, agent and inputs
+    are unchanged are served from the cache instead of being rerun. With a
+    ContextCompactor, stages get compacted digests of their inputs instead
+    of the full upstream outputs.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[PipelineStage] = DEFAULT_STAGES,
+        session_service: Optional[BaseSessionService] = None,
+        plugins: Optional[List[BasePlugin]] = None,
+        final_stage: Optional[str] = None,
+        cache: Optional[StageCache] = None,
+        compactor: Optional["ContextCompactor"] = None,
+    ):
+        self.cache = cache
+        self.compactor = compactor
+        self.stages: Dict[str, PipelineStage] = {}
+        for stage in stages:
+            missing = [d for d in stage.depends_on if d not in self.stages]
+            if missing:
+                raise ValueError(
+                    f"Stage {stage.name!r} depends on unknown or later "
+                    f"stages: {missing}"
+                )
+            self.stages[stage.name] = stage
+        self.final_stage = final_stage or "narrative"
+        if self.final_stage not in self.stages:
+            raise ValueError(f"Unknown final stage: {self.final_stage!r}")
+
+        self.session_service = session_service or InMemorySessionService()
+        self._runners: Dict[str, Runner] = {
+            name: Runner(
+                agent=stage.agent,
+                app_name=APP_NAME,
+                session_service=self.session_service,
+                plugins=list(plugins or []),
+            )
+            for name, stage in self.stages.items()
+        }
+
+    async def run(
+        self,
+        idea: str,
+        user_id: str = "pipeline_user",
+        on_stage_complete: Optional[StageCallback] = None,
+    ) -> PipelineResult:
+        """
+        Run every stage, starting each one as soon as its dependencies finish.
+
+        Args:
+            idea: the user's business idea.
+            user_id: ADK user id for the per-stage sessions.
+            on_stage_complete: optional (sync or async) callback invoked with
+              each StageResult as soon as that stage finishes.
+
+        Returns:
+            PipelineResult with the final stage's output as the plan.
+        """
+        run_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        tasks: Dict[str, "asyncio.Task[StageResult]"] = {}
+
+        async def run_stage(stage: PipelineStage) -> StageResult:
+            deps = await asyncio.gather(*(tasks[d] for d in stage.depends_on))
+            outputs = {result.name: result.output for result in deps}
+            started_at = time.perf_counter() - start
+            inputs, context = outputs, None
+            if self.compactor is not None and stage.depends_on:
+                inputs, context = self.compactor.compact_inputs(stage, outputs)
+            key = output = None
+            if self.cache is not None:
+                key = stage_key(idea, stage.name, stage.agent, inputs)
+                output = await self.cache.aget(key, stage_max_age(stage))
+            cached = output is not None
+            if not cached:
+                output = await run_agent_text(
+                    self._runners[stage.name],
+                    build_stage_prompt(idea, stage, inputs),
+                    user_id,
+                    f"{run_id}_{stage.name}",
+                )
+                if key is not None:
+                    await self.cache.aput(key, stage.name, output)
+            result = StageResult(
+                name=stage.name,
+                output=output,
+                started_at=started_at,
+                seconds=time.perf_counter() - start - started_at,
+                cached=cached,
+                context=context,
+            )
+            if on_stage_complete is not None:
+                maybe_awaitable = on_stage_complete(result)
+                if inspect.isawaitable(maybe_awaitable):
+                    await maybe_awaitable
+            return result
+
+        # Stages are declared in dependency order, so every dependency task
+        # exists before the stage that awaits it is scheduled.
+        for name, stage in self.stages.items():
+            tasks[name] = asyncio.create_task(run_stage(stage), name=f"stage:{name}")
+
+        try:
+            results = await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        stages = {result.name: result for result in results}
+        return PipelineResult(
+            plan=stages[self.final_stage].output,
+            stages=stages,
+            total_seconds=time.perf_counter() - start,
+        )
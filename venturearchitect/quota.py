@@ -0,0 +1,361 @@
+"""
+Client-side pacing of Gemini calls to stay under the API key's quotas.
+
+Every agent shares one API key, whose quota is counted per model in
+requests per minute (RPM) and input tokens per minute (TPM). Without
+pacing we only learn about the limit from 429s and pay for it in retry
+backoff. The RateLimiter keeps each model tier's calls just under its
+quota instead:
+
+- one Budget per tier (RPM and TPM, scaled by a headroom factor), kept as
+  two token buckets that are drawn from together,
+- callers that have to wait queue first-come first-served per tier
+  instead of failing,
+- a call is charged an estimate of its input tokens up front; settle()
+  corrects the charge once the response reports the real count,
+- the bucket state lives in a QuotaStore: in memory for one process, or in
+  a SQLite file that every worker process on the host shares.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Bucket state: (requests available, tokens available, last refill time).
+_State = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    Requests and input tokens per minute allowed for one model tier.
+
+    A limit of 0 is not enforced. Buckets hold `burst_seconds` worth of the
+    per-minute limits, so an idle tier can briefly go faster than average.
+    """
+
+    name: str
+    rpm: float
+    tpm: float
+    burst_seconds: float = 10.0
+
+    def capacity(self) -> Tuple[float, float]:
+        share = self.burst_seconds / 60.0
+        return max(1.0, self.rpm * share), max(1.0, self.tpm * share)
+
+
+def _refill(budget: Budget, state: Optional[_State], now: float) -> _State:
+    max_requests, max_tokens = budget.capacity()
+    if state is None:
+        return max_requests, max_tokens, now
+    requests, tokens, updated = state
+    elapsed = max(0.0, now - updated)
+    return (
+        min(max_requests, requests + elapsed * budget.rpm / 60.0),
+        min(max_tokens, tokens + elapsed * budget.tpm / 60.0),
+        now,
+    )
+
+
+def _take(
+    budget: Budget, state: Optional[_State], tokens: float, now: float
+) -> Tuple[_State, float]:
+    """
+    Draw one request and `tokens` from the refilled state.
+
+    Returns:
+        (new state, 0.0) on success, else (state, seconds to wait).
+    """
+    requests, available, now = _refill(budget, state, now)
+    # A call larger than the bucket waits for a full bucket instead of forever.
+    tokens = min(tokens, budget.capacity()[1])
+    wait = 0.0
+    if budget.rpm > 0 and requests < 1:
+        wait = (1 - requests) * 60.0 / budget.rpm
+    if budget.tpm > 0 and available < tokens:
+        wait = max(wait, (tokens - available) * 60.0 / budget.tpm)
+    if wait:
+        return (requests, available, now), wait
+    return (requests - 1, available - tokens, now), 0.0
+
+
+class QuotaStore(ABC):
+    """Interface for where bucket state lives."""
+
+    # Whether calls block on I/O (and should run off the event loop).
+    blocking = False
+
+    @abstractmethod
+    def try_acquire(self, budget: Budget, tokens: float) -> float:
+        """Take a request and `tokens`; 0.0 on success, else seconds to wait."""
+
+    @abstractmethod
+    def adjust(self, budget: Budget, tokens: float) -> None:
+        """Charge `tokens` more (or refund, if negative) to the budget."""
+
+
+class InMemoryQuotaStore(QuotaStore):
+    """Buckets of this process only."""
+
+    def __init__(self):
+        self._states: Dict[str, _State] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, budget: Budget, tokens: float) -> float:
+        with self._lock:
+            state, wait = _take(
+                budget, self._states.get(budget.name), tokens, time.monotonic()
+            )
+            self._states[budget.name] = state
+            return wait
+
+    def adjust(self, budget: Budget, tokens: float) -> None:
+        with self._lock:
+            requests, available, now = _refill(
+                budget, self._states.get(budget.name), time.monotonic()
+            )
+            self._states[budget.name] = (requests, available - tokens, now)
+
+
+class SQLiteQuotaStore(QuotaStore):
+    """
+    Buckets in a SQLite file, shared by every process that opens it.
+
+    Each draw is one short IMMEDIATE transaction, so concurrent processes
+    see each other's usage.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota ("
+                " name TEXT PRIMARY KEY, requests REAL NOT NULL,"
+                " tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _update(self, budget: Budget, change) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT requests, tokens, updated FROM quota WHERE name = ?",
+                    (budget.name,),
+                ).fetchone()
+                # Wall-clock time: the state is shared between processes.
+                state, result = change(tuple(row) if row else None, time.time())
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO quota (name, requests, tokens, updated)"
+                    " VALUES (?, ?, ?, ?)",
+                    (budget.name, *state),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def try_acquire(self, budget: Budget, tokens: float) -> float:
+        return self._update(
+            budget, lambda state, now: _take(budget, state, tokens, now)
+        )
+
+    def adjust(self, budget: Budget, tokens: float) -> None:
+        def change(state: Optional[_State], now: float) -> Tuple[_State, None]:
+            requests, available, now = _refill(budget, state, now)
+            return (requests, available - tokens, now), None
+
+        self._update(budget, change)
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class RateLimiter:
+    """
+    Paces calls per budget (model tier); waiting callers are served in order.
+
+    Args:
+        budgets: known budgets by name.
+        default: limits for budgets not in `budgets` (e.g. a literal model
+            name), renamed to the requested name.
+        store: bucket state (default in memory).
+        enabled: False lets every call through (and only counts it).
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, Budget],
+        default: Budget,
+        store: Optional[QuotaStore] = None,
+        enabled: bool = True,
+    ):
+        self.budgets = dict(budgets)
+        self.default = default
+        self.store = store or InMemoryQuotaStore()
+        self.enabled = enabled
+        # One FIFO lock per budget and event loop (asyncio locks are per loop).
+        self._locks: "weakref.WeakKeyDictionary[Any, Dict[str, asyncio.Lock]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._waiting: Dict[str, int] = {}
+        self._wait_seconds: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, float]] = {}
+
+    def budget(self, name: str) -> Budget:
+        budget = self.budgets.get(name)
+        if budget is None:
+            budget = self.budgets[name] = replace(self.default, name=name)
+        return budget
+
+    def _lock(self, name: str) -> asyncio.Lock:
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(name)
+        if lock is None:
+            lock = locks[name] = asyncio.Lock()
+        return lock
+
+    def _count(self, name: str) -> Dict[str, float]:
+        counts = self._counts.get(name)
+        if counts is None:
+            counts = self._counts[name] = {
+                "requests": 0,
+                "waited": 0,
+                "tokens_estimated": 0,
+                "tokens_actual": 0,
+            }
+        return counts
+
+    async def _try_acquire(self, budget: Budget, tokens: float) -> float:
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.try_acquire, budget, tokens)
+        return self.store.try_acquire(budget, tokens)
+
+    async def acquire(self, name: str, tokens: float) -> float:
+        """
+        Wait until budget `name` allows one more call of `tokens` input tokens.
+
+        Returns:
+            seconds spent waiting.
+        """
+        counts = self._count(name)
+        counts["requests"] += 1
+        counts["tokens_estimated"] += tokens
+        if not self.enabled:
+            return 0.0
+        budget = self.budget(name)
+        started = time.monotonic()
+        self._waiting[name] = self._waiting.get(name, 0) + 1
+        try:
+            # Holding the lock while sleeping keeps later callers behind.
+            async with self._lock(name):
+                wait = await self._try_acquire(budget, tokens)
+                while wait:
+                    await asyncio.sleep(wait)
+                    wait = await self._try_acquire(budget, tokens)
+        finally:
+            self._waiting[name] -= 1
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            counts["waited"] += 1
+        self._wait_seconds.setdefault(name, deque(maxlen=1000)).append(waited)
+        return waited
+
+    def settle(self, name: str, estimated: float, actual: float) -> None:
+        """Correct a call's token charge once its real input size is known."""
+        self._count(name)["tokens_actual"] += actual
+        if self.enabled and actual != estimated:
+            self.store.adjust(self.budget(name), actual - estimated)
+
+    def stats(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {
+            "enabled": self.enabled,
+            "store": type(self.store).__name__,
+        }
+        for name, counts in self._counts.items():
+            budget = self.budget(name)
+            waits = list(self._wait_seconds.get(name, ()))
+            report[name] = {
+                "rpm": budget.rpm,
+                "tpm": budget.tpm,
+                "waiting": self._waiting.get(name, 0),
+                "wait_seconds": {
+                    "p50": round(_percentile(waits, 0.5), 3),
+                    "p95": round(_percentile(waits, 0.95), 3),
+                    "max": round(max(waits, default=0.0), 3),
+                },
+                "counts": {key: round(value) for key, value in counts.items()},
+            }
+        return report
+
+
+def estimate_tokens(characters: int) -> int:
+    """Rough input token count of `characters` of text (~4 per token)."""
+    return characters // 4 + 1
+
+
+# Published per-model quotas of a paid (tier 1) key for the default models.
+DEFAULT_QUOTAS: Dict[str, Tuple[float, float]] = {
+    "lite": (4000, 4_000_000),
+    "standard": (1000, 1_000_000),
+}
+
+
+def default_rate_limiter() -> RateLimiter:
+    """
+    RateLimiter configured from the environment.
+
+    - VENTUREARCHITECT_RPM_<TIER> / VENTUREARCHITECT_TPM_<TIER>, e.g.
+      VENTUREARCHITECT_RPM_LITE: the key's quota per tier ("0": unlimited);
+      other budgets use the standard tier's limits,
+    - VENTUREARCHITECT_QUOTA_HEADROOM: fraction of the quota to use (0.9),
+    - VENTUREARCHITECT_QUOTA_DB: SQLite file shared by worker processes;
+      unset keeps the buckets in this process,
+    - VENTUREARCHITECT_RATE_LIMIT=0: no pacing.
+    """
+    headroom = float(os.getenv("VENTUREARCHITECT_QUOTA_HEADROOM", "0.9"))
+    budgets = {}
+    for tier, (rpm, tpm) in DEFAULT_QUOTAS.items():
+        suffix = tier.upper()
+        budgets[tier] = Budget(
+            tier,
+            rpm=float(os.getenv(f"VENTUREARCHITECT_RPM_{suffix}", rpm)) * headroom,
+            tpm=float(os.getenv(f"VENTUREARCHITECT_TPM_{suffix}", tpm)) * headroom,
+        )
+    path = os.getenv("VENTUREARCHITECT_QUOTA_DB")
+    return RateLimiter(
+        budgets,
+        default=budgets["standard"],
+        store=SQLiteQuotaStore(path) if path else None,
+        enabled=os.getenv("VENTUREARCHITECT_RATE_LIMIT", "1") != "0",
+    )
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def shared_rate_limiter() -> RateLimiter:
+    """The process-wide RateLimiter, built on first use."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = default_rate_limiter()
+    return _rate_limiter
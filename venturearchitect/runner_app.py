@@ -1,14 +1,12 @@
+import argparse
 import asyncio
 import os
+import uuid
 
 from dotenv import load_dotenv
 
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.plugins.logging_plugin import LoggingPlugin
-from google.genai import types
-
-from venturearchitect.agents.root_agent import venture_architect_root_agent
+# google.adk and the agents are imported by _build_runner(), in a background
+# thread while the user is typing their idea.
 
 # Load environment variables from .env
 load_dotenv()
@@ -17,7 +15,34 @@ load_dotenv()
 APP_NAME = "agents"
 
 
-async def main() -> None:
+def _build_runner(mode: str):
+    from venturearchitect.runners import build_runner, warm_up_agent
+    from venturearchitect.sessions import default_session_service
+
+    # In memory by default; VENTUREARCHITECT_SESSION_DB keeps runs on disk.
+    # A CLI process runs one generation, so there is nothing to coalesce.
+    runner = build_runner(mode, default_session_service(), app_name=APP_NAME)
+    # Model clients are cached per event loop, so the run builds its own;
+    # this still pays their imports here rather than after the prompt.
+    warm_up_agent(runner.agent)
+    return runner
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="VentureArchitect CLI")
+    parser.add_argument(
+        "--mode",
+        choices=["single", "pipeline", "sections"],
+        default="single",
+        help=(
+            "single: monolithic root agent; pipeline: parallel specialist agents; "
+            "sections: pipeline with section-parallel narrative"
+        ),
+    )
+    return parser.parse_args()
+
+
+async def main(mode: str = "single") -> None:
     print("VentureArchitect – Business Plan Copilot")
     print("Describe your business idea in as much detail as you like.")
     print("You can paste a long, formal description (multiple paragraphs are welcome).\n")
@@ -32,54 +57,59 @@ async def main() -> None:
             "or export it in your environment."
         )
 
+    # Imports and builds the agent while the user is typing.
+    runner_future = asyncio.get_running_loop().run_in_executor(
+        None, _build_runner, mode
+    )
+
     user_idea = input("Enter a brief description of your business idea:\n> ").strip()
     if not user_idea:
         print("No idea entered. Exiting.")
         return
 
     # ---- Session + Runner setup ----
-    session_service = InMemorySessionService()
+    runner = await runner_future
+    from google.genai import types
 
     user_id = "cli_user"
-    session_id = "cli_session"
+    session_id = f"cli_session_{uuid.uuid4().hex}"
 
     # CRITICAL: create the session BEFORE running the agent
-    await session_service.create_session(
+    await runner.session_service.create_session(
         app_name=APP_NAME,
         user_id=user_id,
         session_id=session_id,
     )
 
     # Optional: sanity check where the agent lives
-    print(f"\nRoot agent module: {venture_architect_root_agent.__module__}")
-    print(f"Using app_name: {APP_NAME}")
+    print(f"\nRoot agent module: {runner.agent.__module__}")
+    print(f"Using app_name: {APP_NAME} (mode: {mode})")
     print("\nGenerating your business plan (this may take a bit)...\n")
 
-    # Create a Runner for the root agent
-    runner = Runner(
-        agent=venture_architect_root_agent,
-        app_name=APP_NAME,
-        session_service=session_service,
-        plugins=[LoggingPlugin()],
-    )
-
     # Build the Content object for the user message
     new_message = types.Content(parts=[types.Part(text=user_idea)])
 
     final_text_chunks: list[str] = []
-
-    # Stream all events from the agent run
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=new_message,
-    ):
-        # LoggingPlugin already shows internal logs.
-        # Here we only care about the FINAL response from the root agent.
-        if event.is_final_response() and event.content:
-            for part in event.content.parts:
-                if hasattr(part, "text") and part.text:
-                    final_text_chunks.append(part.text)
+    stage_timings = None
+
+    # Stream all events from the agent run; the runner is closed (flushing
+    # sessions and plugins) even if the run fails.
+    try:
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=new_message,
+        ):
+            # The logging plugin already logs internal events.
+            # Here we only care about the FINAL response from the root agent.
+            if event.custom_metadata and "pipeline" in event.custom_metadata:
+                stage_timings = event.custom_metadata["pipeline"]
+            if event.is_final_response() and event.content:
+                for part in event.content.parts:
+                    if hasattr(part, "text") and part.text:
+                        final_text_chunks.append(part.text)
+    finally:
+        await runner.close()
 
     print("\n === GENERATED OUTPUT FROM ROOT AGENT ===\n")
     if final_text_chunks:
@@ -87,6 +117,24 @@ async def main() -> None:
     else:
         print("No final response content was produced. Check logs above for details.")
 
+    if stage_timings:
+        print("\n === STAGE TIMINGS ===\n")
+        for name, timing in stage_timings["stages"].items():
+            context = timing.get("context")
+            print(
+                f"{name:<12} start +{timing['started_at']:.1f}s  "
+                f"took {timing['seconds']:.1f}s"
+                + (
+                    f"  context ~{context['context_tokens']} tokens "
+                    f"(saved ~{context['tokens_saved']})"
+                    if context
+                    else ""
+                )
+            )
+        print(f"{'total':<12} {stage_timings['total_seconds']:.1f}s")
+        if "tokens_saved" in stage_timings:
+            print(f"Context compaction saved ~{stage_timings['tokens_saved']} tokens")
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args().mode))
@@ -0,0 +1,218 @@
+"""
+ADK runners for the VentureArchitect entry points, built on first use.
+
+Importing google.adk, the agents and their Gemini models takes about a
+second, which every CLI invocation and every server process used to pay at
+import time. Entry points import this module only when they need a run:
+
+- build_runner(): the agent for a mode and its Runner, built on first use,
+- warm_up_agent(): builds an agent's pipeline and model API clients ahead
+  of time (for a server's startup), so the first request does not,
+- CoalescingRunner: a Runner whose identical fresh runs share one agent
+  run (see coalescing.py).
+"""
+
+import importlib
+import os
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.events import Event
+from google.adk.models.google_llm import Gemini
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.plugins.logging_plugin import LoggingPlugin
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService
+from google.genai import types
+
+from .coalescing import SingleFlight, coalesce_key, default_single_flight
+from .event_log import debug_requested
+from .logging_plugin import SampledLoggingPlugin
+from .tracing import tracing_plugins
+
+# Agent behind each run mode, as (module, attribute): modules are imported,
+# and their agents built, only when a mode is first used.
+AGENTS: Dict[str, Tuple[str, str]] = {
+    "single": (
+        "venturearchitect.agents.root_agent",
+        "venture_architect_root_agent",
+    ),
+    "pipeline": (
+        "venturearchitect.agents.pipeline_agent",
+        "venture_architect_pipeline_agent",
+    ),
+    "sections": (
+        "venturearchitect.agents.pipeline_agent",
+        "venture_architect_sectioned_pipeline_agent",
+    ),
+}
+
+
+def load_agent(mode: str) -> BaseAgent:
+    """The agent for a run mode ("single", "pipeline" or "sections")."""
+    module, name = AGENTS[mode]
+    return getattr(importlib.import_module(module), name)
+
+
+def default_plugins() -> List[BasePlugin]:
+    """
+    Run logging, plus TracingPlugin when VENTUREARCHITECT_TRACING is set.
+
+    VENTUREARCHITECT_EVENT_LOG picks the logging: "sampled" (default,
+    SampledLoggingPlugin), "adk" (ADK's LoggingPlugin, every callback in
+    full) or "0" (none).
+    """
+    event_log = os.getenv("VENTUREARCHITECT_EVENT_LOG", "sampled")
+    plugins: List[BasePlugin] = []
+    if event_log == "adk":
+        plugins.append(LoggingPlugin())
+    elif event_log != "0":
+        plugins.append(SampledLoggingPlugin())
+    return [*plugins, *tracing_plugins()]
+
+
+def build_runner(
+    mode: str,
+    session_service: BaseSessionService,
+    app_name: str = "agents",
+    plugins: Optional[List[BasePlugin]] = None,
+) -> Runner:
+    """Runner for a mode's agent (with default_plugins() unless plugins given)."""
+    return Runner(
+        agent=load_agent(mode),
+        app_name=app_name,
+        session_service=session_service,
+        plugins=default_plugins() if plugins is None else plugins,
+    )
+
+
+def iter_agents(agent: BaseAgent) -> Iterator[BaseAgent]:
+    """An agent and every agent it runs (sub-agents, pipeline stages)."""
+    yield agent
+    build_pipeline = getattr(agent, "build_pipeline", None)
+    if build_pipeline is not None:
+        for stage in build_pipeline().stages.values():
+            yield from iter_agents(stage.agent)
+    section_agent = getattr(agent, "section_agent", None)
+    if isinstance(section_agent, BaseAgent):
+        yield from iter_agents(section_agent)
+    for sub_agent in agent.sub_agents:
+        yield from iter_agents(sub_agent)
+
+
+def warm_up_agent(agent: BaseAgent) -> Dict[str, int]:
+    """
+    Build everything an agent needs before its first run.
+
+    Returns:
+        counts of agents visited, model API clients created and model
+        clients that could not be created (e.g. no API key yet; those are
+        created on first use instead).
+    """
+    counts = {"agents": 0, "model_clients": 0, "model_client_errors": 0}
+    seen = set()
+    for sub_agent in iter_agents(agent):
+        if id(sub_agent) in seen:
+            continue
+        seen.add(id(sub_agent))
+        counts["agents"] += 1
+        model = sub_agent.model if isinstance(sub_agent, LlmAgent) else None
+        if isinstance(model, Gemini):
+            try:
+                model.api_client  # cached on the model instance
+            except ValueError:
+                counts["model_client_errors"] += 1
+            else:
+                counts["model_clients"] += 1
+    return counts
+
+
+class CoalescingRunner(Runner):
+    """
+    Runner whose identical fresh runs share one agent run.
+
+    A run is coalesced when it starts a new session with a text message and
+    no extra options: every caller gets the events of the first caller's
+    run, and the user message and final events are also recorded in each
+    follower's own session so later turns see the same history. Other runs
+    (follow-up turns, resumed invocations) go through unchanged.
+    """
+
+    def __init__(self, *args: Any, flights: Optional[SingleFlight] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flights = flights or default_single_flight()
+
+    async def run_async(
+        self,
+        *,
+        user_id: str,
+        session_id: str,
+        new_message: Optional[types.Content] = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Event, None]:
+        text = "".join(
+            part.text or "" for part in (new_message.parts if new_message else [])
+        )
+        session = None
+        coalescable = text.strip() and not any(
+            kwargs.get(name) is not None
+            for name in ("invocation_id", "state_delta", "abort_signal")
+        )
+        if coalescable and not kwargs.get("yield_user_message"):
+            session = await self.session_service.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+        if session is None or session.events:
+            async with aclosing(
+                super().run_async(
+                    user_id=user_id,
+                    session_id=session_id,
+                    new_message=new_message,
+                    **kwargs,
+                )
+            ) as events:
+                async for event in events:
+                    yield event
+            return
+
+        run_config = kwargs.get("run_config")
+        key = coalesce_key(
+            text,
+            app=self.app_name,
+            streaming=str(run_config.streaming_mode) if run_config else None,
+            # A debug run is logged in full, so it is not shared.
+            debug=debug_requested(),
+        )
+        shared = self.flights.in_flight(key)
+
+        def leader_events() -> AsyncIterator[Event]:
+            return super(CoalescingRunner, self).run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=new_message,
+                **kwargs,
+            )
+
+        async with aclosing(self.flights.stream(key, leader_events)) as events:
+            if shared:
+                # Record the turn in this caller's own session as well.
+                await self.session_service.append_event(
+                    session,
+                    Event(invocation_id="", author="user", content=new_message),
+                )
+            async for event in events:
+                if shared and not event.partial:
+                    await self.session_service.append_event(
+                        session, event.model_copy(deep=True)
+                    )
+                yield event
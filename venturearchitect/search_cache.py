@@ -0,0 +1,322 @@
+"""
+Persistent TTL cache for web search results.
+
+The built-in `google_search` tool is grounding that runs inside the model
+call, so its results cannot be reused. `web_search` instead performs the
+grounded search as a separate, cacheable step:
+
+- queries are normalized (case, punctuation, whitespace) into cache keys,
+- results are stored in the two-tier StageCache store (memory + disk),
+- fresh entries (younger than `ttl_seconds`) are returned directly,
+- stale entries (within `stale_seconds` after that) are returned
+  immediately while a background refresh fetches a new copy,
+- identical concurrent misses share a single backend call, which runs in
+  a task owned by the cache: a caller that goes away (e.g. a client that
+  disconnects) stops waiting for it without failing the other callers,
+- a search that still fails after its retries is returned to the model as
+  an error result, like a failed built-in search, instead of ending the run.
+
+Backends are pluggable: GeminiSearchBackend does the real grounded search,
+LocalSearchBackend is an offline stand-in for tests and local development.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from contextlib import aclosing
+from typing import Any, Dict, Optional
+
+from google import genai
+from google.genai import types
+
+from . import deadlines
+from .agents.config import (
+    DEFAULT_GEMINI_MODEL,
+    RETRY_POLICIES,
+    is_retryable,
+    quota_budget,
+)
+from .http_pool import http_clients, pooling_enabled
+from .quota import estimate_tokens, shared_rate_limiter
+from .stage_cache import StageCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_CACHE_DIR = os.path.join(
+    os.getcwd(), ".venturearchitect_cache", "search"
+)
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and drop punctuation and extra whitespace, keeping word order."""
+    return " ".join(re.findall(r"\w+", query.casefold()))
+
+
+class GeminiSearchBackend:
+    """
+    Runs a Google-Search-grounded Gemini call and returns summary + sources.
+
+    Like the agents' models, the call is paced by the shared rate limiter
+    and retried by deadlines.call() within the current request deadline.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_GEMINI_MODEL,
+        max_sources: int = 8,
+        retry_policy: types.HttpRetryOptions = RETRY_POLICIES["default"],
+    ):
+        self.model = model
+        self.max_sources = max_sources
+        self.retry_policy = retry_policy
+        self._client: Optional[genai.Client] = None
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        if self._client is None:
+            http_options = http_clients.http_options() if pooling_enabled() else None
+            self._client = genai.Client(http_options=http_options)
+        prompt = (
+            "Search the web and summarize the most relevant, recent facts "
+            f"(include figures and named companies) for: {query}"
+        )
+        config = types.GenerateContentConfig(
+            tools=[types.Tool(google_search=types.GoogleSearch())]
+        )
+        # Same quota as the agents on this model.
+        limiter, budget = shared_rate_limiter(), quota_budget(self.model)
+        estimate = estimate_tokens(len(prompt))
+
+        async def attempt():
+            await limiter.acquire(budget, estimate)
+            response = await self._client.aio.models.generate_content(
+                model=self.model, contents=prompt, config=config
+            )
+            usage = response.usage_metadata
+            if usage and usage.prompt_token_count:
+                limiter.settle(budget, estimate, usage.prompt_token_count)
+            yield response
+
+        policy = self.retry_policy
+        calls = deadlines.call(
+            attempt,
+            attempts=policy.attempts or 1,
+            base_delay=policy.initial_delay or 1.0,
+            max_delay=policy.max_delay or 20.0,
+            retryable=lambda error: is_retryable(error, policy),
+            key="web_search",
+        )
+        async with aclosing(calls):
+            (response,) = [response async for response in calls]
+        sources = []
+        for candidate in response.candidates or []:
+            metadata = candidate.grounding_metadata
+            for chunk in (metadata.grounding_chunks or []) if metadata else []:
+                if chunk.web and chunk.web.uri:
+                    sources.append({"title": chunk.web.title, "uri": chunk.web.uri})
+        return {"summary": response.text or "", "sources": sources[: self.max_sources]}
+
+
+class LocalSearchBackend:
+    """
+    Offline stand-in backend.
+
+    Returns fixture results for known normalized queries (from a dict or a
+    JSON file) and a deterministic placeholder otherwise. Counts calls so
+    cache behaviour can be checked without network access.
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Any]] = None,
+        fixtures_path: Optional[str] = None,
+        delay_seconds: float = 0.0,
+    ):
+        self.fixtures = {normalize_query(q): r for q, r in (fixtures or {}).items()}
+        if fixtures_path:
+            with open(fixtures_path, "r", encoding="utf-8") as f:
+                for q, r in json.load(f).items():
+                    self.fixtures[normalize_query(q)] = r
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        self.calls += 1
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        result = self.fixtures.get(normalize_query(query))
+        if result is not None:
+            return dict(result)
+        return {
+            "summary": f"[offline search backend] No fixture for query: {query}",
+            "sources": [],
+        }
+
+
+class SearchCache:
+    """TTL + stale-while-revalidate cache in front of a search backend."""
+
+    def __init__(
+        self,
+        backend: Any,
+        store: Optional[StageCache] = None,
+        ttl_seconds: float = 7 * 24 * 3600,
+        stale_seconds: float = 30 * 24 * 3600,
+    ):
+        self.backend = backend
+        self.store = store or StageCache(directory=None)
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._inflight: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return hashlib.sha256(f"search:{normalized}".encode("utf-8")).hexdigest()
+
+    async def _call_backend(self, query: str, key: str) -> Dict[str, Any]:
+        try:
+            result = await self.backend.search(query)
+        except Exception:
+            self.errors += 1
+            raise
+        entry = {"query": query, "fetched_at": time.time(), "result": result}
+        await self.store.aput(key, "search", json.dumps(entry))
+        return result
+
+    def _start_fetch(self, query: str, key: str) -> "asyncio.Task[Dict[str, Any]]":
+        """The in-flight backend call for `key`, started if there is none."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._call_backend(query, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetch_done(key, done))
+        return task
+
+    def _fetch_done(self, key: str, task: "asyncio.Task[Dict[str, Any]]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved even if every caller has gone
+
+    async def _fetch(self, query: str, key: str) -> Dict[str, Any]:
+        """Call the backend once per key, sharing the result with concurrent callers."""
+        # Cancelling a caller only stops its wait, never the shared call.
+        return await asyncio.shield(self._start_fetch(query, key))
+
+    def _refresh_in_background(self, query: str, key: str) -> None:
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        # A failed refresh keeps the stale copy; its error is only counted.
+        self._start_fetch(query, key)
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        key = self._key(normalize_query(query))
+        raw = await self.store.aget(key)
+        if raw is not None:
+            entry = json.loads(raw)
+            age = time.time() - entry["fetched_at"]
+            if age < self.ttl_seconds:
+                self.fresh_hits += 1
+                return {**entry["result"], "cached": True, "age_seconds": int(age)}
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._refresh_in_background(query, key)
+                return {**entry["result"], "cached": True, "age_seconds": int(age)}
+        self.misses += 1
+        result = await self._fetch(query, key)
+        return {**result, "cached": False, "age_seconds": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "background_refreshes": self.refreshes,
+            "backend_errors": self.errors,
+            "hit_rate": (
+                round((self.fresh_hits + self.stale_hits) / lookups, 4)
+                if lookups
+                else 0.0
+            ),
+            "store": self.store.stats(),
+        }
+
+
+_default_search_cache: Optional[SearchCache] = None
+
+
+def search_ttl_seconds() -> float:
+    """How long search results stay fresh (VENTUREARCHITECT_SEARCH_TTL_HOURS)."""
+    return float(os.getenv("VENTUREARCHITECT_SEARCH_TTL_HOURS", "168")) * 3600
+
+
+def default_search_cache() -> SearchCache:
+    """
+    Process-wide SearchCache configured from the environment.
+
+    VENTUREARCHITECT_SEARCH_BACKEND: "gemini" (default) or "local"
+    VENTUREARCHITECT_SEARCH_FIXTURES: JSON fixtures file for the local backend
+    VENTUREARCHITECT_SEARCH_CACHE_DIR: on-disk store ("" = memory only)
+    VENTUREARCHITECT_SEARCH_TTL_HOURS / VENTUREARCHITECT_SEARCH_STALE_HOURS
+    """
+    global _default_search_cache
+    if _default_search_cache is None:
+        if os.getenv("VENTUREARCHITECT_SEARCH_BACKEND", "gemini") == "local":
+            backend: Any = LocalSearchBackend(
+                fixtures_path=os.getenv("VENTUREARCHITECT_SEARCH_FIXTURES") or None
+            )
+        else:
+            backend = GeminiSearchBackend()
+        directory = os.getenv(
+            "VENTUREARCHITECT_SEARCH_CACHE_DIR", DEFAULT_SEARCH_CACHE_DIR
+        )
+        _default_search_cache = SearchCache(
+            backend,
+            store=StageCache(directory=directory or None),
+            ttl_seconds=search_ttl_seconds(),
+            stale_seconds=float(
+                os.getenv("VENTUREARCHITECT_SEARCH_STALE_HOURS", "720")
+            )
+            * 3600,
+        )
+    return _default_search_cache
+
+
+async def web_search(query: str) -> Dict[str, Any]:
+    """
+    Search the web for up-to-date facts (market sizes, competitors, trends).
+
+    Results for the same (or an equivalently worded) query are cached, so
+    prefer short, focused queries.
+
+    Args:
+        query: a short, focused search query, e.g.
+          "pet care services market size Canada 2025".
+
+    Returns:
+        dict with:
+          - summary: grounded summary of the search results
+          - sources: list of {title, uri}
+          - cached: whether the result came from the cache
+          - age_seconds: age of the cached result
+        or, if the search failed, {error, summary: "", sources: []}.
+    """
+    try:
+        return await default_search_cache().search(query)
+    except Exception as error:
+        logger.warning("web_search failed for %r: %s", query, error)
+        return {
+            "error": f"Search failed: {error}",
+            "summary": "",
+            "sources": [],
+        }
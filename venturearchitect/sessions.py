@@ -0,0 +1,737 @@
+"""
+Bounded session storage for long-running servers.
+
+Every generation creates a session whose event history (plans, search
+results, tool outputs) stays in memory until something deletes it.
+EvictingSessionService wraps any ADK session service and bounds that:
+
+- sessions idle for longer than `ttl_seconds` are deleted,
+- beyond `max_sessions`, the least recently used sessions are deleted,
+  except sessions still in use: those created here and not yet deleted
+  (their run may still be writing to them) only expire by the TTL,
+- approximate per-session sizes and process RSS are reported by stats().
+
+Eviction runs opportunistically on every session write, so no background
+task is needed. It is a safety net: callers should still delete a session
+as soon as its generation finishes.
+
+SQLiteSessionService is a durable alternative that keeps sessions on disk
+(WAL mode) across restarts, with batched event writes and a retention
+period after which idle sessions are deleted.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.state import State
+
+SessionKey = Tuple[str, str, str]  # (app_name, user_id, session_id)
+
+logger = logging.getLogger(__name__)
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (Linux only, else None)."""
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class EvictingSessionService(BaseSessionService):
+    """
+    Drop-in session service with TTL and max-count eviction.
+
+    Args:
+        inner: the service that stores sessions (InMemorySessionService by
+          default).
+        ttl_seconds: idle time after which a session is deleted.
+        max_sessions: sessions kept before the least recently used go;
+          sessions in use are not counted out, so it can be exceeded.
+    """
+
+    def __init__(
+        self,
+        inner: Optional[BaseSessionService] = None,
+        ttl_seconds: float = 30 * 60,
+        max_sessions: int = 1000,
+    ):
+        self.inner = inner or InMemorySessionService()
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        # Least recently used first: key -> [last_access, approx_bytes]
+        self._sessions: "OrderedDict[SessionKey, list]" = OrderedDict()
+        # Created here and not deleted yet: in use by a run.
+        self._open: set = set()
+        self.counts = {
+            "created": 0,
+            "deleted": 0,
+            "evicted_ttl": 0,
+            "evicted_capacity": 0,
+        }
+
+    def _touch(self, key: SessionKey, added_bytes: int = 0) -> None:
+        entry = self._sessions.get(key)
+        if entry is None:
+            entry = self._sessions[key] = [0.0, 0]
+        entry[0] = time.monotonic()
+        entry[1] += added_bytes
+        self._sessions.move_to_end(key)
+
+    async def _evict(self, key: SessionKey, reason: str) -> None:
+        self._sessions.pop(key, None)
+        self._open.discard(key)
+        self.counts[reason] += 1
+        app_name, user_id, session_id = key
+        await self.inner.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    async def sweep(self) -> int:
+        """Evict expired and excess sessions; returns how many were evicted."""
+        evicted = 0
+        expired_before = time.monotonic() - self.ttl_seconds
+        while self._sessions:
+            key, (last_access, _) = next(iter(self._sessions.items()))
+            if last_access >= expired_before:
+                break
+            await self._evict(key, "evicted_ttl")
+            evicted += 1
+        excess = len(self._sessions) - self.max_sessions
+        if excess > 0:
+            idle = [key for key in self._sessions if key not in self._open]
+            for key in idle[:excess]:
+                await self._evict(key, "evicted_capacity")
+                evicted += 1
+        return evicted
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._touch(key)
+        self._open.add(key)
+        self.counts["created"] += 1
+        await self.sweep()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = await self.inner.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        key = (app_name, user_id, session_id)
+        if session is not None and key in self._sessions:
+            self._touch(key)
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        return await self.inner.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        key = (app_name, user_id, session_id)
+        self._open.discard(key)
+        if self._sessions.pop(key, None) is not None:
+            self.counts["deleted"] += 1
+        await self.inner.delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> Dict[str, Any]:
+        return await self.inner.get_user_state(app_name=app_name, user_id=user_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await self.inner.append_event(session, event)
+        if not event.partial:
+            key = (session.app_name, session.user_id, session.id)
+            self._touch(key, len(event.model_dump_json(exclude_none=True)))
+            await self.sweep()
+        return event
+
+    async def flush(self) -> None:
+        await self.inner.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory gauges: live sessions, approximate event bytes, process RSS."""
+        sizes = [size for _, size in self._sessions.values()]
+        now = time.monotonic()
+        return {
+            "sessions": len(sizes),
+            "in_use": len(self._open),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "approx_event_bytes": sum(sizes),
+            "largest_session_bytes": max(sizes, default=0),
+            "oldest_idle_seconds": round(
+                max((now - t for t, _ in self._sessions.values()), default=0.0), 3
+            ),
+            "process_rss_bytes": process_rss_bytes(),
+            "counts": dict(self.counts),
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE INDEX IF NOT EXISTS sessions_by_update ON sessions (app_name, update_time);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session
+    ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _split_state(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Split a state (delta) into app-, user- and session-scoped parts."""
+    scopes: Dict[str, Dict[str, Any]] = {"app": {}, "user": {}, "session": {}}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            scopes["app"][key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            scopes["user"][key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            scopes["session"][key] = value
+    return scopes
+
+
+class _Batch:
+    """Writes buffered since the last flush."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, str, str, float, str]] = []
+        self.app: Dict[str, Dict[str, Any]] = {}
+        self.user: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.session: Dict[SessionKey, Dict[str, Any]] = {}
+        self.touched: Dict[SessionKey, float] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.events or self.touched)
+
+    def extend(self, later: "_Batch") -> "_Batch":
+        """Append the writes of `later` (buffered after this batch) to it."""
+        self.events.extend(later.events)
+        for scope in ("app", "user", "session"):
+            merged = getattr(self, scope)
+            for key, delta in getattr(later, scope).items():
+                merged.setdefault(key, {}).update(delta)
+        self.touched.update(later.touched)
+        return self
+
+
+class SQLiteSessionService(BaseSessionService):
+    """
+    Durable ADK session service on a local SQLite database in WAL mode.
+
+    One connection is driven by a single worker thread, so writes are never
+    contended however many runs are in flight. Events are buffered and
+    committed in batches (group commit):
+
+    - when a run produces its final response,
+    - when `max_batch` events are pending,
+    - otherwise at most `flush_interval` seconds after being appended,
+    - before any read, so reads always see every appended event.
+
+    A failed commit puts its events back in front of the pending ones, to
+    be retried by the next flush.
+
+    Sessions idle for more than `compact_after_seconds` are compacted to
+    their last `keep_events` events (the finished plan), and sessions idle
+    for more than `max_age_seconds` (None: kept forever) are deleted, by
+    compact(), which also runs automatically every `compact_interval`
+    seconds.
+    """
+
+    # Sessions outlive the run; callers should not delete them for memory.
+    durable = True
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.25,
+        max_batch: int = 500,
+        keep_events: int = 2,
+        compact_after_seconds: float = 7 * 24 * 3600,
+        compact_interval: float = 3600,
+        max_age_seconds: Optional[float] = 30 * 24 * 3600,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.keep_events = keep_events
+        self.compact_after_seconds = compact_after_seconds
+        self.compact_interval = compact_interval
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-sessions"
+        )
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+        self._batch = _Batch()
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: set = set()
+        # One commit at a time, so a failed batch can go back in order.
+        self._flush_lock = asyncio.Lock()
+        self._last_compact = time.time()
+        self.counts = {
+            "events": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "compacted_events": 0,
+            "expired_sessions": 0,
+        }
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # --- reads / writes executed on the worker thread ------------------
+
+    def _load_state(self, table: str, where: str, params: Tuple) -> Dict[str, Any]:
+        row = self._conn.execute(
+            f"SELECT state FROM {table} WHERE {where}", params
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _merged_state(
+        self, app_name: str, user_id: str, session_state: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        merged = dict(session_state)
+        app = self._load_state("app_states", "app_name = ?", (app_name,))
+        user = self._load_state(
+            "user_states", "app_name = ? AND user_id = ?", (app_name, user_id)
+        )
+        merged.update({State.APP_PREFIX + k: v for k, v in app.items()})
+        merged.update({State.USER_PREFIX + k: v for k, v in user.items()})
+        return merged
+
+    def _upsert_scoped(
+        self,
+        app_name: str,
+        user_id: str,
+        app: Dict[str, Any],
+        user: Dict[str, Any],
+    ) -> None:
+        if app:
+            state = self._load_state("app_states", "app_name = ?", (app_name,))
+            state.update(app)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO app_states VALUES (?, ?)",
+                (app_name, json.dumps(state, default=str)),
+            )
+        if user:
+            state = self._load_state(
+                "user_states", "app_name = ? AND user_id = ?", (app_name, user_id)
+            )
+            state.update(user)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_states VALUES (?, ?, ?)",
+                (app_name, user_id, json.dumps(state, default=str)),
+            )
+
+    def _create(
+        self, app_name: str, user_id: str, session_id: str, state: Dict[str, Any]
+    ) -> Session:
+        scopes = _split_state(state)
+        now = time.time()
+        with self._conn:
+            self._upsert_scoped(app_name, user_id, scopes["app"], scopes["user"])
+            try:
+                self._conn.execute(
+                    "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        app_name,
+                        user_id,
+                        session_id,
+                        json.dumps(scopes["session"], default=str),
+                        now,
+                        now,
+                    ),
+                )
+            except sqlite3.IntegrityError:
+                raise AlreadyExistsError(
+                    f"Session with id {session_id} already exists."
+                ) from None
+            merged = self._merged_state(app_name, user_id, scopes["session"])
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=merged,
+            events=[],
+            last_update_time=now,
+        )
+
+    def _get(
+        self,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig],
+    ) -> Optional[Session]:
+        row = self._conn.execute(
+            "SELECT state, update_time FROM sessions"
+            " WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+        query = (
+            "SELECT data FROM events"
+            " WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        )
+        params: List[Any] = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq DESC"
+        if config and config.num_recent_events is not None:
+            query += " LIMIT ?"
+            params.append(config.num_recent_events)
+        rows = self._conn.execute(query, params).fetchall()
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merged_state(app_name, user_id, json.loads(row[0])),
+            events=[Event.model_validate_json(data) for (data,) in reversed(rows)],
+            last_update_time=row[1],
+        )
+
+    def _list(self, app_name: str, user_id: Optional[str]) -> List[Session]:
+        query = (
+            "SELECT user_id, id, state, update_time FROM sessions"
+            " WHERE app_name = ?"
+        )
+        params: List[Any] = [app_name]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        query += " ORDER BY update_time, user_id, id"
+        return [
+            Session(
+                app_name=app_name,
+                user_id=uid,
+                id=sid,
+                state=self._merged_state(app_name, uid, json.loads(state)),
+                events=[],
+                last_update_time=update_time,
+            )
+            for uid, sid, state, update_time in self._conn.execute(query, params)
+        ]
+
+    def _delete(self, app_name: str, user_id: str, session_id: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM events"
+                " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+            self._conn.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            )
+
+    def _write_batch(self, batch: _Batch) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                batch.events,
+            )
+            for app_name, delta in batch.app.items():
+                self._upsert_scoped(app_name, "", delta, {})
+            for (app_name, user_id), delta in batch.user.items():
+                self._upsert_scoped(app_name, user_id, {}, delta)
+            for key, update_time in batch.touched.items():
+                delta = batch.session.get(key)
+                if delta:
+                    state = self._load_state(
+                        "sessions", "app_name = ? AND user_id = ? AND id = ?", key
+                    )
+                    state.update(delta)
+                    self._conn.execute(
+                        "UPDATE sessions SET state = ?, update_time = ?"
+                        " WHERE app_name = ? AND user_id = ? AND id = ?",
+                        (json.dumps(state, default=str), update_time, *key),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE sessions SET update_time = ?"
+                        " WHERE app_name = ? AND user_id = ? AND id = ?",
+                        (update_time, *key),
+                    )
+
+    def _expire(self, idle_before: float) -> int:
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM events WHERE (app_name, user_id, session_id) IN ("
+                " SELECT app_name, user_id, id FROM sessions WHERE update_time < ?)",
+                (idle_before,),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE update_time < ?", (idle_before,)
+            )
+        return cursor.rowcount
+
+    def _compact(self, idle_before: float) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                """
+                DELETE FROM events WHERE seq IN (
+                    SELECT e.seq FROM events e
+                    JOIN sessions s ON s.app_name = e.app_name
+                        AND s.user_id = e.user_id AND s.id = e.session_id
+                    WHERE s.update_time < ? AND (
+                        SELECT COUNT(*) FROM events later
+                        WHERE later.app_name = e.app_name
+                          AND later.user_id = e.user_id
+                          AND later.session_id = e.session_id
+                          AND later.seq > e.seq
+                    ) >= ?
+                )
+                """,
+                (idle_before, self.keep_events),
+            )
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return cursor.rowcount
+
+    # --- BaseSessionService --------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or uuid.uuid4().hex
+        await self.flush()  # app/user state may be pending
+        return await self._call(
+            self._create, app_name, user_id, session_id, dict(state or {})
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush()
+        return await self._call(self._get, app_name, user_id, session_id, config)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        await self.flush()
+        sessions = await self._call(self._list, app_name, user_id)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self.flush()
+        await self._call(self._delete, app_name, user_id, session_id)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> Dict[str, Any]:
+        await self.flush()
+        return await self._call(
+            self._load_state,
+            "user_states",
+            "app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Updates the in-memory session (state + events) like other services.
+        event = await super().append_event(session, event)
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        batch = self._batch
+        batch.events.append(
+            (*key, event.timestamp, event.model_dump_json(exclude_none=True))
+        )
+        batch.touched[key] = event.timestamp
+        if event.actions and event.actions.state_delta:
+            scopes = _split_state(event.actions.state_delta)
+            if scopes["app"]:
+                batch.app.setdefault(session.app_name, {}).update(scopes["app"])
+            if scopes["user"]:
+                batch.user.setdefault(key[:2], {}).update(scopes["user"])
+            if scopes["session"]:
+                batch.session.setdefault(key, {}).update(scopes["session"])
+        self.counts["events"] += 1
+
+        final = event.author != "user" and event.is_final_response()
+        if final or len(batch.events) >= self.max_batch:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.flush_interval, self._flush_soon
+            )
+        return event
+
+    def _flush_soon(self) -> None:
+        self._flush_timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: "asyncio.Future[None]") -> None:
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Background session flush failed; %d events kept for the next one",
+                len(self._batch.events),
+                exc_info=task.exception(),
+            )
+
+    async def flush(self) -> None:
+        """
+        Commit every buffered event in one transaction.
+
+        If the commit fails, the events stay buffered (ahead of any appended
+        since) and the error is raised.
+        """
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        async with self._flush_lock:
+            if self._batch:
+                batch, self._batch = self._batch, _Batch()
+                try:
+                    await self._call(self._write_batch, batch)
+                except BaseException:
+                    self._batch = batch.extend(self._batch)
+                    self.counts["flush_errors"] += 1
+                    raise
+                self.counts["flushes"] += 1
+        if time.time() - self._last_compact > self.compact_interval:
+            await self.compact()
+
+    async def compact(self) -> int:
+        """
+        Trim idle sessions to their last `keep_events` events and delete the
+        ones idle for longer than `max_age_seconds`.
+        """
+        self._last_compact = time.time()
+        if self.max_age_seconds is not None:
+            expired = await self._call(
+                self._expire, time.time() - self.max_age_seconds
+            )
+            self.counts["expired_sessions"] += expired
+        removed = await self._call(
+            self._compact, time.time() - self.compact_after_seconds
+        )
+        self.counts["compacted_events"] += removed
+        return removed
+
+    async def close(self) -> None:
+        await self.flush()
+        await self._call(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pending writes, batching counters and database size."""
+        try:
+            db_bytes = os.path.getsize(self.path)
+            wal_bytes = os.path.getsize(self.path + "-wal")
+        except OSError:
+            db_bytes = wal_bytes = None
+        return {
+            "path": self.path,
+            "pending_events": len(self._batch.events),
+            "db_bytes": db_bytes,
+            "wal_bytes": wal_bytes,
+            "process_rss_bytes": process_rss_bytes(),
+            "counts": dict(self.counts),
+        }
+
+
+def default_session_service() -> BaseSessionService:
+    """
+    Session service configured from the environment.
+
+    VENTUREARCHITECT_SESSION_DB: SQLite file for durable sessions
+    (SQLiteSessionService), deleted after VENTUREARCHITECT_SESSION_RETENTION_DAYS
+    idle (default 30; 0 keeps them forever). Otherwise sessions are kept in memory by an
+    EvictingSessionService bounded by VENTUREARCHITECT_SESSION_TTL_MINUTES
+    (default 30) and VENTUREARCHITECT_MAX_SESSIONS (default 1000).
+    """
+    path = os.getenv("VENTUREARCHITECT_SESSION_DB")
+    if path:
+        days = float(os.getenv("VENTUREARCHITECT_SESSION_RETENTION_DAYS", "30"))
+        return SQLiteSessionService(
+            path, max_age_seconds=days * 24 * 3600 if days > 0 else None
+        )
+    return EvictingSessionService(
+        ttl_seconds=float(os.getenv("VENTUREARCHITECT_SESSION_TTL_MINUTES", "30"))
+        * 60,
+        max_sessions=int(os.getenv("VENTUREARCHITECT_MAX_SESSIONS", "1000")),
+    )
@@ -0,0 +1,361 @@
+"""
+Content-addressed cache for pipeline stage outputs.
+
+A stage's output is keyed by a hash of:
+- the normalized business idea (case and whitespace insensitive),
+- the stage name,
+- a fingerprint of the agent that produces it (instruction, model, tools),
+- the hashes of the outputs it was given by upstream stages.
+
+Editing a prompt in venturearchitect/agents/*.py or switching a model changes
+the fingerprint, so only that stage and the stages downstream of it rerun;
+everything else is served from the cache.
+
+Two tiers: an in-process LRU (ToolCache) in front of a size-bounded on-disk
+store shared by every process using the same directory. The cache is best
+effort: a disk error is logged and counted, never raised to the stage.
+
+Lookups can pass a maximum age: a stage built on live data (web search
+results) is rerun once its cached output is older than that data may be.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.function_tool import FunctionTool
+
+from .tools import ToolCache
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached entry after a change to the key format.
+CACHE_FORMAT_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.getcwd(), ".venturearchitect_cache", "stages")
+
+
+def normalize_idea(idea: str) -> str:
+    """Case-fold and collapse whitespace so trivially different ideas match."""
+    return re.sub(r"\s+", " ", idea).strip().casefold()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _source(value: Any) -> str:
+    """
+    Stable description of a callable: its source code when available, else
+    its qualified name (never a repr, which carries a memory address).
+    """
+    try:
+        return inspect.getsource(value)
+    except (OSError, TypeError):
+        target = value if inspect.isroutine(value) else type(value)
+        return f"{target.__module__}.{target.__qualname__}"
+
+
+def _tool_fingerprint(tool: Any) -> Dict[str, Any]:
+    """The declaration the model sees for a tool, plus its implementation."""
+    if callable(tool) and not isinstance(tool, BaseTool):
+        tool = FunctionTool(tool)
+    declaration = None
+    if isinstance(tool, BaseTool):
+        try:
+            declaration = tool._get_declaration()
+        except Exception:  # e.g. a tool without a static declaration
+            declaration = None
+    implementation = getattr(tool, "func", None) or tool
+    return {
+        "name": getattr(tool, "name", None) or type(tool).__name__,
+        "declaration": (
+            declaration.model_dump(mode="json", exclude_none=True)
+            if declaration is not None
+            else None
+        ),
+        "source": _source(implementation),
+    }
+
+
+def agent_fingerprint(agent: BaseAgent) -> str:
+    """
+    Hash of everything about an agent that shapes its output.
+
+    Covers the instruction (its source, if it is a function), model name,
+    tool declarations and implementations, and generation config, and
+    recurses into nested agents (e.g. the section writer of a sectioned
+    narrative), so any prompt or tool edit produces a new fingerprint that
+    is the same in every process.
+    """
+    model = getattr(agent, "model", None)
+    instruction = getattr(agent, "instruction", None)
+    tools = [_tool_fingerprint(t) for t in getattr(agent, "tools", None) or []]
+    parts: Dict[str, Any] = {
+        "class": type(agent).__name__,
+        "name": agent.name,
+        "instruction": _source(instruction) if callable(instruction) else instruction,
+        "model": model if isinstance(model, str) else getattr(model, "model", None),
+        "tools": sorted(tools, key=lambda t: t["name"]),
+    }
+    config = getattr(agent, "generate_content_config", None)
+    if config is not None:
+        parts["generate_content_config"] = config.model_dump(
+            mode="json", exclude_none=True
+        )
+    sections = getattr(agent, "sections", None)
+    if sections:
+        parts["sections"] = list(sections)
+    section_agent = getattr(agent, "section_agent", None)
+    if isinstance(section_agent, BaseAgent):
+        parts["section_agent"] = agent_fingerprint(section_agent)
+    for sub_agent in agent.sub_agents:
+        parts.setdefault("sub_agents", []).append(agent_fingerprint(sub_agent))
+    return _sha256(json.dumps(parts, sort_keys=True, default=_source))
+
+
+def stage_key(
+    idea: str, stage_name: str, agent: BaseAgent, inputs: Mapping[str, str]
+) -> str:
+    """Cache key for one stage run."""
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "idea": normalize_idea(idea),
+        "stage": stage_name,
+        "agent": agent_fingerprint(agent),
+        "inputs": {name: _sha256(text) for name, text in sorted(inputs.items())},
+    }
+    return _sha256(json.dumps(payload, sort_keys=True))
+
+
+class StageCache:
+    """
+    Two-tier (memory + disk) cache of stage outputs keyed by stage_key().
+
+    Disk entries are JSON files under `directory`; when their total size
+    exceeds `max_disk_bytes`, the least recently used files are deleted
+    until the store is back under 90% of the limit. Async callers should
+    use aget() / aput(), which keep the disk I/O off the event loop.
+
+    get() / aget() treat entries older than `max_age_seconds` (if given) as
+    misses; the next put() replaces them.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = DEFAULT_CACHE_DIR,
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = ToolCache(max_entries=max_memory_entries, ttl_seconds=None)
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.expired = 0
+        self.disk_evictions = 0
+        self.disk_errors = 0
+        self._disk_bytes = 0
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                self._disk_bytes = sum(
+                    os.path.getsize(path) for path in self._disk_files()
+                )
+            except OSError as e:
+                self._disk_error("open", directory, e)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _disk_files(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+
+    def _disk_error(self, action: str, path: str, error: OSError) -> None:
+        with self._lock:
+            self.disk_errors += 1
+        logger.warning("Stage cache could not %s %s: %s", action, path, error)
+
+    def _fresh(self, created: float, max_age_seconds: Optional[float]) -> bool:
+        if max_age_seconds is None or time.time() - created < max_age_seconds:
+            return True
+        with self._lock:
+            self.expired += 1
+        return False
+
+    def _get_memory(
+        self, key: str, max_age_seconds: Optional[float]
+    ) -> Tuple[bool, Optional[str]]:
+        """(found, value); found but None means expired (skip the disk)."""
+        found, entry = self.memory.get(key)
+        if not found:
+            return False, None
+        created, value = entry
+        return True, value if self._fresh(created, max_age_seconds) else None
+
+    def get(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[str]:
+        found, value = self._get_memory(key, max_age_seconds)
+        if found:
+            return value
+        return self._get_disk(key, max_age_seconds)
+
+    def _get_disk(
+        self, key: str, max_age_seconds: Optional[float] = None
+    ) -> Optional[str]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            created, value = float(entry["created"]), entry["output"]
+            if not self._fresh(created, max_age_seconds):
+                return None
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self._disk_error("read", path, e)
+            return None
+        except (ValueError, KeyError, TypeError):
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        self.memory.put(key, (created, value))
+        return value
+
+    async def aget(
+        self, key: str, max_age_seconds: Optional[float] = None
+    ) -> Optional[str]:
+        """get(), reading the disk tier in a worker thread."""
+        found, value = self._get_memory(key, max_age_seconds)
+        if found:
+            return value
+        if not self.directory:
+            return None
+        return await asyncio.to_thread(self._get_disk, key, max_age_seconds)
+
+    def put(self, key: str, stage_name: str, output: str) -> None:
+        if not output:
+            return
+        created = time.time()
+        self.memory.put(key, (created, output))
+        self._put_disk(key, stage_name, output, created)
+
+    def _put_disk(
+        self, key: str, stage_name: str, output: str, created: float
+    ) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        data = json.dumps({"stage": stage_name, "created": created, "output": output})
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            tmp_path = None
+            size = os.path.getsize(path)
+        except OSError as e:
+            self._disk_error("write", path, e)
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+        with self._lock:
+            self._disk_bytes += size - previous
+            over_limit = self._disk_bytes > self.max_disk_bytes
+        if over_limit:
+            self._evict()
+
+    async def aput(self, key: str, stage_name: str, output: str) -> None:
+        """put(), writing the disk tier in a worker thread."""
+        if not output:
+            return
+        created = time.time()
+        self.memory.put(key, (created, output))
+        if self.directory:
+            await asyncio.to_thread(self._put_disk, key, stage_name, output, created)
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._disk_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        with self._lock:
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_disk_bytes * 0.9)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.disk_evictions += 1
+            self._disk_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory": self.memory.stats(),
+                "disk_hits": self.disk_hits,
+                "expired": self.expired,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "disk_evictions": self.disk_evictions,
+                "disk_errors": self.disk_errors,
+                "directory": self.directory,
+            }
+
+
+_default_cache: Optional[StageCache] = None
+
+
+def default_stage_cache() -> Optional[StageCache]:
+    """
+    Process-wide StageCache configured from the environment.
+
+    VENTUREARCHITECT_STAGE_CACHE=0 disables caching,
+    VENTUREARCHITECT_STAGE_CACHE_DIR overrides the directory ("" keeps the
+    cache in memory only) and VENTUREARCHITECT_STAGE_CACHE_MAX_MB bounds
+    the on-disk size.
+    """
+    global _default_cache
+    if os.getenv("VENTUREARCHITECT_STAGE_CACHE", "1") == "0":
+        return None
+    if _default_cache is None:
+        _default_cache = StageCache(
+            directory=os.getenv("VENTUREARCHITECT_STAGE_CACHE_DIR", DEFAULT_CACHE_DIR)
+            or None,
+            max_disk_bytes=int(
+                float(os.getenv("VENTUREARCHITECT_STAGE_CACHE_MAX_MB", "256"))
+                * 1024
+                * 1024
+            ),
+        )
+    return _default_cache
@@ -0,0 +1,153 @@
+"""
+Startup-time benchmark for the web app and the CLI.
+
+Every sample runs in a fresh Python process, so imports are really cold:
+
+- import_web_app / import_cli: time to import the entry point module,
+- warm_up: web_app.warm_up() (session service, runners, model clients),
+- first_request_cold / first_request_warm: what the first request pays
+  before its first model call (runner build, model clients, session
+  create/delete), without and with warm-up. With --generate, a real
+  first POST /generate instead (needs GOOGLE_API_KEY).
+
+Usage:
+    python -m venturearchitect.startup_benchmark [--repeat 5] [--mode single]
+        [--generate] [--json] [--record startup.jsonl]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+_SAMPLE = r"""
+import asyncio, json, sys, time
+start = time.perf_counter()
+import venturearchitect.web_app as web
+imported = time.perf_counter() - start
+mode, warm, generate = sys.argv[1], sys.argv[2] == "1", sys.argv[3] == "1"
+
+async def first_request():
+    start = time.perf_counter()
+    if generate:
+        import httpx
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=600
+        ) as client:
+            response = await client.post(
+                "/generate",
+                json={"idea": "A neighbourhood tool library", "mode": mode},
+            )
+            response.raise_for_status()
+    else:
+        from venturearchitect.runners import warm_up_agent
+
+        # Everything but the model call: runner, model clients, session.
+        warm_up_agent(web.get_runner(mode).agent)
+        await web._end_session(await web._new_session("benchmark_user"))
+    return time.perf_counter() - start
+
+async def main():
+    result = {"import_web_app": imported}
+    if warm:
+        start = time.perf_counter()
+        web.warm_up([mode])  # on this loop, as the server lifespan does
+        result["warm_up"] = time.perf_counter() - start
+    key = "first_request_warm" if warm else "first_request_cold"
+    result[key] = await first_request()
+    return result
+
+print(json.dumps(asyncio.run(main())))
+"""
+
+_CLI_SAMPLE = r"""
+import json, time
+start = time.perf_counter()
+import venturearchitect.runner_app
+print(json.dumps({"import_cli": time.perf_counter() - start}))
+"""
+
+
+def _run_sample(code: str, *args: str) -> Dict[str, float]:
+    env = dict(os.environ, VENTUREARCHITECT_WARM_UP="0")
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(
+    repeat: int = 5, mode: str = "single", generate: bool = False
+) -> Dict[str, Any]:
+    """
+    Median (and min / max) seconds per metric over `repeat` cold processes.
+    """
+    samples: Dict[str, List[float]] = {}
+    flag = "1" if generate else "0"
+    for _ in range(repeat):
+        for result in (
+            _run_sample(_SAMPLE, mode, "0", flag),
+            _run_sample(_SAMPLE, mode, "1", flag),
+            _run_sample(_CLI_SAMPLE),
+        ):
+            for name, seconds in result.items():
+                samples.setdefault(name, []).append(seconds)
+    return {
+        "mode": mode,
+        "generate": generate,
+        "repeat": repeat,
+        "seconds": {
+            name: {
+                "median": round(statistics.median(values), 4),
+                "min": round(min(values), 4),
+                "max": round(max(values), 4),
+            }
+            for name, values in samples.items()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--mode", choices=["single", "pipeline", "sections"], default="single"
+    )
+    parser.add_argument(
+        "--generate",
+        action="store_true",
+        help="time a real first /generate request (calls Gemini)",
+    )
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    parser.add_argument(
+        "--record", help="append the result as one JSON line to this file"
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(args.repeat, args.mode, args.generate)
+    report["timestamp"] = time.time()
+    if args.record:
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report) + "\n")
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"Startup benchmark (mode={args.mode}, {args.repeat} cold processes)")
+    for name, stats in report["seconds"].items():
+        print(
+            f"{name:<20} median {stats['median'] * 1000:8.1f} ms"
+            f"  (min {stats['min'] * 1000:.1f}, max {stats['max'] * 1000:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,397 @@
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, List, Mapping, Optional, Sequence
+import asyncio
+import copy
+import functools
+import inspect
 import math
+import multiprocessing
 import os
 import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
-def run_financial_model(assumptions: Dict[str, Any]) -> Dict[str, Any]:
+import numpy as np
+
+# ------------------------------------------------------------
+# Memoization for deterministic tools
+# ------------------------------------------------------------
+
+
+class ToolCache:
+    """
+    Bounded, thread-safe LRU cache with an optional TTL.
+
+    Results are deep-copied in and out so callers can never mutate a
+    cached value.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: Optional[float] = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> tuple:
+        """Return (found, value) for key, counting a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                age = time.monotonic() - stored_at
+                if self.ttl_seconds is None or age < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, copy.deepcopy(value)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _canonical(value: Any) -> Hashable:
+    """
+    Hashable, order-independent form of a tool argument.
+
+    Dict key order is ignored and ints/floats collapse to one float so
+    {"arpu": 5} and {"arpu": 5.0} produce the same key. Tools that echo
+    their arguments must do so outside the cache (see run_financial_model).
+    """
+    if isinstance(value, bool):
+        return ("bool", value)  # True == 1.0, but is not the number 1
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value) + 0.0  # also folds -0.0 into 0.0
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    raise TypeError(f"Uncacheable argument type: {type(value).__name__}")
+
+
+# Default cache shared by every @cached_tool function (keys include the tool name).
+TOOL_CACHE = ToolCache()
+# Per-tool cache and hit/miss counters, for tool_cache_stats().
+_cached_tools: Dict[str, Dict[str, Any]] = {}
+_cached_tools_lock = threading.Lock()
+
+
+def cached_tool(func: Optional[Callable] = None, *, cache: Optional[ToolCache] = None):
+    """
+    Decorator that memoizes a pure tool function on its canonical arguments.
+
+    Keeps the wrapped signature and docstring intact, so ADK builds the same
+    function declaration. Calls with arguments that cannot be canonicalized
+    bypass the cache.
+
+    Usage:
+        @cached_tool
+        def my_tool(...): ...
+
+        @cached_tool(cache=ToolCache(max_entries=64, ttl_seconds=None))
+        def other_tool(...): ...
+    """
+    if func is None:
+        return lambda f: cached_tool(f, cache=cache)
+
+    store = cache or TOOL_CACHE
+    signature = inspect.signature(func)
+    counters = {"cache": store, "hits": 0, "misses": 0}
+    _cached_tools[func.__name__] = counters
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__name__, _canonical(dict(bound.arguments)))
+        except TypeError:
+            return func(*args, **kwargs)
+
+        found, value = store.get(key)
+        with _cached_tools_lock:
+            counters["hits" if found else "misses"] += 1
+        if found:
+            return value
+        value = func(*args, **kwargs)
+        store.put(key, value)
+        return value
+
+    wrapper.cache = store
+    return wrapper
+
+
+def tool_cache_stats() -> Dict[str, Any]:
+    """Per-tool hit/miss counts plus the state of the cache each tool uses."""
+    with _cached_tools_lock:
+        snapshot = {
+            name: (c["cache"], c["hits"], c["misses"])
+            for name, c in _cached_tools.items()
+        }
+    stats: Dict[str, Any] = {}
+    for name, (store, hits, misses) in snapshot.items():
+        lookups = hits + misses
+        stats[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "cache": store.stats(),
+        }
+    return stats
+
+
+# Defaults applied to any financial assumption the caller leaves out.
+ASSUMPTION_DEFAULTS: Dict[str, float] = {
+    "initial_users": 50.0,
+    "monthly_growth_rate": 0.1,
+    "arpu": 5.0,
+    "fixed_costs": 1500.0,
+    "variable_cost_per_user": 0.1,
+}
+DEFAULT_MONTHS = 36
+
+
+def _project(
+    initial_users: np.ndarray,
+    growth: np.ndarray,
+    arpu: np.ndarray,
+    fixed_costs: np.ndarray,
+    variable_cost_per_user: np.ndarray,
+    months: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Core vectorized projection over N scenarios (all inputs are 1-D arrays).
+
+    Users compound with a running product so every value matches the
+    month-by-month loop of the original model bit for bit.
+    """
+    n = initial_users.shape[0]
+    horizon = int(months.max()) if n else 0
+    horizon = max(horizon, 0)
+
+    factors = np.empty((n, horizon), dtype=np.float64)
+    if horizon:
+        factors[:, 0] = initial_users
+        factors[:, 1:] = (1.0 + growth)[:, None]
+    users = np.trunc(np.cumprod(factors, axis=1))
+
+    revenue = users * arpu[:, None]
+    costs = fixed_costs[:, None] + users * variable_cost_per_user[:, None]
+    profit = revenue - costs
+
+    # Scenarios shorter than the longest horizon are zero-padded.
+    valid = np.arange(horizon)[None, :] < months[:, None]
+    for arr in (users, revenue, costs, profit):
+        arr[~valid] = 0.0
+
+    break_even_month = np.zeros(n, dtype=np.int64)
+    if horizon:
+        break_even_month = _break_even_months(
+            profit, months, growth, arpu - variable_cost_per_user
+        )
+
+    return {
+        "months": months,
+        "users": users,
+        "revenue": revenue,
+        "costs": costs,
+        "profit": profit,
+        "break_even_month": break_even_month,
+    }
+
+
+def _break_even_months(
+    profit: np.ndarray, months: np.ndarray, growth: np.ndarray, margin: np.ndarray
+) -> np.ndarray:
+    """
+    First month with profit >= 0 for every scenario (0 if never).
+
+    Users only ever move in the direction of the growth rate and profit
+    moves with users in the direction of the unit margin, so each profit
+    series is monotonic. Rising series are bisected (log2(months) probes
+    instead of a full scan); falling ones can only break even in month 1.
+    """
+    n = profit.shape[0]
+    rows = np.arange(n)
+    last = profit.shape[1] - 1
+    rising = ((growth >= 0) & (margin >= 0)) | ((growth <= 0) & (margin <= 0))
+
+    lo = np.zeros(n, dtype=np.int64)
+    hi = np.where(rising, np.maximum(months, 0), 0)
+    while True:
+        active = lo < hi
+        if not active.any():
+            break
+        mid = (lo + hi) // 2
+        profitable = profit[rows, np.minimum(mid, last)] >= 0
+        hi = np.where(active & profitable, mid, hi)
+        lo = np.where(active & ~profitable, mid + 1, lo)
+
+    first_month_profitable = (profit[:, 0] >= 0) & (months > 0)
+    return np.where(
+        rising,
+        np.where(lo < months, lo + 1, 0),
+        np.where(first_month_profitable, 1, 0),
+    )
+
+
+def _yearly_totals(monthly: np.ndarray) -> np.ndarray:
+    """Sum zero-padded (N, months) arrays into (N, years) calendar-year totals."""
+    n, horizon = monthly.shape
+    years = -(-horizon // 12)
+    padded = np.zeros((n, years * 12), dtype=monthly.dtype)
+    padded[:, :horizon] = monthly
+    return padded.reshape(n, years, 12).sum(axis=2)
+
+
+def _quantize(value: float, precision: int) -> Any:
+    """Round to `precision` decimals; precision <= 0 yields plain ints."""
+    value = round(value, precision)
+    return int(value) if precision <= 0 else value
+
+
+def _columns_to_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def _scenario_summary(
+    projection: Dict[str, np.ndarray],
+    i: int,
+    layout: str = "rows",
+    precision: int = 2,
+) -> Dict[str, Any]:
+    """Yearly rollups, growth and funding figures for scenario i of a projection."""
+    months = max(int(projection["months"][i]), 0)
+    profit = projection["profit"][i, :months]
+    revenue_by_year = _yearly_totals(projection["revenue"][i : i + 1, :months])[0]
+    costs_by_year = _yearly_totals(projection["costs"][i : i + 1, :months])[0]
+    profit_by_year = _yearly_totals(projection["profit"][i : i + 1, :months])[0]
+
+    years = range(len(revenue_by_year))
+    last_months = [min((year + 1) * 12, months) for year in years]
+    yearly: Dict[str, List[Any]] = {
+        "year": [year + 1 for year in years],
+        "months": [last - year * 12 for year, last in zip(years, last_months)],
+        "ending_users": [int(projection["users"][i, last - 1]) for last in last_months],
+        "revenue": [_quantize(v, precision) for v in revenue_by_year.tolist()],
+        "costs": [_quantize(v, precision) for v in costs_by_year.tolist()],
+        "profit": [_quantize(v, precision) for v in profit_by_year.tolist()],
+    }
+
+    # CAGR between the first and last complete years of revenue.
+    full_years = months // 12
+    revenue_cagr = None
+    if full_years >= 2 and revenue_by_year[0] > 0:
+        ratio = revenue_by_year[full_years - 1] / revenue_by_year[0]
+        revenue_cagr = round(float(ratio ** (1.0 / (full_years - 1)) - 1.0), 4)
+
+    cumulative = np.cumsum(profit)
+    lowest = float(cumulative.min()) if months else 0.0
+    ending = float(cumulative[-1]) if months else 0.0
+    total_revenue = float(projection["revenue"][i, :months].sum())
+    burn = float(np.clip(-profit, 0, None).sum())
+    return {
+        "yearly_summary": yearly if layout == "columns" else _columns_to_rows(yearly),
+        "revenue_cagr": revenue_cagr,
+        "total_revenue": _quantize(total_revenue, precision),
+        "total_profit": _quantize(float(profit.sum()), precision),
+        "cumulative_cash_burn": _quantize(burn, precision),
+        "peak_funding_need": _quantize(max(0.0, -lowest), precision),
+        "ending_cumulative_cash": _quantize(ending, precision),
+    }
+
+
+def project_scenarios(
+    assumption_sets: Sequence[Mapping[str, Any]],
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized financial model for a batch of assumption sets.
+
+    Computes every scenario in one NumPy pass instead of one Python loop
+    per call, which is what makes sensitivity sweeps and portfolio
+    regeneration cheap.
+
+    Args:
+        assumption_sets: sequence of assumption dicts, each with the same
+          keys accepted by run_financial_model. Missing keys fall back to
+          ASSUMPTION_DEFAULTS / DEFAULT_MONTHS.
+
+    Returns:
+        dict of NumPy arrays:
+          - months: (N,) horizon of each scenario
+          - users, revenue, costs, profit: (N, max_months), unrounded;
+            months past a scenario's horizon are zero
+          - break_even_month: (N,) first month with profit >= 0, 0 if never
+    """
+    columns = {
+        key: np.array(
+            [float(a.get(key, default)) for a in assumption_sets],
+            dtype=np.float64,
+        )
+        for key, default in ASSUMPTION_DEFAULTS.items()
+    }
+    months = np.array(
+        [int(a.get("months", DEFAULT_MONTHS)) for a in assumption_sets],
+        dtype=np.int64,
+    )
+    return _project(
+        columns["initial_users"],
+        columns["monthly_growth_rate"],
+        columns["arpu"],
+        columns["fixed_costs"],
+        columns["variable_cost_per_user"],
+        months,
+    )
+
+
+def run_financial_model(
+    assumptions: Dict[str, Any],
+    detail: str = "summary",
+    layout: str = "rows",
+    precision: int = 2,
+) -> Dict[str, Any]:
     """
     Simple financial model tool.
 
+    Thin single-scenario wrapper around project_scenarios. Yearly figures,
+    break-even and funding need are pre-computed so the caller does not
+    have to aggregate the monthly table itself.
+
     Args:
         assumptions: dict with keys:
           - initial_users (int)
@@ -16,50 +400,384 @@ def run_financial_model(assumptions: Dict[str, Any]) -> Dict[str, Any]:
           - fixed_costs (float)
           - variable_cost_per_user (float)
           - months (int, optional, default 36)
+        detail: "summary" (default) for yearly rollups only, or "full" to
+          also include the month-by-month projections table.
+        layout: "rows" (default) returns tables as lists of dicts;
+          "columns" returns each table as a dict of parallel arrays, which
+          avoids repeating every key on every row (much smaller for long
+          horizons).
+        precision: decimals kept for money values (default 2); 0 or
+          negative values round to whole units / tens / hundreds and emit
+          integers.
 
     Returns:
         dict with:
           - assumptions (echoed)
-          - projections: list of {month, users, revenue, costs, profit}
           - break_even_month (int or null)
+          - yearly_summary: table of {year, months, ending_users, revenue,
+            costs, profit}
+          - revenue_cagr (float or null; needs two complete years)
+          - total_revenue, total_profit
+          - cumulative_cash_burn: sum of all monthly losses
+          - peak_funding_need: deepest point of cumulative cash
+          - ending_cumulative_cash
+          - projections: table of {month, users, revenue, costs, profit}
+            (only when detail="full")
+    """
+    # Echoed from this call: a cache hit may come from equal assumptions
+    # written differently (5 vs 5.0).
+    return {
+        "assumptions": copy.deepcopy(assumptions),
+        **financial_model(assumptions, detail, layout, precision),
+    }
+
+
+@cached_tool
+def financial_model(
+    assumptions: Dict[str, Any],
+    detail: str = "summary",
+    layout: str = "rows",
+    precision: int = 2,
+) -> Dict[str, Any]:
+    """Memoized implementation of run_financial_model, without the echo."""
+    precision = int(precision)
+    projection = project_scenarios([assumptions])
+    months = max(int(projection["months"][0]), 0)
+
+    result: Dict[str, Any] = {
+        "break_even_month": int(projection["break_even_month"][0]) or None,
+    }
+    result.update(_scenario_summary(projection, 0, layout, precision))
+
+    if detail == "full":
+        projections: Dict[str, List[Any]] = {
+            "month": list(range(1, months + 1)),
+            "users": [int(u) for u in projection["users"][0, :months].tolist()],
+        }
+        for key in ("revenue", "costs", "profit"):
+            projections[key] = [
+                _quantize(v, precision) for v in projection[key][0, :months].tolist()
+            ]
+        result["projections"] = (
+            projections if layout == "columns" else _columns_to_rows(projections)
+        )
+
+    return result
+
+
+# Assumptions that the sensitivity analysis perturbs.
+SENSITIVITY_KEYS = (
+    "monthly_growth_rate",
+    "arpu",
+    "fixed_costs",
+    "variable_cost_per_user",
+)
+SENSITIVITY_MAX_SAMPLES = 200_000
+# Scenarios simulated per work unit; bounds memory per process.
+_SIMULATION_CHUNK = 10_000
+_Z90 = 1.2815515655446004  # standard normal 90th percentile
+
+_simulation_pool: Optional[ProcessPoolExecutor] = None
+_simulation_pool_lock = threading.Lock()
+
+
+def _distribution_spec(
+    key: str, base: float, spread: float, override: Optional[Mapping[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Resolve and validate the sampling distribution for one assumption.
+
+    Raises:
+        ValueError / TypeError: unknown distribution, non-numeric or
+          non-finite parameters, sd < 0, or not low <= mode <= high.
+    """
+    spec: Dict[str, Any] = {
+        "distribution": "triangular",
+        "low": base - abs(base) * spread,
+        "mode": base,
+        "high": base + abs(base) * spread,
+    }
+    if override:
+        spec.update(override)
+    distribution = spec["distribution"]
+    if distribution == "normal":
+        spec.setdefault("mean", base)
+        spec.setdefault("sd", abs(base) * spread)
+        params = ("mean", "sd")
+    elif distribution == "uniform":
+        params = ("low", "high")
+    elif distribution == "triangular":
+        params = ("low", "mode", "high")
+    else:
+        raise ValueError(f"Unsupported distribution for {key}: {distribution!r}")
+    for name in params:
+        spec[name] = float(spec[name])
+        if not math.isfinite(spec[name]):
+            raise ValueError(f"{key}.{name} must be a finite number")
+    if distribution == "normal" and spec["sd"] < 0:
+        raise ValueError(f"{key}.sd must be >= 0, got {spec['sd']}")
+    if distribution == "uniform" and spec["low"] > spec["high"]:
+        raise ValueError(
+            f"{key} needs low <= high, got low={spec['low']}, high={spec['high']}"
+        )
+    if distribution == "triangular" and not (
+        spec["low"] <= spec["mode"] <= spec["high"]
+    ):
+        raise ValueError(
+            f"{key} needs low <= mode <= high, got low={spec['low']}, "
+            f"mode={spec['mode']}, high={spec['high']}"
+        )
+    return spec
+
+
+def _spec_bounds(spec: Mapping[str, Any]) -> tuple:
+    """10th and 90th percentile of a distribution spec (used for tornado bars)."""
+    if spec["distribution"] == "normal":
+        return (
+            spec["mean"] - _Z90 * spec["sd"],
+            spec["mean"] + _Z90 * spec["sd"],
+        )
+    low, high = spec["low"], spec["high"]
+    if spec["distribution"] == "uniform":
+        return low + 0.1 * (high - low), low + 0.9 * (high - low)
+    mode = spec["mode"]
+    width = high - low
+    if width <= 0:
+        return low, high
+    split = (mode - low) / width
+
+    def quantile(q: float) -> float:
+        if q < split:
+            return low + math.sqrt(q * width * (mode - low))
+        return high - math.sqrt((1 - q) * width * (high - mode))
+
+    return quantile(0.1), quantile(0.9)
+
+
+def _sample(spec: Mapping[str, Any], n: int, rng: np.random.Generator) -> np.ndarray:
+    if spec["distribution"] == "normal":
+        return rng.normal(spec["mean"], spec["sd"], n)
+    if spec["distribution"] == "uniform":
+        return rng.uniform(spec["low"], spec["high"], n)
+    low, mode, high = spec["low"], spec["mode"], spec["high"]
+    if high <= low:
+        return np.full(n, low)
+    return rng.triangular(low, mode, high, n)
+
+
+def _simulate_chunk(
+    base: Dict[str, float],
+    specs: Dict[str, Dict[str, Any]],
+    months: int,
+    n: int,
+    seed: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    """Process-pool work unit: sample and project one chunk of scenarios."""
+    rng = np.random.default_rng(seed)
+    sampled = {key: _sample(spec, n, rng) for key, spec in specs.items()}
+    # Keep samples inside the domain the model makes sense for.
+    sampled["monthly_growth_rate"] = np.maximum(sampled["monthly_growth_rate"], -0.99)
+    for key in ("arpu", "fixed_costs", "variable_cost_per_user"):
+        sampled[key] = np.maximum(sampled[key], 0.0)
+
+    projection = _project(
+        np.full(n, base["initial_users"]),
+        sampled["monthly_growth_rate"],
+        sampled["arpu"],
+        sampled["fixed_costs"],
+        sampled["variable_cost_per_user"],
+        np.full(n, months, dtype=np.int64),
+    )
+    return {
+        "revenue_by_year": _yearly_totals(projection["revenue"]),
+        "profit_by_year": _yearly_totals(projection["profit"]),
+        "break_even_month": projection["break_even_month"],
+    }
+
+
+def _get_simulation_pool() -> Optional[ProcessPoolExecutor]:
     """
-    months = int(assumptions.get("months", 36))
-    initial_users = float(assumptions.get("initial_users", 50))
-    growth = float(assumptions.get("monthly_growth_rate", 0.1))
-    arpu = float(assumptions.get("arpu", 5.0))
-    fixed_costs = float(assumptions.get("fixed_costs", 1500.0))
-    variable_cost_per_user = float(assumptions.get("variable_cost_per_user", 0.1))
-
-    users = initial_users
-    projections: List[Dict[str, Any]] = []
-    break_even_month = None
-
-    for month in range(1, months + 1):
-        if month > 1:
-            users *= (1.0 + growth)
-        # Round users for presentation
-        users_rounded = int(users)
-        revenue = users_rounded * arpu
-        costs = fixed_costs + users_rounded * variable_cost_per_user
-        profit = revenue - costs
-
-        projections.append(
+    Lazily start the shared process pool (None on single-core hosts).
+
+    Workers are started with forkserver (spawn where unavailable): forking
+    the server itself would copy its event loop, HTTP clients and writer
+    threads mid-flight.
+    """
+    global _simulation_pool
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    with _simulation_pool_lock:
+        if _simulation_pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            _simulation_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=context
+            )
+        return _simulation_pool
+
+
+def shutdown_simulation_pool() -> None:
+    """Stop the simulation worker processes (e.g. on server shutdown)."""
+    global _simulation_pool
+    with _simulation_pool_lock:
+        pool, _simulation_pool = _simulation_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_simulation_chunks(jobs: List[tuple]) -> List[Dict[str, np.ndarray]]:
+    """Run chunks on the process pool, falling back to in-process execution."""
+    global _simulation_pool
+    pool = _get_simulation_pool() if len(jobs) > 1 else None
+    if pool is not None:
+        try:
+            return list(pool.map(_simulate_chunk, *zip(*jobs)))
+        except (OSError, BrokenProcessPool):
+            with _simulation_pool_lock:
+                if _simulation_pool is pool:
+                    _simulation_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+    return [_simulate_chunk(*job) for job in jobs]
+
+
+def _bands(values: np.ndarray, percentiles: Sequence[int]) -> Dict[str, Any]:
+    """Percentile bands over axis 0, rounded for compact output."""
+    if values.size == 0:
+        return {f"p{p}": None for p in percentiles}
+    result = np.percentile(values, percentiles, axis=0)
+    return {
+        f"p{p}": np.round(row, 2).tolist() for p, row in zip(percentiles, result)
+    }
+
+
+async def run_sensitivity_analysis(
+    assumptions: Dict[str, Any],
+    distributions: Optional[Dict[str, Any]] = None,
+    spread: float = 0.2,
+    num_samples: int = 5000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Monte Carlo and sensitivity analysis around a financial model.
+
+    Samples growth, ARPU, fixed costs and variable cost per user, runs the
+    vectorized model for every sample (spread over a process pool for large
+    runs) and returns compact percentile bands instead of raw projections.
+
+    Args:
+        assumptions: same base assumptions accepted by run_financial_model.
+        distributions: optional per-assumption overrides, e.g.
+          {"arpu": {"distribution": "normal", "mean": 9, "sd": 2}} or
+          {"fixed_costs": {"distribution": "uniform", "low": 2000, "high": 4000}}.
+          Supported distributions: triangular (low/mode/high), uniform
+          (low/high), normal (mean/sd).
+        spread: relative +/- range of the default triangular distribution
+          used for assumptions without an override (0.2 = +/-20%).
+        num_samples: number of Monte Carlo scenarios (max 200,000).
+        seed: random seed, so repeated calls return identical results.
+
+    Returns:
+        dict with:
+          - num_samples, months, base_total_profit
+          - break_even_probability: share of scenarios that break even
+          - bands: P10/P50/P90 of revenue_by_year, profit_by_year,
+            total_profit and break_even_month (among scenarios that break even)
+          - tornado: assumptions ranked by swing in total profit when moved
+            between their P10 and P90 values, others held at base
+          - error (only if a distribution override is invalid)
+    """
+    # The simulation (and the wait on its process pool) runs off the event
+    # loop; sensitivity_analysis() holds the cache.
+    return await asyncio.to_thread(
+        sensitivity_analysis, assumptions, distributions, spread, num_samples, seed
+    )
+
+
+@cached_tool
+def sensitivity_analysis(
+    assumptions: Dict[str, Any],
+    distributions: Optional[Dict[str, Any]] = None,
+    spread: float = 0.2,
+    num_samples: int = 5000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Blocking, memoized implementation of run_sensitivity_analysis."""
+    distributions = distributions or {}
+    num_samples = max(1, min(int(num_samples), SENSITIVITY_MAX_SAMPLES))
+    months = int(assumptions.get("months", DEFAULT_MONTHS))
+    base = {
+        key: float(assumptions.get(key, default))
+        for key, default in ASSUMPTION_DEFAULTS.items()
+    }
+    try:
+        spread = float(spread)
+        specs = {
+            key: _distribution_spec(key, base[key], spread, distributions.get(key))
+            for key in SENSITIVITY_KEYS
+        }
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        return {"error": f"Invalid distributions: {e}"}
+
+    sizes = [_SIMULATION_CHUNK] * (num_samples // _SIMULATION_CHUNK)
+    if num_samples % _SIMULATION_CHUNK:
+        sizes.append(num_samples % _SIMULATION_CHUNK)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(base, specs, months, size, child) for size, child in zip(sizes, seeds)]
+    chunks = _run_simulation_chunks(jobs)
+
+    revenue_by_year = np.concatenate([c["revenue_by_year"] for c in chunks])
+    profit_by_year = np.concatenate([c["profit_by_year"] for c in chunks])
+    break_even = np.concatenate([c["break_even_month"] for c in chunks])
+    percentiles = (10, 50, 90)
+
+    # Tornado: one-at-a-time swings, all evaluated in a single vectorized pass.
+    scenarios = [dict(base)]
+    for key in SENSITIVITY_KEYS:
+        for bound in _spec_bounds(specs[key]):
+            scenarios.append({**base, key: bound})
+    scenario_arrays = {
+        key: np.array([s[key] for s in scenarios]) for key in ASSUMPTION_DEFAULTS
+    }
+    swing = _project(
+        scenario_arrays["initial_users"],
+        scenario_arrays["monthly_growth_rate"],
+        scenario_arrays["arpu"],
+        scenario_arrays["fixed_costs"],
+        scenario_arrays["variable_cost_per_user"],
+        np.full(len(scenarios), months, dtype=np.int64),
+    )
+    total_profit = swing["profit"].sum(axis=1)
+    tornado = []
+    for i, key in enumerate(SENSITIVITY_KEYS):
+        low_value, high_value = _spec_bounds(specs[key])
+        at_low, at_high = total_profit[1 + 2 * i], total_profit[2 + 2 * i]
+        tornado.append(
             {
-                "month": month,
-                "users": users_rounded,
-                "revenue": round(revenue, 2),
-                "costs": round(costs, 2),
-                "profit": round(profit, 2),
+                "assumption": key,
+                "low_value": round(low_value, 4),
+                "high_value": round(high_value, 4),
+                "total_profit_at_low": round(float(at_low), 2),
+                "total_profit_at_high": round(float(at_high), 2),
+                "swing": round(float(abs(at_high - at_low)), 2),
             }
         )
-
-        if break_even_month is None and profit >= 0:
-            break_even_month = month
+    tornado.sort(key=lambda row: row["swing"], reverse=True)
 
     return {
-        "assumptions": assumptions,
-        "projections": projections,
-        "break_even_month": break_even_month,
+        "num_samples": num_samples,
+        "months": months,
+        "base_total_profit": round(float(total_profit[0]), 2),
+        "break_even_probability": round(float((break_even > 0).mean()), 4),
+        "bands": {
+            "revenue_by_year": _bands(revenue_by_year, percentiles),
+            "profit_by_year": _bands(profit_by_year, percentiles),
+            "total_profit": _bands(profit_by_year.sum(axis=1), percentiles),
+            "break_even_month": _bands(break_even[break_even > 0], percentiles),
+        },
+        "tornado": tornado,
     }
 
 
@@ -88,6 +806,7 @@ def export_plan(plan_markdown: str, format: str = "markdown") -> Dict[str, Any]:
     return {"path": path, "format": format}
 
 
+@cached_tool
 def save_business_profile(profile_json: str) -> Dict[str, Any]:
     """
     Simple tool to acknowledge saving a structured business profile.
@@ -0,0 +1,389 @@
+"""
+OpenTelemetry tracing of agent runs.
+
+TracingPlugin is an ADK plugin that turns one generation into one trace:
+
+- a span per run (Runner.run_async), with the pipeline's stage runs and
+  the section runs nested under the agent that started them,
+- a span per agent turn, model call and tool call (google_search,
+  run_financial_model, export_plan, ...),
+- model spans carry token counts, time to first token, and the tries,
+  retries, hedging and quota wait recorded by deadlines.call().
+
+Spans go to the plugin's own TracerProvider (not the global one), so they
+do not mix with ADK's built-in spans. Set VENTUREARCHITECT_TRACING to
+"console" (pretty JSON on stdout) or to a file path (one JSON span per
+line) to enable it; runners.default_plugins() then attaches the plugin.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.trace import Span, Status, StatusCode
+
+from . import deadlines
+
+# Span of the run, agent or tool currently executing in this context, so
+# runs started from inside it (pipeline stages, sections) nest under it.
+_active: ContextVar[Optional[Span]] = ContextVar(
+    "venturearchitect_active_span", default=None
+)
+
+
+class _OpenSpan:
+    """A started span and what is needed to finish it."""
+
+    def __init__(self, span: Span, token: Optional[Token] = None):
+        self.span = span
+        self.token = token
+        self.started = time.perf_counter()
+        self.first_response: Optional[float] = None
+        self.record: Optional[deadlines.CallRecord] = None
+
+
+class TracingPlugin(BasePlugin):
+    """
+    Emits OpenTelemetry spans for runs, agent turns, model and tool calls.
+
+    Args:
+        tracer_provider: where spans go (see default_tracer_provider()).
+        max_open_spans: spans of runs that never finished (e.g. cancelled)
+            are ended, oldest first, beyond this many open spans.
+    """
+
+    def __init__(self, tracer_provider: Any, max_open_spans: int = 10_000):
+        super().__init__(name="venturearchitect_tracing")
+        self.tracer_provider = tracer_provider
+        self.tracer = tracer_provider.get_tracer("venturearchitect")
+        self.max_open_spans = max_open_spans
+        self._open: "OrderedDict[Hashable, _OpenSpan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # Span bookkeeping
+    # ------------------------------------------------------------
+
+    def _start(
+        self,
+        key: Hashable,
+        name: str,
+        parent: Optional[Span],
+        attributes: Dict[str, Any],
+        activate: bool = True,
+    ) -> _OpenSpan:
+        # No parent: a new trace, even if another tracer has a current span.
+        ctx = trace.set_span_in_context(parent) if parent else otel_context.Context()
+        span = self.tracer.start_span(name, context=ctx, attributes=attributes)
+        opened = _OpenSpan(span, _active.set(span) if activate else None)
+        with self._lock:
+            self._open[key] = opened
+            while len(self._open) > self.max_open_spans:
+                _, abandoned = self._open.popitem(last=False)
+                abandoned.span.set_status(Status(StatusCode.ERROR, "abandoned"))
+                abandoned.span.end()
+        return opened
+
+    def _get(self, key: Hashable) -> Optional[_OpenSpan]:
+        with self._lock:
+            return self._open.get(key)
+
+    def _end(
+        self, key: Hashable, error: Optional[BaseException] = None
+    ) -> Optional[_OpenSpan]:
+        with self._lock:
+            opened = self._open.pop(key, None)
+        if opened is None:
+            return None
+        if error is not None:
+            opened.span.record_exception(error)
+            opened.span.set_status(
+                Status(StatusCode.ERROR, f"{type(error).__name__}: {error}")
+            )
+        opened.span.end()
+        if opened.token is not None:
+            try:
+                _active.reset(opened.token)
+            except ValueError:
+                pass  # ended from another context; nothing to restore there
+        return opened
+
+    def _end_invocation(
+        self, invocation_id: str, error: Optional[BaseException] = None
+    ) -> None:
+        """End the run span and anything of that run still open."""
+        with self._lock:
+            keys = [
+                key
+                for key in self._open
+                if key[1] == invocation_id and key[0] != "run"
+            ]
+        for key in reversed(keys):
+            self._end(key, RuntimeError("unfinished when its run ended"))
+        self._end(("run", invocation_id), error)
+
+    def _agent_span(self, invocation_id: str, agent_name: str) -> Optional[Span]:
+        opened = self._get(("agent", invocation_id, agent_name))
+        return opened.span if opened else _active.get()
+
+    # ------------------------------------------------------------
+    # Runs and agents
+    # ------------------------------------------------------------
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        session = invocation_context.session
+        self._start(
+            ("run", invocation_context.invocation_id),
+            f"run {invocation_context.agent.name}",
+            _active.get(),
+            {
+                "venturearchitect.app_name": session.app_name,
+                "venturearchitect.session_id": session.id,
+                "venturearchitect.invocation_id": invocation_context.invocation_id,
+                "gen_ai.agent.name": invocation_context.agent.name,
+            },
+        )
+        return None
+
+    async def after_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> None:
+        self._end_invocation(invocation_context.invocation_id)
+
+    async def on_run_error_callback(
+        self, *, invocation_context: InvocationContext, error: Exception
+    ) -> None:
+        self._end_invocation(invocation_context.invocation_id, error)
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        invocation_id = callback_context.invocation_id
+        parent = None
+        if agent.parent_agent is not None:
+            parent = self._get(("agent", invocation_id, agent.parent_agent.name))
+        self._start(
+            ("agent", invocation_id, agent.name),
+            f"agent {agent.name}",
+            parent.span if parent else _active.get(),
+            {"gen_ai.agent.name": agent.name},
+        )
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        self._end(("agent", callback_context.invocation_id, agent.name))
+        return None
+
+    async def on_agent_error_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext, error: Exception
+    ) -> None:
+        self._end(("agent", callback_context.invocation_id, agent.name), error)
+
+    # ------------------------------------------------------------
+    # Model calls
+    # ------------------------------------------------------------
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        invocation_id = callback_context.invocation_id
+        agent_name = callback_context.agent_name
+        opened = self._start(
+            ("model", invocation_id, agent_name),
+            f"generate_content {llm_request.model}",
+            self._agent_span(invocation_id, agent_name),
+            {
+                "gen_ai.operation.name": "generate_content",
+                "gen_ai.request.model": llm_request.model or "",
+                "gen_ai.agent.name": agent_name,
+            },
+            activate=False,
+        )
+        # Filled in by deadlines.call() during this call.
+        opened.record = deadlines.record_call()
+        return None
+
+    def _finish_model(
+        self, key: Hashable, opened: _OpenSpan, error: Optional[BaseException]
+    ) -> None:
+        span = opened.span
+        if opened.first_response is not None:
+            span.set_attribute(
+                "venturearchitect.time_to_first_token_seconds",
+                round(opened.first_response - opened.started, 4),
+            )
+        record = opened.record
+        if record is not None:
+            span.set_attribute("venturearchitect.model.tries", record.tries)
+            span.set_attribute("venturearchitect.model.retries", record.retries)
+            span.set_attribute("venturearchitect.model.hedged", record.hedged)
+            span.set_attribute(
+                "venturearchitect.model.quota_wait_seconds",
+                round(record.quota_wait_seconds, 4),
+            )
+        self._end(key, error)
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        opened = self._get(key)
+        if opened is None:
+            return None
+        if opened.first_response is None and llm_response.content:
+            opened.first_response = time.perf_counter()
+        if llm_response.partial:
+            return None  # streamed chunk; the span ends with the final response
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            for attribute, value in (
+                ("gen_ai.usage.input_tokens", usage.prompt_token_count),
+                ("gen_ai.usage.output_tokens", usage.candidates_token_count),
+                ("venturearchitect.usage.total_tokens", usage.total_token_count),
+            ):
+                if value is not None:
+                    opened.span.set_attribute(attribute, value)
+        if llm_response.finish_reason is not None:
+            opened.span.set_attribute(
+                "gen_ai.response.finish_reasons", [str(llm_response.finish_reason)]
+            )
+        error = None
+        if llm_response.error_code:
+            error = RuntimeError(
+                f"{llm_response.error_code}: {llm_response.error_message}"
+            )
+        self._finish_model(key, opened, error)
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> None:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        opened = self._get(key)
+        if opened is not None:
+            self._finish_model(key, opened, error)
+        return None
+
+    # ------------------------------------------------------------
+    # Tool calls
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _tool_key(tool_context: ToolContext) -> Tuple[str, str, str]:
+        return ("tool", tool_context.invocation_id, tool_context.function_call_id)
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        self._start(
+            self._tool_key(tool_context),
+            f"execute_tool {tool.name}",
+            self._agent_span(tool_context.invocation_id, tool_context.agent_name),
+            {
+                "gen_ai.operation.name": "execute_tool",
+                "gen_ai.tool.name": tool.name,
+                "gen_ai.tool.call.id": tool_context.function_call_id or "",
+                "gen_ai.agent.name": tool_context.agent_name,
+            },
+        )
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+        result: Dict[str, Any],
+    ) -> None:
+        self._end(self._tool_key(tool_context))
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        self._end(self._tool_key(tool_context), error)
+        return None
+
+    async def close(self) -> None:
+        # Shared by every runner: flush, but keep exporting.
+        self.tracer_provider.force_flush()
+
+
+def default_tracer_provider() -> Optional[Any]:
+    """
+    TracerProvider configured from the environment, or None.
+
+    VENTUREARCHITECT_TRACING: "console" prints spans as JSON to stdout; any
+    other value is a file that gets one JSON span per line. Unset disables
+    tracing. Spans are exported in batches from a background thread.
+    """
+    target = os.getenv("VENTUREARCHITECT_TRACING")
+    if not target:
+        return None
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+    )
+
+    if target == "console":
+        exporter = ConsoleSpanExporter(out=sys.stdout)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        exporter = ConsoleSpanExporter(
+            out=open(target, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": "venturearchitect"})
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider
+
+
+_plugin: Optional[TracingPlugin] = None
+_plugin_lock = threading.Lock()
+
+
+def tracing_plugins() -> List[BasePlugin]:
+    """
+    [the process-wide TracingPlugin] when VENTUREARCHITECT_TRACING is set,
+    else []. Nested runners (pipeline stages, sections) use the same one.
+    """
+    global _plugin
+    with _plugin_lock:
+        if _plugin is None:
+            provider = default_tracer_provider()
+            if provider is None:
+                return []
+            _plugin = TracingPlugin(provider)
+    return [_plugin]
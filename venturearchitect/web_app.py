@@ -1,18 +1,40 @@
+import asyncio
+import json
 import os
+import threading
+import time
 import uuid
+from contextlib import aclosing, asynccontextmanager
 from textwrap import dedent
+from typing import Any, AsyncGenerator, Callable, Dict, List, Literal, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.plugins.logging_plugin import LoggingPlugin
-from google.genai import types
-
-from venturearchitect.agents.root_agent import venture_architect_root_agent
+# google.adk, the agents and the session service are imported on first use
+# (see get_session_service() / get_runner()), which keeps this import cheap.
+from venturearchitect.admission import (
+    Admission,
+    TokenBucket,
+    default_admission_controller,
+    default_trusted_proxies,
+    user_key,
+)
+from venturearchitect.coalescing import coalesce_key, default_single_flight
+from venturearchitect.deadlines import DeadlineExceeded, deadline, retry_stats
+from venturearchitect.event_log import debug_capture, shared_event_log
+from venturearchitect.http_pool import http_clients
+from venturearchitect.idea_index import IdeaIndex, seed_prompt
+from venturearchitect.jobs import (
+    FINISHED_STATUSES,
+    Job,
+    JobQueue,
+    QueueFullError,
+    default_job_store,
+)
+from venturearchitect.quota import shared_rate_limiter
 
 # ------------------------------------------------------------
 # Environment / App Init
@@ -20,19 +42,131 @@ from venturearchitect.agents.root_agent import venture_architect_root_agent
 
 load_dotenv()
 
+APP_NAME = "agents"  # must match when creating sessions
+
+# Shared session service (IMPORTANT: one instance), built on first use.
+# In-memory, with TTL / max-count eviction so finished sessions cannot pile
+# up, or on disk with VENTUREARCHITECT_SESSION_DB.
+_session_service = None
+
+# One runner per mode, built on first use:
+# "single": root agent; "pipeline": discovery -> research/strategy/financial
+# -> narrative; "sections": same pipeline, narrative written section by
+# section in parallel
+RUNNERS: Dict[str, Any] = {}
+
+# Past ideas (with their profiles and plans) for near-duplicate lookups,
+# loaded on first use (or by warm_up()).
+_idea_index: Optional[IdeaIndex] = None
+
+
+def get_session_service():
+    global _session_service
+    if _session_service is None:
+        from venturearchitect.sessions import default_session_service
+
+        _session_service = default_session_service()
+    return _session_service
+
+
+_idea_index_lock = threading.Lock()
+
+
+def get_idea_index() -> IdeaIndex:
+    global _idea_index
+    with _idea_index_lock:  # first used from worker threads
+        if _idea_index is None:
+            _idea_index = IdeaIndex()
+    return _idea_index
+
+
+def get_runner(mode: str):
+    """Runner for a mode; imports and builds its agent the first time."""
+    runner = RUNNERS.get(mode)
+    if runner is None:
+        from venturearchitect.runners import build_runner
+
+        runner = RUNNERS[mode] = build_runner(
+            mode, get_session_service(), app_name=APP_NAME
+        )
+    return runner
+
+
+def warm_up(modes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Load the idea index and build the session service, the runners for
+    `modes` (default: every mode) and their model API clients now instead
+    of on the first request.
+
+    Call it from the serving event loop: ADK caches model API clients per
+    event loop.
+
+    Returns:
+        seconds spent per step, and what warm_up_agent() built per mode.
+    """
+    from venturearchitect.runners import AGENTS, warm_up_agent
+
+    report: Dict[str, Any] = {}
+    start = time.perf_counter()
+    get_idea_index()
+    report["idea_index_seconds"] = round(time.perf_counter() - start, 3)
+    start = time.perf_counter()
+    get_session_service()
+    report["session_service_seconds"] = round(time.perf_counter() - start, 3)
+    for mode in modes or list(AGENTS):
+        start = time.perf_counter()
+        counts = warm_up_agent(get_runner(mode).agent)
+        report[mode] = {"seconds": round(time.perf_counter() - start, 3), **counts}
+    return report
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up before serving (VENTUREARCHITECT_WARM_UP: "0" to skip, or a
+    comma-separated list of modes; default every mode), then on shutdown
+    stop the job workers, close the runners (flushing sessions), the shared
+    HTTP connections and the simulation worker processes.
+    """
+    setting = os.getenv("VENTUREARCHITECT_WARM_UP", "all")
+    if setting != "0":
+        # Runs on the serving loop, before the server accepts requests.
+        warm_up(None if setting == "all" else setting.split(","))
+    yield
+    await job_queue.stop()
+    for runner in RUNNERS.values():
+        await runner.close()
+    await http_clients.aclose()
+    from venturearchitect.tools import shutdown_simulation_pool
+
+    await asyncio.to_thread(shutdown_simulation_pool)
+
+
 app = FastAPI(
     title="VentureArchitect – Business Plan Copilot",
     description="Web UI for generating professional business plans.",
+    lifespan=lifespan,
 )
 
-# Shared session service + runner (IMPORTANT: one instance)
-session_service = InMemorySessionService()
 
-runner = Runner(
-    agent=venture_architect_root_agent,
-    app_name="agents",  # must match when creating sessions
-    session_service=session_service,
-    plugins=[LoggingPlugin()],
+# Global concurrency limit, per-user rate limits and degrade threshold;
+# users are keyed by client address or, behind a trusted proxy, its headers.
+admission = default_admission_controller()
+trusted_proxies = default_trusted_proxies()
+
+# Identical concurrent requests share one run: plans (/generate, /jobs) and
+# SSE streams (/generate/stream) are coalesced separately.
+plan_flights = default_single_flight()
+stream_flights = default_single_flight()
+
+# Time a generation may take, model retries included; "0" for no deadline.
+# Requests can ask for less (or more) with "deadline_seconds".
+DEADLINE_SECONDS = float(os.getenv("VENTUREARCHITECT_DEADLINE_SECONDS", "300"))
+
+# Appended to the prompt of degraded (high-load) requests
+BRIEF_PLAN_DIRECTIVE = (
+    "\n\nThe service is under heavy load: write a BRIEF plan (about 800 "
+    "words) that still covers every required section in a few sentences."
 )
 
 # ------------------------------------------------------------
@@ -41,6 +175,32 @@ runner = Runner(
 
 class GenerateRequest(BaseModel):
     idea: str
+    # "single": monolithic root agent; "pipeline": parallel specialist agents;
+    # "sections": pipeline with section-parallel narrative generation
+    mode: Literal["single", "pipeline", "sections"] = "single"
+    # What to do when a near-duplicate of a past idea is found:
+    # "none": just report it; "return": return the stored plan instead of
+    # generating; "seed": generate, using the stored profile as reference
+    reuse: Literal["none", "return", "seed"] = "none"
+    # Overrides VENTUREARCHITECT_DEADLINE_SECONDS for this request
+    deadline_seconds: Optional[float] = None
+    # Log this run in full (every record, untruncated), whatever the sampling
+    debug: bool = False
+
+
+class JobRequest(GenerateRequest):
+    # Queued jobs are served high -> normal -> low, first come first served
+    priority: Literal["high", "normal", "low"] = "normal"
+
+
+class BatchRequest(BaseModel):
+    ideas: List[str]
+    mode: Literal["single", "pipeline", "sections"] = "single"
+    reuse: Literal["none", "return", "seed"] = "none"
+    # Ideas of this batch generated at once (capped by BATCH_MAX_CONCURRENCY)
+    concurrency: Optional[int] = None
+    # Deadline of each idea (default VENTUREARCHITECT_DEADLINE_SECONDS)
+    deadline_seconds: Optional[float] = None
 
 
 # ------------------------------------------------------------
@@ -168,7 +328,7 @@ Ready to generate your plan. Describe your idea on the left and click “Generat
                 output.textContent = "Thinking through market, strategy, and financials...";
 
                 try {
-                    const resp = await fetch("/generate", {
+                    const resp = await fetch("/generate/stream", {
                         method: "POST",
                         headers: { "Content-Type": "application/json" },
                         body: JSON.stringify({ idea }),
@@ -179,10 +339,50 @@ Ready to generate your plan. Describe your idea on the left and click “Generat
                         throw new Error(err.error || `Request failed with status ${resp.status}`);
                     }
 
-                    const data = await resp.json();
-                    output.textContent = data.plan || "(No content returned from agent.)";
-                    statusEl.textContent = "Plan generated successfully.";
-                    copyBtn.disabled = false;
+                    // Render the plan as it streams in (Server-Sent Events over fetch).
+                    const reader = resp.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = "";
+                    let streamed = "";
+                    let done = false;
+
+                    const handle = (name, data) => {
+                        if (name === "delta") {
+                            if (!streamed) output.textContent = "";
+                            streamed += data.text;
+                            output.textContent = streamed;
+                            statusEl.textContent = "Writing the plan...";
+                        } else if (name === "stage") {
+                            statusEl.textContent =
+                                `Finished ${data.name} (${data.seconds.toFixed(1)}s${data.cached ? ", cached" : ""})...`;
+                        } else if (name === "done") {
+                            output.textContent = data.plan || "(No content returned from agent.)";
+                            statusEl.textContent = "Plan generated successfully.";
+                            copyBtn.disabled = false;
+                            done = true;
+                        } else if (name === "error") {
+                            throw new Error(data.error || "Generation failed.");
+                        }
+                    };
+
+                    while (true) {
+                        const { value, done: finished } = await reader.read();
+                        if (finished) break;
+                        buffer += decoder.decode(value, { stream: true });
+                        let boundary;
+                        while ((boundary = buffer.indexOf("\\n\\n")) !== -1) {
+                            const frame = buffer.slice(0, boundary);
+                            buffer = buffer.slice(boundary + 2);
+                            let name = "message";
+                            let data = "";
+                            for (const line of frame.split("\\n")) {
+                                if (line.startsWith("event: ")) name = line.slice(7);
+                                else if (line.startsWith("data: ")) data += line.slice(6);
+                            }
+                            if (data) handle(name, JSON.parse(data));
+                        }
+                    }
+                    if (!done) throw new Error("The stream ended before the plan was finished.");
                 } catch (e) {
                     console.error(e);
                     output.textContent = "Error while generating plan. Check server logs.";
@@ -222,55 +422,622 @@ async def index() -> HTMLResponse:
     return HTMLResponse(HTML_PAGE)
 
 
-@app.post("/generate")
-async def generate(request: GenerateRequest):
+async def _lookup_similar(request: GenerateRequest, idea: str) -> Dict[str, Any]:
     """
-    Generate a long, formal business plan from the user's idea using the root agent.
+    Near-duplicate lookup; returns similar_ideas, the best match's stored
+    record (only read when the request reuses it) and the prompt.
+
+    Runs in a worker thread: the first lookup loads the index, and reading
+    the match touches the disk.
     """
+    return await asyncio.to_thread(_find_similar, request, idea)
 
-    idea = request.idea.strip()
-    if not idea:
-        return JSONResponse({"error": "Idea cannot be empty."}, status_code=400)
 
-    # In a browser UI you typically want a stable user ID.
-    user_id = "web_user"
+def _find_similar(request: GenerateRequest, idea: str) -> Dict[str, Any]:
+    index = get_idea_index()
+    similar_ideas = index.query(idea)
+    match = None
+    if similar_ideas and request.reuse != "none":
+        match = index.get(similar_ideas[0]["id"])
+    prompt = seed_prompt(idea, match) if request.reuse == "seed" and match else idea
+    return {"similar_ideas": similar_ideas, "match": match, "prompt": prompt}
+
 
-    # Option 1: single long-lived session id
-    # session_id = "web_session"
-    # Option 2: per-request unique session to keep each generation isolated
-    session_id = f"web_session_{uuid.uuid4()}"
+def _reused_body(request: GenerateRequest, lookup: Dict[str, Any]) -> Optional[dict]:
+    """Response for reuse="return" when the best match has a stored plan."""
+    match = lookup["match"]
+    if request.reuse != "return" or not match or not match.get("plan"):
+        return None
+    return {
+        "plan": match["plan"],
+        "mode": request.mode,
+        "reused_from": lookup["similar_ideas"][0],
+        "similar_ideas": lookup["similar_ideas"],
+    }
 
+
+async def _new_session(user_id: str):
+    # Per-request unique session to keep each generation isolated.
     # --- IMPORTANT: Ensure the session exists BEFORE calling runner.run_async ---
-    session = await session_service.create_session(
-        app_name=runner.app_name,
+    return await get_session_service().create_session(
+        app_name=APP_NAME,
         user_id=user_id,
-        session_id=session_id,
+        session_id=f"web_session_{uuid.uuid4()}",
+    )
+
+
+async def _end_session(session) -> None:
+    # The plan is returned to the caller, so the session history can go,
+    # unless sessions are kept on disk (VENTUREARCHITECT_SESSION_DB).
+    session_service = get_session_service()
+    if getattr(session_service, "durable", False):
+        await session_service.flush()
+        return
+    await session_service.delete_session(
+        app_name=session.app_name, user_id=session.user_id, session_id=session.id
+    )
+
+
+async def _plan_body(
+    request: GenerateRequest,
+    idea: str,
+    lookup: Dict[str, Any],
+    plan: str,
+    pipeline: Optional[Dict[str, Any]],
+) -> dict:
+    """
+    Index the finished plan and build the response body. `pipeline` is the
+    custom metadata of a pipeline run's final event (timings, profile and
+    evaluation), None for the single agent.
+    """
+    pipeline = pipeline or {}
+    # Appends to the index file: off the event loop.
+    await asyncio.to_thread(
+        lambda: get_idea_index().add(
+            idea,
+            profile=pipeline.get("profile"),
+            plan=plan,
+            metadata={
+                "mode": request.mode,
+                "degraded": bool(lookup.get("degraded")),
+            },
+        )
     )
+    body = {
+        "plan": plan,
+        "mode": request.mode,
+        "similar_ideas": lookup["similar_ideas"],
+    }
+    if request.reuse == "seed" and lookup["match"]:
+        body["seeded_from"] = lookup["similar_ideas"][0]
+    if lookup.get("degraded"):
+        body["degraded"] = True
+    if "pipeline" in pipeline:
+        body["stage_timings"] = pipeline["pipeline"]
+    if "evaluation" in pipeline:
+        body["evaluation"] = pipeline["evaluation"]
+    return body
+
+
+async def _run_generation(
+    request: GenerateRequest,
+    idea: str,
+    lookup: Dict[str, Any],
+    on_stage: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Optional[dict]:
+    """
+    Run the selected agent to completion and return the response body
+    (None if the agent produced no final text). `on_stage` is called with
+    each pipeline stage's progress metadata.
+    """
+    # In a browser UI you typically want a stable user ID.
+    user_id = "web_user"
+    session = await _new_session(user_id)
 
     # Build content for ADK
+    from google.genai import types
+
     content = types.Content(
         role="user",
-        parts=[types.Part(text=idea)],
+        parts=[types.Part(text=lookup["prompt"])],
     )
 
+    selected_runner = get_runner(request.mode)
     final_chunks: list[str] = []
+    pipeline = None
 
-    # Stream all events from the agent run
-    async for event in runner.run_async(
-        user_id=user_id,
-        session_id=session.id,  # use the ID from the created session
-        new_message=content,
-    ):
-        if event.is_final_response() and event.content:
-            for part in event.content.parts:
-                if getattr(part, "text", None):
-                    final_chunks.append(part.text)
+    # Stream all events from the agent run; every model call made for it
+    # (and its retries) must finish within the request's deadline.
+    try:
+        with deadline(_deadline_seconds(request)), debug_capture(request.debug):
+            async for event in selected_runner.run_async(
+                user_id=user_id,
+                session_id=session.id,  # use the ID from the created session
+                new_message=content,
+            ):
+                if event.custom_metadata and "stage" in event.custom_metadata:
+                    if on_stage is not None:
+                        on_stage(event.custom_metadata["stage"])
+                if event.custom_metadata and "pipeline" in event.custom_metadata:
+                    pipeline = event.custom_metadata
+                if event.is_final_response() and event.content:
+                    for part in event.content.parts:
+                        if getattr(part, "text", None):
+                            final_chunks.append(part.text)
+    finally:
+        await _end_session(session)
 
     if not final_chunks:
+        return None
+    plan = "\n".join(final_chunks)
+    return await _plan_body(request, idea, lookup, plan, pipeline)
+
+
+def _user_key(http_request: Request) -> str:
+    """Caller identity for per-user rate limits (see admission.user_key)."""
+    client = http_request.client.host if http_request.client else None
+    return user_key(client, http_request.headers, trusted_proxies)
+
+
+def _rejection(decision: Admission) -> JSONResponse:
+    return JSONResponse(
+        {"error": decision.reason, "retry_after": decision.retry_after},
+        status_code=decision.status,
+        headers=decision.headers(),
+    )
+
+
+def _deadline_seconds(request: GenerateRequest) -> Optional[float]:
+    """The request's deadline, else the default (None: no deadline)."""
+    seconds = request.deadline_seconds
+    return (DEADLINE_SECONDS if seconds is None else seconds) or None
+
+
+def _flight_key(request: GenerateRequest, idea: str) -> str:
+    return coalesce_key(
+        idea, mode=request.mode, reuse=request.reuse, debug=request.debug
+    )
+
+
+def _degrade(request: GenerateRequest, lookup: Dict[str, Any]) -> GenerateRequest:
+    """Shorter, single-agent plan for requests admitted under heavy load."""
+    lookup["prompt"] += BRIEF_PLAN_DIRECTIVE
+    lookup["degraded"] = True
+    return request.model_copy(update={"mode": "single"})
+
+
+@app.post("/generate")
+async def generate(request: GenerateRequest, http_request: Request):
+    """
+    Generate a long, formal business plan from the user's idea, using either the
+    root agent or the parallel pipeline depending on `request.mode`.
+    """
+
+    idea = request.idea.strip()
+    if not idea:
+        return JSONResponse({"error": "Idea cannot be empty."}, status_code=400)
+
+    lookup = await _lookup_similar(request, idea)
+    reused = _reused_body(request, lookup)
+    if reused is not None:
+        return JSONResponse(reused)
+
+    key = _flight_key(request, idea)
+    decision = None
+    if not plan_flights.in_flight(key):
+        # Only a request that starts a run takes a concurrency slot.
+        decision = admission.admit(_user_key(http_request))
+        if not decision.admitted:
+            return _rejection(decision)
+        if decision.degraded:
+            request = _degrade(request, lookup)
+
+    async def generate_plan() -> Optional[dict]:
+        try:
+            return await _run_generation(request, idea, lookup)
+        finally:
+            admission.release(decision)
+
+    try:
+        body, shared = await plan_flights.run(key, generate_plan)
+    except DeadlineExceeded as e:
+        return JSONResponse({"error": str(e)}, status_code=504)
+    if body is None:
         return JSONResponse(
             {"error": "No final response content was produced by the agent."},
             status_code=500,
         )
+    return JSONResponse(dict(body, coalesced=True) if shared else body)
 
-    plan = "\n".join(final_chunks)
-    return JSONResponse({"plan": plan})
+
+# Frames buffered between the agent run and a slow client before the run is
+# paused (back-pressure), and idle time before a keep-alive comment is sent.
+STREAM_QUEUE_SIZE = 32
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_plan(
+    request: GenerateRequest,
+    idea: str,
+    lookup: Dict[str, Any],
+    decision: Optional[Admission] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    SSE frames for one generation.
+
+    Events: "start" (similar ideas), "stage" (pipeline progress), "delta"
+    (partial plan text), "done" (the same body /generate returns) and
+    "error". The agent run is driven by a producer task feeding a bounded
+    queue, so it pauses while the client is not reading, and is cancelled
+    when the client disconnects. The admission `decision` is released
+    when the stream ends.
+    """
+    try:
+        # Closed right away (not when collected), which cancels the run.
+        async with aclosing(_stream_frames(request, idea, lookup)) as frames:
+            async for frame in frames:
+                yield frame
+    finally:
+        if decision is not None:
+            admission.release(decision)
+
+
+async def _stream_frames(
+    request: GenerateRequest, idea: str, lookup: Dict[str, Any]
+) -> AsyncGenerator[str, None]:
+    yield _sse(
+        "start", {"mode": request.mode, "similar_ideas": lookup["similar_ideas"]}
+    )
+    reused = _reused_body(request, lookup)
+    if reused is not None:
+        yield _sse("done", reused)
+        return
+
+    user_id = "web_user"
+    session = await _new_session(user_id)
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.genai import types
+
+    content = types.Content(role="user", parts=[types.Part(text=lookup["prompt"])])
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    async def produce() -> None:
+        final_chunks: list[str] = []
+        pipeline = None
+        try:
+            events = get_runner(request.mode).run_async(
+                user_id=user_id,
+                session_id=session.id,
+                new_message=content,
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+            )
+            with deadline(_deadline_seconds(request)), debug_capture(
+                request.debug
+            ):
+                async with aclosing(events):
+                    async for event in events:
+                        metadata = event.custom_metadata or {}
+                        if "stage" in metadata:
+                            await queue.put(_sse("stage", metadata["stage"]))
+                        if "pipeline" in metadata:
+                            pipeline = metadata
+                        parts = event.content.parts if event.content else None
+                        texts = [
+                            p.text for p in parts or [] if getattr(p, "text", None)
+                        ]
+                        if event.partial:
+                            for text in texts:
+                                await queue.put(_sse("delta", {"text": text}))
+                        elif event.is_final_response():
+                            final_chunks.extend(texts)
+            if final_chunks:
+                plan = "\n".join(final_chunks)
+                body = await _plan_body(request, idea, lookup, plan, pipeline)
+                await queue.put(_sse("done", body))
+            else:
+                error = "No final response content was produced by the agent."
+                await queue.put(_sse("error", {"error": error}))
+        except Exception as e:
+            await queue.put(_sse("error", {"error": f"{type(e).__name__}: {e}"}))
+        finally:
+            await _end_session(session)
+        # Not reached when cancelled: the consumer is gone by then.
+        await queue.put(None)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"  # stops proxies timing out idle streams
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        # Client went away (or the stream finished): stop the agent run.
+        task.cancel()
+
+
+@app.post("/generate/stream")
+async def generate_stream(request: GenerateRequest, http_request: Request):
+    """
+    Same as /generate, but streams stage progress and partial plan text as
+    Server-Sent Events while the plan is being written.
+    """
+    idea = request.idea.strip()
+    if not idea:
+        return JSONResponse({"error": "Idea cannot be empty."}, status_code=400)
+
+    lookup = await _lookup_similar(request, idea)
+    if _reused_body(request, lookup) is not None:
+        frames = _stream_plan(request, idea, lookup)
+    else:
+        key = _flight_key(request, idea)
+        decision = None
+        if not stream_flights.in_flight(key):
+            decision = admission.admit(_user_key(http_request))
+            if not decision.admitted:
+                return _rejection(decision)
+            if decision.degraded:
+                request = _degrade(request, lookup)
+        # Identical concurrent streams replay the frames of the first one.
+        frames = stream_flights.stream(
+            key, lambda: _stream_plan(request, idea, lookup, decision)
+        )
+
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ------------------------------------------------------------
+# Batch generation (NDJSON)
+# ------------------------------------------------------------
+
+# Ideas per batch, ideas generated at once per batch, and the rate budget
+# (ideas started per minute; 0 disables it) shared by every batch in this
+# process. Batch ideas also take admission slots like /generate requests.
+BATCH_MAX_IDEAS = int(os.getenv("VENTUREARCHITECT_BATCH_MAX_IDEAS", "500"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("VENTUREARCHITECT_BATCH_CONCURRENCY", "4"))
+BATCH_RATE_PER_MINUTE = float(
+    os.getenv("VENTUREARCHITECT_BATCH_RATE_PER_MINUTE", "30")
+)
+
+batch_budget: Optional[TokenBucket] = None
+if BATCH_RATE_PER_MINUTE > 0:
+    batch_budget = TokenBucket(
+        BATCH_RATE_PER_MINUTE / 60.0, burst=max(1.0, float(BATCH_MAX_CONCURRENCY))
+    )
+batch_counts = {"batches": 0, "running": 0, "succeeded": 0, "failed": 0}
+
+
+async def _batch_item(
+    request: BatchRequest, index: int, idea: str, limit: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Generate one idea of a batch; failures are reported, not raised."""
+    queued_at = time.monotonic()
+    line: Dict[str, Any] = {"index": index, "idea": idea}
+    async with limit:
+        if batch_budget is not None:
+            wait = batch_budget.try_acquire()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = batch_budget.try_acquire()
+        started_at = time.monotonic()
+        batch_counts["running"] += 1
+        try:
+            item = GenerateRequest(
+                idea=idea.strip(),
+                mode=request.mode,
+                reuse=request.reuse,
+                deadline_seconds=request.deadline_seconds,
+            )
+            if not item.idea:
+                raise ValueError("Idea cannot be empty.")
+            lookup = await _lookup_similar(item, item.idea)
+            body = _reused_body(item, lookup)
+            if body is None:
+
+                async def generate_plan() -> Optional[dict]:
+                    # Only the run that starts takes a concurrency slot; it
+                    # waits for one instead of being rejected.
+                    decision = await admission.acquire()
+                    try:
+                        run = _degrade(item, lookup) if decision.degraded else item
+                        return await _run_generation(run, item.idea, lookup)
+                    finally:
+                        admission.release(decision)
+
+                body, shared = await plan_flights.run(
+                    _flight_key(item, item.idea), generate_plan
+                )
+                if body is None:
+                    raise RuntimeError(
+                        "No final response content was produced by the agent."
+                    )
+                if shared:
+                    body = dict(body, coalesced=True)
+            line.update(status="ok", result=body)
+        except Exception as e:
+            line.update(status="error", error=f"{type(e).__name__}: {e}")
+        finally:
+            batch_counts["running"] -= 1
+    batch_counts["failed" if line["status"] == "error" else "succeeded"] += 1
+    finished_at = time.monotonic()
+    line["timing"] = {
+        "queued_seconds": round(started_at - queued_at, 3),
+        "seconds": round(finished_at - started_at, 3),
+    }
+    return line
+
+
+async def _batch_lines(request: BatchRequest) -> AsyncGenerator[str, None]:
+    """One NDJSON line per idea, in completion order, then a summary line."""
+    started = time.monotonic()
+    concurrency = min(
+        request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY
+    )
+    limit = asyncio.Semaphore(max(1, concurrency))
+    batch_counts["batches"] += 1
+    tasks = [
+        asyncio.create_task(_batch_item(request, i, idea, limit))
+        for i, idea in enumerate(request.ideas)
+    ]
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            line = await next_done
+            failed += line["status"] == "error"
+            yield json.dumps(line) + "\n"
+    finally:
+        # Client went away: stop the ideas still queued or running.
+        for task in tasks:
+            task.cancel()
+    summary = {
+        "total": len(tasks),
+        "succeeded": len(tasks) - failed,
+        "failed": failed,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+    yield json.dumps({"summary": summary}) + "\n"
+
+
+@app.post("/generate/batch")
+async def generate_batch(request: BatchRequest, http_request: Request):
+    """
+    Generate plans for a list of ideas, streaming one NDJSON line per idea
+    as soon as it finishes (index, idea, status, result or error, timing),
+    followed by a summary line.
+    """
+    if not request.ideas:
+        return JSONResponse({"error": "No ideas given."}, status_code=400)
+    if len(request.ideas) > BATCH_MAX_IDEAS:
+        return JSONResponse(
+            {"error": f"At most {BATCH_MAX_IDEAS} ideas per batch."},
+            status_code=400,
+        )
+    # A batch counts as one request against the caller's rate; its ideas
+    # are paced by the shared batch budget instead.
+    decision = admission.check_rate(_user_key(http_request))
+    if not decision.admitted:
+        return _rejection(decision)
+    return StreamingResponse(
+        _batch_lines(request),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},
+    )
+
+
+# ------------------------------------------------------------
+# Jobs (submit, then poll) and metrics
+# ------------------------------------------------------------
+
+async def _generate_job(job: Job, report_progress) -> dict:
+    request = GenerateRequest(**job.request)
+    idea = request.idea.strip()
+    lookup = await _lookup_similar(request, idea)
+    reused = _reused_body(request, lookup)
+    if reused is not None:
+        return reused
+    # Jobs are already bounded by the worker pool; degrade on queue depth.
+    if admission.should_degrade(load=job_queue.depth() / job_queue.max_queue):
+        request = _degrade(request, lookup)
+
+    stages: Dict[str, Any] = {}
+
+    def on_stage(stage: Dict[str, Any]) -> None:
+        stages[stage["name"]] = stage
+        report_progress({"stages": dict(stages), "last_stage": stage["name"]})
+
+    # Attaches to an identical /generate request or job already running
+    # (progress is then only reported to the job that started the run).
+    body, shared = await plan_flights.run(
+        _flight_key(request, idea),
+        lambda: _run_generation(request, idea, lookup, on_stage=on_stage),
+    )
+    if body is None:
+        raise RuntimeError("No final response content was produced by the agent.")
+    return dict(body, coalesced=True) if shared else body
+
+
+job_queue = JobQueue(
+    _generate_job,
+    store=default_job_store(),
+    workers=int(os.getenv("VENTUREARCHITECT_JOB_WORKERS", "4")),
+    max_queue=int(os.getenv("VENTUREARCHITECT_JOB_QUEUE_SIZE", "100")),
+)
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest, http_request: Request):
+    """Queue a plan generation and return its job id right away."""
+    if not request.idea.strip():
+        return JSONResponse({"error": "Idea cannot be empty."}, status_code=400)
+    decision = admission.check_rate(_user_key(http_request))
+    if not decision.admitted:
+        return _rejection(decision)
+    try:
+        job = job_queue.submit(
+            request.model_dump(exclude={"priority"}), priority=request.priority
+        )
+    except QueueFullError as e:
+        return JSONResponse(
+            {"error": str(e)}, status_code=503, headers={"Retry-After": "30"}
+        )
+    return {"id": job.id, "status": job.status, "priority": job.priority}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, progress and (once finished) the result or error of a job."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown job id."}, status_code=404)
+    return job.to_dict()
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return JSONResponse({"error": "Unknown job id."}, status_code=404)
+    # A running job stops at its next await, another process's job on that
+    # process's next heartbeat; poll GET /jobs/{id} to confirm.
+    status = job.status if job.status in FINISHED_STATUSES else "cancelling"
+    return {"id": job.id, "status": status}
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Operational metrics (admission, batches, coalescing, event log, HTTP
+    pool, jobs, model quotas and retries, sessions, tool caches).
+    """
+    from venturearchitect.tools import tool_cache_stats
+
+    return {
+        "admission": admission.stats(),
+        "batches": dict(batch_counts),
+        "coalescing": {
+            "plans": plan_flights.stats(),
+            "streams": stream_flights.stats(),
+        },
+        "event_log": shared_event_log().stats(),
+        "http_pool": http_clients.report(),
+        "jobs": job_queue.stats(),
+        "quota": shared_rate_limiter().stats(),
+        "retries": retry_stats.stats(),
+        "sessions": get_session_service().stats(),
+        "tools": tool_cache_stats(),
+    }